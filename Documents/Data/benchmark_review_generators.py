@@ -0,0 +1,276 @@
+"""
+Benchmark suite for the Frontier review generators
+Times the hot functions in-process, then runs each generator end to end at
+several sizes, engines and output formats, recording rows/sec, peak RSS and
+output bytes. Results go to a JSON file and can be compared against a stored
+baseline so regressions show up as numbers.
+
+    python benchmark_review_generators.py                      # 5k, 100k, 1M rows
+    python benchmark_review_generators.py --sizes 5000 --baseline benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import generate_platform_authentic_reviews as platform_reviews
+import generate_problem_focused_reviews as problem_reviews
+from review_core import OUTPUT_FORMATS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+GENERATORS = {
+    "platform_authentic": "generate_platform_authentic_reviews.py",
+    "problem_focused": "generate_problem_focused_reviews.py",
+}
+
+DEFAULT_SIZES = [5000, 100000, 1000000]
+DEFAULT_ENGINES = ["python", "numpy"]
+DEFAULT_FORMATS = ["json", "ndjson", "parquet", "copy"]
+
+# indent=2 JSON holds the whole dataset in memory; bigger runs skip it
+JSON_ROW_LIMIT = 100000
+
+# Calls per micro-benchmark
+MICRO_CALLS = 20000
+
+# A metric this much worse than the baseline is reported as a regression
+REGRESSION_TOLERANCE = 0.10
+
+# ============================================================================
+# MICRO-BENCHMARKS
+# ============================================================================
+
+def time_calls(fn, calls):
+    """Run fn() `calls` times and return timing numbers"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    seconds = time.perf_counter() - start
+    return {"calls": calls, "seconds": seconds, "ops_per_sec": calls / seconds}
+
+def run_micro(calls=MICRO_CALLS):
+    """Time the per-review functions and the whole-dataset functions at 5k rows"""
+    rng = random.Random(0)
+    templates = [template.text for profile in platform_reviews.SENTIMENT_PROFILES.values()
+                 for template in profile["templates"]]
+    texts = [platform_reviews.substitute_variables(template, rng) for template in templates]
+    platforms = list(platform_reviews.PLATFORM_CONFIGS)
+    problems = problem_reviews.PROBLEMS
+    base_texts = {problem: problem_reviews.PROBLEM_PROFILES[problem]["templates"][0] for problem in problems}
+
+    def enhance():
+        problem = rng.choice(problems)
+        return problem_reviews.enhance_review_text(base_texts[problem], problem, rng)
+
+    benches = {
+        "platform.substitute_variables":
+            lambda: platform_reviews.substitute_variables(rng.choice(templates), rng),
+        "platform.add_natural_language_variations":
+            lambda: platform_reviews.add_natural_language_variations(rng.choice(texts), rng),
+        "platform.generate_review":
+            lambda: platform_reviews.generate_review(rng.choice(platform_reviews.SENTIMENTS), rng.choice(platforms), rng),
+        "problem.enhance_review_text": enhance,
+        "problem.generate_review":
+            lambda: problem_reviews.generate_review(rng.choice(problems), rng.choice(platforms), rng),
+    }
+
+    results = {}
+    for name, fn in benches.items():
+        results[name] = time_calls(fn, calls)
+
+    # Whole-dataset functions, 5000 rows each
+    for prefix, module in [("platform", platform_reviews), ("problem", problem_reviews)]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            reviews = module.generate_all_reviews(5000, seed=0)
+            seconds = time.perf_counter() - start
+        results[f"{prefix}.generate_all_reviews"] = {"calls": 1, "rows": len(reviews), "seconds": seconds,
+                                                     "ops_per_sec": len(reviews) / seconds}
+        start = time.perf_counter()
+        module.generate_statistics(reviews)
+        seconds = time.perf_counter() - start
+        results[f"{prefix}.generate_statistics"] = {"calls": 1, "rows": len(reviews), "seconds": seconds,
+                                                    "ops_per_sec": len(reviews) / seconds}
+    return results
+
+# ============================================================================
+# END-TO-END RUNS
+# ============================================================================
+
+def output_bytes(path):
+    """Size of an output file, or of all files in an output directory"""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def run_case(generator, engine, output_format, rows, workers=1, seed=0):
+    """Run one generator CLI in a child process and measure it.
+
+    Peak RSS comes from wait4() on that child, so every case is measured in
+    isolation. With workers > 1 it is the largest single process, not the
+    sum across the workers: Linux reports the maximum over the child and its
+    reaped descendants. Wall time includes interpreter start-up and the statistics
+    file, i.e. what a user running the script sees.
+    """
+    workdir = tempfile.mkdtemp(prefix="review_bench_")
+    output_file = os.path.join(workdir, f"reviews.{output_format.replace('-', '.')}")
+    command = [sys.executable, os.path.join(HERE, GENERATORS[generator]),
+               "--total", str(rows), "--format", output_format, "--engine", engine,
+               "--seed", str(seed), "--workers", str(workers), "--output", output_file]
+    try:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+        error = process.stderr.read().decode("utf-8", "replace")
+        process.stderr.close()
+        if status != 0:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{error}")
+        return {
+            "generator": generator,
+            "engine": engine,
+            "format": output_format,
+            "rows": rows,
+            "workers": workers,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds,
+            # ru_maxrss is in kilobytes on Linux
+            "peak_rss_mb": usage.ru_maxrss / 1024,
+            "output_bytes": output_bytes(output_file),
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def case_key(run):
+    return f"{run['generator']}/{run['engine']}/{run['format']}/{run['rows']}/w{run['workers']}"
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Return (name, metric, baseline, current, change) rows and the regressions among them.
+
+    rows_per_sec / ops_per_sec regress when they drop, peak_rss_mb and
+    output_bytes when they grow, in each case by more than `tolerance`.
+    """
+    rows = []
+    regressions = []
+
+    def check(name, metric, old, new, higher_is_better):
+        if not old:
+            return
+        change = new / old - 1
+        rows.append((name, metric, old, new, change))
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append((name, metric, old, new, change))
+
+    for name, current in results["micro"].items():
+        old = baseline.get("micro", {}).get(name)
+        if old:
+            check(name, "ops_per_sec", old["ops_per_sec"], current["ops_per_sec"], True)
+
+    old_runs = {case_key(run): run for run in baseline.get("runs", [])}
+    for run in results["runs"]:
+        old = old_runs.get(case_key(run))
+        if old:
+            check(case_key(run), "rows_per_sec", old["rows_per_sec"], run["rows_per_sec"], True)
+            check(case_key(run), "peak_rss_mb", old["peak_rss_mb"], run["peak_rss_mb"], False)
+            check(case_key(run), "output_bytes", old["output_bytes"], run["output_bytes"], False)
+    return rows, regressions
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Frontier review generators")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Row counts to run end to end")
+    parser.add_argument("--engines", nargs="+", choices=["python", "numpy"], default=DEFAULT_ENGINES)
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS,
+                        choices=OUTPUT_FORMATS)
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--workers", type=int, default=1, help="--workers passed to the generators")
+    parser.add_argument("--repeat", type=int, default=1, help="Run each case this many times and keep the fastest")
+    parser.add_argument("--json-limit", type=int, default=JSON_ROW_LIMIT,
+                        help="Skip --format json above this many rows (it is built in memory)")
+    parser.add_argument("--micro-calls", type=int, default=MICRO_CALLS, help="Calls per micro-benchmark")
+    parser.add_argument("--skip-micro", action="store_true", help="Only run the end-to-end cases")
+    parser.add_argument("--output", default="benchmark_results.json", help="Results file")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help="Relative change that counts as a regression")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("REVIEW GENERATOR BENCHMARKS")
+    print("=" * 70)
+
+    results = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "micro": {},
+        "runs": [],
+    }
+
+    if not args.skip_micro:
+        print("\nMICRO-BENCHMARKS:")
+        results["micro"] = run_micro(args.micro_calls)
+        for name, result in results["micro"].items():
+            print(f"   {name:45s}: {result['ops_per_sec']:12,.0f} /s")
+
+    print("\nEND-TO-END RUNS:")
+    print(f"   {'case':48s} {'rows/s':>10s} {'peak RSS':>10s} {'output':>10s}")
+    for rows in args.sizes:
+        for generator in args.generators:
+            for engine in args.engines:
+                for output_format in args.formats:
+                    if output_format == "json" and rows > args.json_limit:
+                        continue
+                    # Best of --repeat runs, to damp noise from other load on the machine
+                    run = min((run_case(generator, engine, output_format, rows, args.workers)
+                               for _ in range(args.repeat)), key=lambda run: run["seconds"])
+                    results["runs"].append(run)
+                    print(f"   {case_key(run):48s} {run['rows_per_sec']:10,.0f} "
+                          f"{run['peak_rss_mb']:8.0f}MB {run['output_bytes'] / 2 ** 20:8.1f}MB")
+    if args.workers > 1:
+        print("   (peak RSS is the largest single process, not the sum across workers)")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[FILE] Results saved to: {args.output}")
+
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.tolerance)
+        print(f"\nCOMPARISON WITH {args.baseline}:")
+        for name, metric, old, new, change in rows:
+            flag = "  <-- REGRESSION" if (name, metric, old, new, change) in regressions else ""
+            print(f"   {name:48s} {metric:13s} {change * 100:+7.1f}%{flag}")
+        print(f"\n   {len(regressions)} regression(s) beyond {args.tolerance * 100:.0f}%")
+    elif args.baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[FILE] Baseline saved to: {args.baseline}")
+
+    print(f"\n{'=' * 70}\n")
+    sys.exit(1 if regressions else 0)
@@ -4,47 +4,21 @@ Matches EXACT format of scraped reviews from real platforms
 Ready for seamless transition to real review scraping
 """
 
+import argparse
 import json
+import os
 import random
-from datetime import datetime, timedelta
-from collections import defaultdict
+import shlex
+import sys
+from datetime import date
+from functools import lru_cache
 
-# ============================================================================
-# PLATFORM-SPECIFIC CONFIGURATIONS
-# ============================================================================
-
-PLATFORM_CONFIGS = {
-    "Trustpilot": {
-        "has_title": True,
-        "has_helpful_count": True,
-        "date_format": "%Y-%m-%d",
-        "verified_field": "verified_customer"
-    },
-    "BBB": {
-        "has_title": True,
-        "has_helpful_count": False,
-        "date_format": "%m/%d/%Y",
-        "verified_field": "verified_customer"
-    },
-    "Google Reviews": {
-        "has_title": False,
-        "has_helpful_count": True,
-        "date_format": "%B %d, %Y",  # "January 15, 2024"
-        "verified_field": "local_guide"
-    },
-    "ConsumerAffairs": {
-        "has_title": True,
-        "has_helpful_count": True,
-        "date_format": "%m/%d/%Y",
-        "verified_field": "verified_reviewer"
-    },
-    "Yelp": {
-        "has_title": False,
-        "has_helpful_count": True,
-        "date_format": "%m/%d/%Y",
-        "verified_field": None  # Yelp doesn't have verified badge
-    }
-}
+from review_core import (ANONYMOUS_RATE, CHECKPOINT_FORMATS, FIRST_NAMES, LAST_INITIALS, LOCATIONS,
+                         OUTPUT_FORMATS, PLATFORM_CONFIGS, TABLE_PROFILE_STAGES, ReviewBlock, ReviewStats,
+                         ReviewTables, chunk_writer, interleave_cells, iter_sharded, load_checkpoint,
+                         new_checkpoint, run_checkpointed, tally, write_json, write_ndjson)
+from review_corpus import corpus_tokens, load_corpus
+from review_templates import CompiledTemplate, compile_templates, value_range
 
 # ============================================================================
 # REVIEW TITLES (Platform-specific)
@@ -110,213 +84,197 @@ MIXED_TITLES = [
 ]
 
 # ============================================================================
-# LOCATION DATA
+# REVIEW TEMPLATES WITH VARIED LENGTHS
+# ============================================================================
+
+# Template lists in corpora/platform_authentic.json, by review length:
+# SHORT_* 20-50 words (common on Google/Yelp), MEDIUM_* 75-150 words (most
+# common), LONG_* 200-300 words (BBB, ConsumerAffairs, detailed complainers)
+CORPUS = "platform_authentic"
+TEMPLATE_LISTS = ["SHORT_NEGATIVE", "SHORT_POSITIVE", "MEDIUM_NEGATIVE", "MEDIUM_POSITIVE",
+                  "LONG_NEGATIVE", "LONG_POSITIVE"]
+
+# ============================================================================
+# TEMPLATE VARIABLES
 # ============================================================================
 
-LOCATIONS = {
-    "urban": [
-        "Los Angeles, CA", "San Diego, CA", "San Jose, CA", "San Francisco, CA", 
-        "Fresno, CA", "Sacramento, CA", "Long Beach, CA", "Oakland, CA",
-        "Houston, TX", "Dallas, TX", "San Antonio, TX", "Austin, TX",
-        "Fort Worth, TX", "El Paso, TX", "Arlington, TX", "Corpus Christi, TX"
-    ],
-    "suburban": [
-        "Riverside, CA", "Anaheim, CA", "Santa Ana, CA", "Irvine, CA",
-        "Bakersfield, CA", "Fremont, CA", "Stockton, CA", "Glendale, CA",
-        "Plano, TX", "Irving, TX", "Garland, TX", "Frisco, TX",
-        "McKinney, TX", "Grand Prairie, TX", "Mesquite, TX", "Carrollton, TX"
-    ],
-    "rural": [
-        "Rural Northern California", "Rural Central California", "Rural Southern California",
-        "Rural North Texas", "Rural Central Texas", "Rural West Texas", "Rural South Texas"
-    ]
+# Values each placeholder is drawn from uniformly; a template only samples the ones it uses
+PLACEHOLDER_VALUES = {
+    "months": value_range(3, 18),
+    "speed": ["100", "200", "500", "1000"],
+    "advertised": ["100", "200", "500", "1000"],
+    "actual_speed": value_range(30, 100),
+    "bad_speed": value_range(10, 40),
+    "count": value_range(3, 8),
+    "promo": value_range(30, 50),
+    "new_price": value_range(90, 130),
+    "price": value_range(50, 90),
+    "promo_price": value_range(35, 55),
+    "actual_bill": value_range(90, 120),
+    "percent": value_range(80, 150),
+    "equip_fee": value_range(10, 15),
+    "broadcast_fee": value_range(15, 25),
+    "regional_fee": value_range(8, 15),
+    "other_fees": value_range(10, 25),
+    "equip": value_range(10, 15),
+    "tv": value_range(15, 25),
+    "sports": value_range(8, 15),
+    "percentage": value_range(35, 70),
+    "evening_speed": value_range(15, 45),
+    "call_count": value_range(4, 10),
+    "weeks": value_range(2, 8),
+    "termination_fee": value_range(200, 400),
+    "monthly_charge": value_range(60, 110),
+    "total_charged": value_range(180, 330),
+    "months_ago": ["April", "May", "June", "March", "July"],
+    "duration": ["6 months", "a year", "8 months", "10 months", "18 months"],
+    "competitor": ["Spectrum", "AT&T", "Xfinity", "Comcast", "Cox"],
+    "location": ["Dallas", "Houston", "San Diego", "Los Angeles", "Austin", "San Antonio"],
+    "actual": ["480", "950", "190", "920"],
+    "old_price": value_range(90, 140),
+    "old_speed": ["100", "200", "50"],
+    "sqft": ["1200", "1500", "1800", "2000", "2500"],
+    "router_cost": value_range(100, 200),
+    "date1": ["Monday", "last week", "two weeks ago"],
+    "date2": ["the next week", "5 days later"],
+    "hours": value_range(2, 5),
+    "install_time": value_range(3, 6),
+    "outages": value_range(3, 8),
+    "period": ["two months", "the last three months", "six weeks"],
+    "months_left": value_range(2, 8),
 }
 
 # ============================================================================
-# REVIEW TEMPLATES WITH VARIED LENGTHS
+# SENTIMENT PROFILES
 # ============================================================================
 
-# VERY SHORT REVIEWS (20-50 words) - Common on Google/Yelp
-SHORT_NEGATIVE = [
-    "Terrible service. Internet goes down all the time. Called support multiple times, they never fix anything. Looking to switch ASAP.",
-    "Speeds are nowhere near advertised. Paying for {speed} Mbps, getting maybe {actual} Mbps. Total ripoff.",
-    "Worst customer service ever. Spent hours on hold just to get nowhere. Still have the same problem after 3 weeks.",
-    "Bill keeps going up every month. Hidden fees everywhere. Not what was advertised at all.",
-    "Installation took 3 visits and service still doesn't work properly. Completely unprofessional.",
-]
+# Ratings, template lists and titles per sentiment
+SENTIMENT_SOURCES = {
+    "very_negative": {
+        "ratings": [1, 1, 1, 2],
+        "templates": ["SHORT_NEGATIVE", "MEDIUM_NEGATIVE", "LONG_NEGATIVE"],
+        "titles": NEGATIVE_TITLES,
+    },
+    "negative": {
+        "ratings": [2, 2, 3],
+        "templates": ["SHORT_NEGATIVE", "MEDIUM_NEGATIVE"],
+        "titles": NEGATIVE_TITLES + MIXED_TITLES,
+    },
+    "positive": {
+        "ratings": [4, 4, 5],
+        "templates": ["SHORT_POSITIVE", "MEDIUM_POSITIVE"],
+        "titles": POSITIVE_TITLES + MIXED_TITLES,
+    },
+    "very_positive": {
+        "ratings": [5],
+        "templates": ["SHORT_POSITIVE", "MEDIUM_POSITIVE", "LONG_POSITIVE"],
+        "titles": POSITIVE_TITLES,
+    },
+}
 
-SHORT_POSITIVE = [
-    "Great internet! Fast speeds, reliable service. Had Frontier for 8 months now with no issues. Highly recommend.",
-    "Finally have reliable internet in my area. Speeds are exactly as advertised. Very happy with the switch.",
-    "Installation was quick and professional. Service has been rock solid. Best ISP I've had.",
-    "Good value for the price. Speeds are consistent and customer service has been helpful when needed.",
-    "Fiber is amazing! No more buffering. Work from home is so much easier now. 5 stars.",
-]
+@lru_cache(maxsize=None)
+def sentiment_profiles():
+    """SENTIMENT_PROFILES: SENTIMENT_SOURCES with the templates loaded and compiled (once per process)"""
+    corpus = load_corpus(CORPUS)
+    tokens = corpus_tokens(CORPUS)
+    # Each sentiment compiles its own templates: the NumPy engine keys template
+    # draws on template identity, so sharing objects across sentiments would
+    # change its output
+    return {sentiment: dict(source, templates=compile_templates(
+                [text for name in source["templates"] for text in corpus[name]], PLACEHOLDER_VALUES, tokens))
+            for sentiment, source in SENTIMENT_SOURCES.items()}
 
-# MEDIUM REVIEWS (75-150 words) - Most common
-MEDIUM_NEGATIVE = [
-    "I've been dealing with Frontier for {months} months now and it's been frustrating. The speeds are inconsistent - sometimes close to the advertised {speed} Mbps, other times dropping to {bad_speed} Mbps. This makes working from home nearly impossible during peak hours. Customer service is terrible - I've called {count} times about the speed issues and each time they run diagnostics, say everything looks fine, and nothing changes. The last technician admitted the area is oversold but said there's nothing they can do. On top of that, my promotional rate ended and the bill jumped from ${promo} to ${new_price} per month with no warning. Trying to negotiate got me nowhere. Really disappointed and actively looking at other providers. Would not recommend Frontier.",
-    
-    "Major issues with billing. Signed up at ${promo}/month but actual bill is ${actual} after all the fees they don't tell you about upfront. Equipment rental (${equip}/mo), broadcast fee (${tv}/mo), regional sports fee (${sports}/mo) - I don't even have TV! Called to complain and they basically said tough luck, it's in the fine print. Customer service was rude and unhelpful. Service itself is okay when it works but I've had {outages} outages in {period}. Each time I call they promise a credit that never appears on my bill. The whole experience feels scammy. Contract ends in {months_left} months and I'll be switching immediately. Check all the fees before signing up or you'll get burned like I did.",
-    
-    "Installation was supposed to happen {date1}. Technician never showed, never called. Rescheduled for {date2}, tech arrived {hours} hours late. Install took {install_time} hours and left cables running across my ceiling in the ugliest way possible. Asked about running them through walls, was told that costs extra. The router they provided is garbage - WiFi barely reaches my bedroom in a {sqft} sq ft apartment. Had to buy my own router for ${router_cost}. Service works okay but not worth the hassle. Support is slow to respond and unhelpful. Been with them {duration} and counting down until contract ends. Installation quality was unprofessional and the equipment is subpar. Would give zero stars if I could.",
-]
+@lru_cache(maxsize=None)
+def compiled_by_text():
+    return {compiled.text: compiled
+            for profile in sentiment_profiles().values() for compiled in profile["templates"]}
 
-MEDIUM_POSITIVE = [
-    "Switched to Frontier Fiber {duration} ago and very happy with the decision. Previous provider ({competitor}) was unreliable with constant outages. Frontier has been solid - maybe one brief outage in {months} months. Speed tests consistently show {actual} Mbps on my {speed} Mbps plan which is great. Work from home daily with video calls and large file transfers, no issues at all. Price is ${price}/month which is reasonable for the speed. Installation was professional and on time. The tech explained everything and made sure I was satisfied before leaving. Customer service the one time I called was helpful and knowledgeable. Only minor complaint is the router could have better range, but it works fine for my needs. Overall very satisfied and would recommend to anyone in the area looking for fiber internet.",
-    
-    "Had Frontier for {months} months in {location} and it's been excellent. The {speed} Mbps fiber plan is perfect for our household - two people working from home plus kids streaming and gaming. Speeds are consistent throughout the day even during peak hours. Bill has stayed at ${price}/month as quoted, no surprise increases or hidden fees which is refreshing. Had one service issue early on and support resolved it quickly with a tech visit the next day. Installation was smooth, tech was professional and cleaned up after himself. The included router has good WiFi coverage for our {sqft} sq ft home. Coming from {competitor} where service was spotty and support was awful, this has been a huge upgrade. Highly recommend Frontier if fiber is available in your area.",
-]
+def __getattr__(name):
+    """Load the template corpus on first use of SENTIMENT_PROFILES or a template list.
 
-# LONG DETAILED REVIEWS (200-300 words) - Common on BBB, ConsumerAffairs, detailed complainers
-LONG_NEGATIVE = [
-    "Where do I even begin with this nightmare experience? I signed up for Frontier {months} months ago after their sales rep promised me {advertised} Mbps fiber for just ${promo_price}/month with 'no hidden fees.' That lasted exactly 12 months before my bill jumped to ${new_price}/month - over a {percent}% increase! When I called to ask why, they said the promotional period ended, which fine, I understand promos end. But the bill is itemized with all these fees that were never disclosed: ${equip_fee}/month equipment rental even though they said the router was 'included free,' ${broadcast_fee}/month broadcast TV surcharge for INTERNET ONLY service, ${regional_fee}/month regional sports fee (again, no TV service), and ${other_fees} in various mystery charges. The actual internet service itself is mediocre at best. Speed tests show I'm getting {actual_speed} Mbps on average instead of the promised {advertised} Mbps. That's only {percentage}% of what I'm paying for. During evening hours it's even worse, dropping to {evening_speed} Mbps making streaming nearly impossible. I work from home and the connection drops randomly throughout the day - I've lost count of how many times I've been kicked out of important video meetings. Customer service is absolutely useless. I've called {call_count} times over the past {weeks} weeks trying to get help. Each time I spend 45+ minutes on hold, get transferred multiple times, explain the whole situation again to each person, and nothing ever gets resolved. Last tech who visited said the local infrastructure is 'at capacity' and there's nothing they can do about speed issues. So why do they keep selling service in oversold areas? The early termination fee is ${termination_fee} which feels like being held hostage. I'm seriously considering paying it just to escape. Do NOT trust Frontier's advertising. The promotional price is fake, the speeds are fake, and support is nonexistent. Going to file complaints with FCC and BBB. You've been warned.",
-    
-    "I am beyond frustrated with Frontier's customer service. Three months ago I called to cancel my service because I was relocating to another state for work. I followed their cancellation process exactly as instructed - called their number, spoke to a retention specialist who tried to keep me as a customer, I declined, got a confirmation number for the cancellation, and returned their equipment to an authorized UPS location with a receipt. Everything by the book. Yet here I am THREE MONTHS LATER still being charged ${monthly_charge} every single month on my credit card! The first month I thought maybe it was just a billing cycle thing and they'd credit it next month. When the second charge hit, I called immediately. Spent over an hour on the phone getting transferred between departments. One rep said my account showed as cancelled, another said it was still active, a third claimed there was a 'pending disconnection order' that hadn't been processed. No one could give me a straight answer. I asked to speak to a supervisor and was told someone would call me back within 24-48 hours. That was three weeks ago - no callback. Third charge hits and I'm absolutely livid. I call again, demand to speak to billing supervisor, get told the same thing about a callback that never comes. Meanwhile I'm out ${total_charged} for service at an address I haven't lived at since {months_ago}! I've initiated chargebacks with my credit card company and filed complaints with the Better Business Bureau and my state's Attorney General office. Now Frontier has the audacity to send my account to collections for 'unpaid balances' - balances I DO NOT OWE because I cancelled properly! This is affecting my credit score. I've kept meticulous records of every call, every confirmation number, the equipment return receipt, everything. This company is either completely incompetent or deliberately defrauding customers. Either way it should be illegal. If you ever plan to cancel Frontier, be prepared to fight them for months to stop fraudulent charges. Absolutely criminal behavior from this company.",
-]
+    Only reached for attribute access from outside (e.g. the benchmarks); code
+    in this module calls sentiment_profiles() directly.
+    """
+    if name == "SENTIMENT_PROFILES":
+        return sentiment_profiles()
+    if name in TEMPLATE_LISTS:
+        return load_corpus(CORPUS)[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-LONG_POSITIVE = [
-    "After years of struggling with {competitor}'s unreliable cable internet here in {location}, switching to Frontier Fiber has been absolutely life-changing for our household. Let me explain why this has been such a great experience from start to finish. The initial sales process was refreshingly straightforward - no high-pressure tactics, just clear information about what speeds were available at my address and honest pricing. I went with their {speed} Mbps plan for ${price}/month which seemed almost too good compared to the ${old_price} I was paying {competitor} for only {old_speed} Mbps. Installation was scheduled within a week and the techs showed up right on time in the promised window. They were professional, explained everything they were doing, and took care to run the fiber line neatly without damaging my landscaping. The whole setup took about two hours and they tested everything thoroughly before leaving, even helping me connect my smart home devices and optimize WiFi placement. Now for the actual service - it's been {months} months and I honestly cannot remember the last time we had any issues. Speed tests consistently show I'm getting the full {speed} Mbps I'm paying for, sometimes even slightly higher. This is actual fiber directly to the home, not the 'fiber to the neighborhood' fake fiber some ISPs advertise. The upstream is symmetrical too which is amazing for cloud backups and video uploads. I work entirely from home doing software development which means I'm on VPNs and video calls all day. My spouse also works remotely in graphic design uploading huge files. We have two teenagers who are constantly streaming, gaming online, and video chatting with friends. Plus all our IoT devices, smart TVs, tablets, etc. We regularly have 15-20 devices connected simultaneously and have never experienced any slowdown or congestion even during peak evening hours. Gaming latency is consistently under 15ms which my son says is excellent for competitive play. The reliability has been perfect - I think we've had exactly one outage in all this time and it was during a major thunderstorm that knocked out power to half the neighborhood. Service was restored within an hour of power coming back. The billing has been exactly as promised too - ${price} per month, no hidden fees, no surprise increases, no equipment rental charges because the router is included. After dealing with {competitor}'s bait-and-switch pricing tactics for years this transparency is so refreshing. The customer service the couple times I've needed to contact them has been responsive and knowledgeable. I highly recommend Frontier Fiber to anyone who has it available in their area. Best internet service I've had in my 20+ years as a consumer. Worth every penny.",
+# Typos and informal language applied to a share of reviews
+VARIATION_RATE = 0.1
+LANGUAGE_VARIATIONS = [
+    (" I ", " i "),  # lowercase I
+    (".", ".."),  # extra periods
+    ("!", "!!"),  # extra exclamation
+    (" and ", " & "),  # ampersand
+    ("you", "u"),  # text speak (rare)
+    (" to ", " 2 "),  # text speak (rare)
 ]
 
+# Location mix, verification share and helpful-vote caps
+AREA_WEIGHTS = {"urban": 60, "suburban": 30, "rural": 10}
+VERIFIED_RATE = 0.75
+HELPFUL_LIMITS = (150, 50, 20)  # (word threshold, max votes above it, max votes otherwise)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def random_date_last_18_months():
-    """Generate random date within last 18 months"""
-    end = datetime.now()
-    start = end - timedelta(days=545)
-    time_between = end - start
-    days_between = time_between.days
-    random_days = random.randrange(days_between)
-    return start + timedelta(days=random_days)
-
-def format_date_for_platform(date_obj, platform):
-    """Format date according to platform standards"""
-    format_str = PLATFORM_CONFIGS[platform]["date_format"]
-    return date_obj.strftime(format_str)
-
-def random_name():
-    """Generate random reviewer name"""
-    first_names = ["John", "Sarah", "Michael", "Jessica", "David", "Emily", "Robert", "Ashley",
-                   "James", "Amanda", "William", "Jennifer", "Richard", "Lisa", "Joseph", "Michelle",
-                   "Thomas", "Nicole", "Christopher", "Karen", "Daniel", "Nancy", "Matthew", "Betty",
-                   "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Carol", "Steve", "Linda",
-                   "Paul", "Maria", "Andrew", "Susan", "Brian", "Angela", "Kevin", "Patricia"]
-    last_initials = ["A", "B", "C", "D", "E", "F", "G", "H", "J", "K", "L", "M", "N", "P", "R", "S", "T", "W", "Y", "Z"]
-    
-    if random.random() < 0.25:  # 25% anonymous
-        return f"User{random.randint(1000, 9999)}"
-    else:
-        return f"{random.choice(first_names)} {random.choice(last_initials)}."
-
-def substitute_variables(template):
+def substitute_variables(template, rng=random):
     """Replace template variables with realistic values"""
-    replacements = {
-        "{months}": str(random.randint(3, 18)),
-        "{speed}": str(random.choice([100, 200, 500, 1000])),
-        "{advertised}": str(random.choice([100, 200, 500, 1000])),
-        "{actual_speed}": str(random.randint(30, 100)),
-        "{bad_speed}": str(random.randint(10, 40)),
-        "{count}": str(random.randint(3, 8)),
-        "{promo}": str(random.randint(30, 50)),
-        "{new_price}": str(random.randint(90, 130)),
-        "{price}": str(random.randint(50, 90)),
-        "{promo_price}": str(random.randint(35, 55)),
-        "{actual}": str(random.randint(90, 120)),
-        "{percent}": str(random.randint(80, 150)),
-        "{equip_fee}": str(random.randint(10, 15)),
-        "{broadcast_fee}": str(random.randint(15, 25)),
-        "{regional_fee}": str(random.randint(8, 15)),
-        "{other_fees}": str(random.randint(10, 25)),
-        "{percentage}": str(random.randint(35, 70)),
-        "{evening_speed}": str(random.randint(15, 45)),
-        "{call_count}": str(random.randint(4, 10)),
-        "{weeks}": str(random.randint(2, 8)),
-        "{termination_fee}": str(random.randint(200, 400)),
-        "{monthly_charge}": str(random.randint(60, 110)),
-        "{total_charged}": str(random.randint(180, 330)),
-        "{months_ago}": random.choice(["April", "May", "June", "March", "July"]),
-        "{duration}": random.choice(["6 months", "a year", "8 months", "10 months", "18 months"]),
-        "{competitor}": random.choice(["Spectrum", "AT&T", "Xfinity", "Comcast", "Cox"]),
-        "{location}": random.choice(["Dallas", "Houston", "San Diego", "Los Angeles", "Austin", "San Antonio"]),
-        "{actual}": str(random.choice([480, 950, 190, 920])),
-        "{old_price}": str(random.randint(90, 140)),
-        "{old_speed}": str(random.choice([100, 200, 50])),
-        "{sqft}": str(random.choice([1200, 1500, 1800, 2000, 2500])),
-        "{router_cost}": str(random.randint(100, 200)),
-        "{date1}": random.choice(["Monday", "last week", "two weeks ago"]),
-        "{date2}": random.choice(["the next week", "5 days later"]),
-        "{hours}": str(random.randint(2, 5)),
-        "{install_time}": str(random.randint(3, 6)),
-        "{outages}": str(random.randint(3, 8)),
-        "{period}": random.choice(["two months", "the last three months", "six weeks"]),
-        "{months_left}": str(random.randint(2, 8)),
-    }
-    
-    result = template
-    for key, value in replacements.items():
-        result = result.replace(key, value)
-    
-    return result
+    compiled = compiled_by_text().get(template)
+    if compiled is None:
+        compiled = compiled_by_text()[template] = CompiledTemplate(template, PLACEHOLDER_VALUES)
+    return compiled.render(rng)
 
-def add_natural_language_variations(text):
+def add_natural_language_variations(text, rng=random):
     """Add typos, informal language to make more authentic (10% of reviews)"""
-    if random.random() > 0.1:  # Only 10% get variations
+    if rng.random() > VARIATION_RATE:  # Only 10% get variations
         return text
     
-    variations = [
-        (" I ", " i "),  # lowercase I
-        (".", ".."),  # extra periods
-        ("!", "!!"),  # extra exclamation
-        (" and ", " & "),  # ampersand
-        ("you", "u"),  # text speak (rare)
-        (" to ", " 2 "),  # text speak (rare)
-    ]
-    
     # Apply 1-2 random variations
-    for _ in range(random.randint(1, 2)):
-        if variations:
-            old, new = random.choice(variations)
+    for _ in range(rng.randint(1, 2)):
+        if LANGUAGE_VARIATIONS:
+            old, new = rng.choice(LANGUAGE_VARIATIONS)
             if old in text:
                 text = text.replace(old, new, 1)
     
     return text
 
-def generate_review(sentiment_category, platform):
+def select_template(profile, rng=random):
+    """Pick the review template from a profile (a separate function so it can be profiled)"""
+    return rng.choice(profile["templates"])
+
+@lru_cache(maxsize=None)
+def review_tables(reference=None, skew=None):
+    """Date, name and location lookup tables for a reference date (default today), built once.
+
+    skew is a review_scale.ScaleSkew for scale-test runs.
+    """
+    if skew is not None:
+        from review_scale import SkewedTables
+        return SkewedTables(AREA_WEIGHTS, FIRST_NAMES, reference, skew)
+    return ReviewTables(AREA_WEIGHTS, FIRST_NAMES, reference)
+
+def generate_review(sentiment_category, platform, rng=random, tables=None):
     """Generate a platform-authentic review"""
     
-    # Determine rating and template pool based on sentiment
-    if sentiment_category == "very_negative":
-        rating = random.choice([1, 1, 1, 2])
-        templates = SHORT_NEGATIVE + MEDIUM_NEGATIVE + LONG_NEGATIVE
-        titles = NEGATIVE_TITLES
-    elif sentiment_category == "negative":
-        rating = random.choice([2, 2, 3])
-        templates = SHORT_NEGATIVE + MEDIUM_NEGATIVE
-        titles = NEGATIVE_TITLES + MIXED_TITLES
-    elif sentiment_category == "positive":
-        rating = random.choice([4, 4, 5])
-        templates = SHORT_POSITIVE + MEDIUM_POSITIVE
-        titles = POSITIVE_TITLES + MIXED_TITLES
-    else:  # very_positive
-        rating = 5
-        templates = SHORT_POSITIVE + MEDIUM_POSITIVE + LONG_POSITIVE
-        titles = POSITIVE_TITLES
+    # Determine rating and template pool based on sentiment (anything else counts as very_positive)
+    profiles = sentiment_profiles()
+    profile = profiles.get(sentiment_category, profiles["very_positive"])
+    rating = rng.choice(profile["ratings"])
+    titles = profile["titles"]
     
     # Select template and generate text
-    template = random.choice(templates)
-    review_text = substitute_variables(template)
-    review_text = add_natural_language_variations(review_text)
+    template = select_template(profile, rng)
+    review_text = template.render(rng)
+    review_text = add_natural_language_variations(review_text, rng)
     
-    # Location
-    area_choice = random.choices(["urban", "suburban", "rural"], weights=[60, 30, 10])[0]
-    location = random.choice(LOCATIONS[area_choice])
-    
-    # Date
-    date_obj = random_date_last_18_months()
-    date_str = format_date_for_platform(date_obj, platform)
+    # Location and date from the run's lookup tables
+    tables = tables or review_tables()
+    location = tables.location(rng)
+    date_str = tables.date(platform, rng)
     
     # Build review object with platform-specific fields
     config = PLATFORM_CONFIGS[platform]
@@ -325,105 +283,204 @@ def generate_review(sentiment_category, platform):
         "platform": platform,
         "date": date_str,
         "rating": rating,
-        "reviewer_name": random_name(),
+        "reviewer_name": tables.name(rng),
         "location": location,
         "review_text": review_text,
     }
     
     # Add title if platform supports it
     if config["has_title"]:
-        review["title"] = random.choice(titles)
+        review["title"] = rng.choice(titles)
     
     # Add helpful count if platform supports it
     if config["has_helpful_count"]:
         # More helpful votes for longer, higher-quality reviews
-        max_helpful = 50 if len(review_text.split()) > 150 else 20
-        review["helpful_count"] = random.randint(0, max_helpful)
+        word_threshold, high, low = HELPFUL_LIMITS
+        max_helpful = high if len(review_text.split()) > word_threshold else low
+        review["helpful_count"] = rng.randint(0, max_helpful)
     
     # Add platform-specific verification field
     if config["verified_field"]:
-        review[config["verified_field"]] = random.random() < 0.75  # 75% verified
+        review[config["verified_field"]] = rng.random() < VERIFIED_RATE  # 75% verified
     
     # Add review URL (what you'd get from scraping)
-    review["review_url"] = f"https://example.com/reviews/{platform.lower().replace(' ', '')}/{random.randint(100000, 999999)}"
+    review["review_url"] = f"https://example.com/reviews/{platform.lower().replace(' ', '')}/{rng.randint(100000, 999999)}"
     
     return review
 
-def generate_all_reviews(total=5000):
-    """Generate all reviews with balanced distribution across platforms and sentiments"""
-    
+SENTIMENTS = ["very_negative", "negative", "positive", "very_positive"]
+
+# Field that keeps each review's generator label with --keep-labels
+LABEL_FIELD = "sentiment_category"
+
+# Functions timed by --profile, as {module attribute: stage name}; generate_review's
+# self time is the inline work around them (dict assembly). Date, name and location
+# draws are ReviewTables methods, timed via TABLE_PROFILE_STAGES
+PROFILE_STAGES = {
+    "select_template": "template_selection",
+    "add_natural_language_variations": "add_natural_language_variations",
+    "generate_review": "generate_review (dict assembly)",
+}
+
+def build_quotas(total=5000):
+    """Number of reviews to generate per (platform, sentiment) cell"""
+    platforms = list(PLATFORM_CONFIGS.keys())
+    per_sentiment = total // len(platforms) // len(SENTIMENTS)
+    return {(platform, sentiment): per_sentiment for platform in platforms for sentiment in SENTIMENTS}
+
+def iter_reviews(total=5000, rng=random, reference=None, skew=None, labels=False):
+    """Yield reviews one at a time in shuffled order with sequential review IDs.
+
+    Uses constant memory: the platform/sentiment balance comes from the quota
+    table rather than from shuffling a fully built list.
+    """
+    quotas = build_quotas(total)
+    tables = review_tables(reference, skew)
+    for review_id, (platform, sentiment) in enumerate(interleave_cells(quotas, rng), 1):
+        review = generate_review(sentiment, platform, rng, tables)
+        review["review_id"] = review_id
+        if labels:
+            review[LABEL_FIELD] = sentiment
+        yield review
+
+def generate_shard(task):
+    """Generate one shard's reviews, without IDs, from the shard's own seeded RNG"""
+    quotas, seed, reference, skew, labels = task
+    rng = random.Random(seed)
+    tables = review_tables(reference, skew)
     reviews = []
+    for platform, sentiment in interleave_cells(quotas, rng):
+        review = generate_review(sentiment, platform, rng, tables)
+        if labels:
+            review[LABEL_FIELD] = sentiment
+        reviews.append(review)
+    return reviews
+
+def iter_reviews_parallel(total=5000, seed=None, workers=None, engine="python", reference=None, skew=None,
+                          labels=False):
+    """Yield reviews generated by a process pool of independently seeded shards.
+
+    Output is reproducible for a given seed. Shards are concatenated in order
+    with contiguous review IDs, and their quotas sum to the same per-cell
+    counts as the sequential path.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    quotas = build_quotas(total)
+    shard_fn = generate_shard_batched if engine == "numpy" else generate_shard
+    return iter_sharded(shard_fn, quotas, seed, workers or os.cpu_count(), reference=reference, skew=skew,
+                        labels=labels)
+
+def batch_spec():
+    """Describe this generator for the NumPy columnar engine (requires numpy)"""
+    from review_batch import BatchSpec, template_text_column
+    
+    cells = [(platform, sentiment) for platform in PLATFORM_CONFIGS for sentiment in SENTIMENTS]
+    profiles = [sentiment_profiles()[sentiment] for _, sentiment in cells]
+    return BatchSpec(
+        cells=cells,
+        platforms=[platform for platform, _ in cells],
+        rating_pools=[profile["ratings"] for profile in profiles],
+        title_pools=[profile["titles"] for profile in profiles],
+        text_column=template_text_column([profile["templates"] for profile in profiles],
+                                         LANGUAGE_VARIATIONS, VARIATION_RATE),
+        platform_configs=PLATFORM_CONFIGS,
+        locations=LOCATIONS,
+        area_weights=AREA_WEIGHTS,
+        first_names=FIRST_NAMES,
+        last_initials=LAST_INITIALS,
+        anonymous_rate=ANONYMOUS_RATE,
+        verified_rate=VERIFIED_RATE,
+        helpful_limits=HELPFUL_LIMITS,
+        label_field=LABEL_FIELD,
+        cell_labels=[sentiment for _, sentiment in cells],
+    )
+
+def iter_reviews_batched(total=5000, seed=None, batch_size=None, reference=None, skew=None, labels=False):
+    """Yield reviews from the NumPy columnar engine, drawing whole blocks at once"""
+    from review_batch import DEFAULT_BATCH_SIZE, iter_batched
+    return iter_batched(batch_spec(), build_quotas(total), seed, batch_size or DEFAULT_BATCH_SIZE, reference, skew,
+                        labels)
+
+def generate_shard_batched(task):
+    """Generate one shard with the NumPy columnar engine"""
+    from review_batch import iter_batched
+    quotas, seed, reference, skew, labels = task
+    return list(iter_batched(batch_spec(), quotas, seed, reference=reference, skew=skew, labels=labels))
+
+def print_plan(total):
+    """Print how the reviews are split across the dataset"""
+    
     platforms = list(PLATFORM_CONFIGS.keys())
-    sentiments = ["very_negative", "negative", "positive", "very_positive"]
     
     per_platform = total // len(platforms)
-    per_sentiment = per_platform // len(sentiments)
+    per_sentiment = per_platform // len(SENTIMENTS)
     
     print(f"\nGenerating {total} platform-authentic reviews...")
     print(f"Platforms: {len(platforms)}")
     print(f"Per platform: {per_platform}")
     print(f"Per sentiment per platform: {per_sentiment}\n")
-    
-    for platform in platforms:
-        print(f"Generating {platform} reviews...")
-        for sentiment in sentiments:
-            for _ in range(per_sentiment):
-                reviews.append(generate_review(sentiment, platform))
-    
-    # Shuffle and assign IDs
-    random.shuffle(reviews)
-    for idx, review in enumerate(reviews, 1):
-        review["review_id"] = idx
-    
+
+def generate_all_reviews(total=5000, seed=None, workers=1, engine="python", reference=None, skew=None,
+                         labels=False):
+    """Generate all reviews with balanced distribution across platforms and sentiments, held in a compact ReviewBlock"""
+    print_plan(total)
+    return ReviewBlock(review_stream(total, seed, workers, engine, reference, skew, labels))
+
+def review_stream(total=5000, seed=None, workers=1, engine="python", reference=None, skew=None, labels=False):
+    """Pick the sequential, parallel or NumPy generation path; dates are relative to reference (default today).
+
+    With a scale-test skew, locations and dates are skewed during generation
+    and review lengths get a heavy tail afterwards. With labels, every review
+    keeps the sentiment it was generated for under LABEL_FIELD.
+    """
+    if workers > 1:
+        reviews = iter_reviews_parallel(total, seed, workers, engine, reference, skew, labels)
+    elif engine == "numpy":
+        reviews = iter_reviews_batched(total, seed, reference=reference, skew=skew, labels=labels)
+    else:
+        rng = random.Random(seed) if seed is not None else random
+        reviews = iter_reviews(total, rng, reference, skew, labels)
+    if skew is not None:
+        from review_scale import lengthen_texts, sentence_pool
+        reviews = lengthen_texts(reviews, skew, sentence_pool(load_corpus(CORPUS)))
     return reviews
 
-def generate_statistics(reviews):
-    """Generate statistics about the dataset"""
-    
-    stats = {
-        "total_reviews": len(reviews),
-        "platform_distribution": defaultdict(int),
-        "rating_distribution": defaultdict(int),
-        "has_title_count": 0,
-        "has_helpful_count": 0,
-        "verified_count": 0,
-        "word_count_stats": {
-            "min": 0,
-            "max": 0,
-            "average": 0
-        }
-    }
-    
-    word_counts = []
-    for review in reviews:
-        stats["platform_distribution"][review["platform"]] += 1
-        stats["rating_distribution"][review["rating"]] += 1
-        if "title" in review:
-            stats["has_title_count"] += 1
-        if "helpful_count" in review:
-            stats["has_helpful_count"] += 1
-        
-        # Check for any verification field
-        for field in ["verified_customer", "verified_reviewer", "local_guide"]:
-            if review.get(field) == True:
-                stats["verified_count"] += 1
-                break
-        
-        word_counts.append(len(review["review_text"].split()))
-    
-    word_counts.sort()
-    stats["word_count_stats"] = {
-        "min": min(word_counts),
-        "max": max(word_counts),
-        "average": sum(word_counts) / len(word_counts),
-        "median": word_counts[len(word_counts) // 2]
+# Any of these set to True counts a review as verified
+VERIFICATION_FIELDS = ["verified_customer", "verified_reviewer", "local_guide"]
+
+def review_tags(review):
+    """Statistics tags for one review"""
+    tags = []
+    if "title" in review:
+        tags.append("has_title")
+    if "helpful_count" in review:
+        tags.append("has_helpful")
+    for field in VERIFICATION_FIELDS:
+        if review.get(field) == True:
+            tags.append("verified")
+            break
+    return tags
+
+def summarize_statistics(stats):
+    """Build the statistics report from a ReviewStats accumulator"""
+    return {
+        "total_reviews": stats.total,
+        "platform_distribution": dict(stats.platforms),
+        "rating_distribution": dict(stats.ratings),
+        "has_title_count": stats.tags["has_title"],
+        "has_helpful_count": stats.tags["has_helpful"],
+        "verified_count": stats.tags["verified"],
+        "word_count_stats": stats.word_count_stats(),
+        "accumulator": stats.to_dict()
     }
-    
-    # Convert defaultdicts
-    stats["platform_distribution"] = dict(stats["platform_distribution"])
-    stats["rating_distribution"] = dict(stats["rating_distribution"])
-    
-    return stats
+
+def generate_statistics(reviews):
+    """Generate statistics about the dataset in one pass"""
+    stats = ReviewStats()
+    for _ in tally(reviews, stats, review_tags):
+        pass
+    return summarize_statistics(stats)
 
 # ============================================================================
 # MAIN EXECUTION
@@ -435,30 +492,189 @@ if __name__ == "__main__":
     print("Matches exact format of scraped reviews for seamless integration")
     print("=" * 70)
     
-    # Generate reviews
-    reviews = generate_all_reviews(5000)
-    
-    # Generate statistics
-    stats = generate_statistics(reviews)
+    parser = argparse.ArgumentParser(description="Generate platform-authentic Frontier reviews")
+    parser.add_argument("--total", type=int,
+                        help="Number of reviews to generate (default 5000; with --resume, the new target size)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        default="json",
+                        help="json builds the dataset in memory as compact columns; the other formats stream "
+                             "it with constant memory (ndjson-gz/zst are block-compressed with a review_id index, "
+                             "see review_blocks.py, and zst requires zstandard; template stores texts as template "
+                             "ids plus values, see review_encoding.py; parquet/arrow require pyarrow; copy formats "
+                             "are PostgreSQL COPY files)")
+    parser.add_argument("--table", choices=["frontier_reviews", "frontier_reviews_processed"],
+                        default="frontier_reviews", help="Target table for the copy formats")
+    parser.add_argument("--output", help="Output file (default depends on --total and --format)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generate shards in this many processes (0 = one per CPU)")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python",
+                        help="numpy draws whole columns per block (requires numpy)")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="Generate in chunks and save <output>.checkpoint.json after each one (streaming formats)")
+    parser.add_argument("--resume", metavar="CHECKPOINT",
+                        help="Continue or extend the run recorded in a checkpoint, appending to its output")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Reviews per checkpointed chunk")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each generation stage and save platform_review_profile.json (python engine, 1 worker)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also record tracemalloc allocations per stage (slower)")
+    parser.add_argument("--scale-test", action="store_true",
+                        help="Skew locations (Zipf), dates (outage bursts) and review lengths (heavy tail), "
+                             "and save <output>.manifest.json with the expected selectivity of each filter")
+    parser.add_argument("--zipf", type=float, help="With --scale-test, location rank exponent (default 1.1)")
+    parser.add_argument("--outages", type=int, help="With --scale-test, outage bursts in the date window (default 6)")
+    parser.add_argument("--burst-share", type=float,
+                        help="With --scale-test, share of reviews dated in outage bursts (default 0.35)")
+    parser.add_argument("--burst-days", type=int, help="With --scale-test, days per outage burst (default 14)")
+    parser.add_argument("--text-tail", type=float,
+                        help="With --scale-test, Pareto shape of extra review text; smaller is longer (default 1.5)")
+    parser.add_argument("--keep-labels", action="store_true",
+                        help="Keep each review's generator label as sentiment_category (json/ndjson), "
+                             "e.g. to train review_triage.py")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count()
+    date_formats = {platform: config["date_format"] for platform, config in PLATFORM_CONFIGS.items()}
+    if args.checkpoint and args.format not in CHECKPOINT_FORMATS:
+        parser.error(f"--checkpoint needs a streaming --format ({', '.join(CHECKPOINT_FORMATS)})")
+    if args.keep_labels and (args.format in ("parquet", "arrow", "copy", "copy-binary")
+                             or args.checkpoint or args.resume):
+        parser.error("--keep-labels needs an NDJSON-based format (json, ndjson, ndjson-gz/zst or template), "
+                     "without --checkpoint or --resume")
+    if args.format == "ndjson-zst":
+        from review_blocks import codec_available
+        if not codec_available("zstd"):
+            parser.error("ndjson-zst requires the zstandard package")
+    if not args.resume:
+        args.total = args.total or 5000
+    skew = manifest = None
+    if args.scale_test:
+        if args.checkpoint or args.resume:
+            parser.error("--scale-test cannot be combined with --checkpoint or --resume")
+        from review_scale import ScaleManifest, quota_shares, scale_skew
+        # The skew is seeded from the run seed, so pick one the manifest can record
+        if args.seed is None:
+            args.seed = random.randrange(2 ** 32)
+        skew = scale_skew(args.seed, zipf_s=args.zipf, outages=args.outages, burst_share=args.burst_share,
+                          burst_days=args.burst_days, text_tail=args.text_tail)
+        manifest = ScaleManifest(date_formats)
+    # Every shard dates its reviews relative to the same day
+    reference = date.today()
+    profiler = None
+    if args.profile or args.profile_memory:
+        # Stages are timed in this process only, so shards must not run elsewhere
+        if args.engine != "python" or workers != 1:
+            parser.error("--profile needs --engine python and --workers 1")
+        from review_profile import StageProfiler, print_profile
+        profiler = StageProfiler(trace_memory=args.profile_memory)
+        profiler.instrument(sys.modules[__name__], PROFILE_STAGES)
+        profiler.instrument(ReviewTables, TABLE_PROFILE_STAGES)
+        profiler.instrument(CompiledTemplate, {"render": "substitute_variables"})
+        profiler.start()
+    
+    output_file = args.output or f"frontier_reviews_{args.total}_platform_authentic.{args.format.replace('-', '.')}"
+    
+    # Statistics are counted as reviews go by, so no second pass is needed
+    accumulator = ReviewStats()
+    if not (args.checkpoint or args.resume):
+        reviews = tally(review_stream(args.total, args.seed, workers, args.engine, reference, skew,
+                                      args.keep_labels),
+                        accumulator, review_tags)
+        if manifest:
+            reviews = manifest.count(reviews)
+    
+    if args.checkpoint or args.resume:
+        # Chunked run that can be resumed or extended from its checkpoint
+        if args.resume:
+            checkpoint_file = args.resume
+            checkpoint = load_checkpoint(checkpoint_file)
+        else:
+            checkpoint_file = f"{output_file}.checkpoint.json"
+            checkpoint = new_checkpoint(output_file, args.format, args.seed, engine=args.engine,
+                                        table=args.table, reference_date=reference.isoformat())
+        total = args.total or checkpoint["total"]
+        output_file = checkpoint["output"]
+        engine = checkpoint["settings"]["engine"]
+        shard_fn = generate_shard_batched if engine == "numpy" else generate_shard
+        write_chunk = chunk_writer(checkpoint, date_formats, LOCATIONS)
+        print(f"\nGenerating platform-authentic reviews {checkpoint['last_review_id'] + 1}-{total} into {output_file}...")
+        quotas = build_quotas(total)
+        accumulator = run_checkpointed(checkpoint, checkpoint_file, quotas, shard_fn, write_chunk,
+                                       review_tags, workers, args.chunk_size)
+        stats = summarize_statistics(accumulator)
+        print(f"[CHECKPOINT] {checkpoint_file}")
+    elif args.format == "ndjson":
+        # Stream reviews straight to disk, counting statistics on the way
+        print(f"\nStreaming {args.total} platform-authentic reviews to {output_file}...")
+        write_ndjson(reviews, output_file)
+        stats = summarize_statistics(accumulator)
+    elif args.format in ("ndjson-gz", "ndjson-zst"):
+        # Independently compressed NDJSON blocks, indexed by review_id for random access
+        from review_blocks import FORMAT_CODECS, index_file, write_blocks
+        print(f"\nStreaming {args.total} platform-authentic reviews to {output_file}...")
+        write_blocks(reviews, output_file, FORMAT_CODECS[args.format])
+        stats = summarize_statistics(accumulator)
+        print(f"[FILE] Index saved to: {index_file(output_file)}")
+    elif args.format == "template":
+        # Template ids, placeholder values and variation ops instead of expanded texts
+        from review_encoding import write_encoded
+        print(f"\nStreaming {args.total} platform-authentic reviews to {output_file}...")
+        write_encoded(reviews, output_file)
+        stats = summarize_statistics(accumulator)
+    elif args.format in ("copy", "copy-binary"):
+        # COPY-ready rows with the trigger's metadata columns precomputed
+        from review_copy import write_copy
+        binary = args.format == "copy-binary"
+        print(f"\nStreaming {args.total} platform-authentic reviews to {output_file}...")
+        write_copy(reviews, output_file, args.table, date_formats, LOCATIONS, binary)
+        stats = summarize_statistics(accumulator)
+        print(f"[LOAD] psql -f {shlex.quote(output_file + '.sql')}")
+    elif args.format in ("parquet", "arrow"):
+        # Columnar output, written one row group at a time
+        import review_arrow
+        write = review_arrow.write_parquet if args.format == "parquet" else review_arrow.write_arrow
+        print(f"\nStreaming {args.total} platform-authentic reviews to {output_file}...")
+        write(reviews, output_file, date_formats)
+        stats = summarize_statistics(accumulator)
+    else:
+        # Hold the dataset in compact columns; reviews become dicts again only while being written
+        print_plan(args.total)
+        reviews = ReviewBlock(reviews)
+        stats = summarize_statistics(accumulator)
+        write_json(reviews, output_file)
     
-    # Save reviews
-    output_file = "frontier_reviews_5000_platform_authentic.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(reviews, f, indent=2, ensure_ascii=False)
+    total_reviews = stats["total_reviews"]
     
     # Save statistics
     stats_file = "platform_review_statistics.json"
     with open(stats_file, "w", encoding="utf-8") as f:
         json.dump(stats, f, indent=2)
     
+    # Save the selectivity manifest for scale-test runs
+    if manifest:
+        manifest_file = f"{output_file}.manifest.json"
+        manifest.save(manifest_file, skew, reference, LOCATIONS, quota_shares(build_quotas(args.total)),
+                      stats=ReviewStats.from_dict(stats["accumulator"]))
+    
+    # Save the stage profile next to the statistics
+    if profiler:
+        profiler.stop()
+        profile_file = "platform_review_profile.json"
+        profiler.save(profile_file)
+    
     # Print summary
     print(f"\n{'=' * 70}")
     print("GENERATION COMPLETE!")
     print(f"{'=' * 70}\n")
     
-    print(f"[OK] Generated {len(reviews)} reviews")
+    print(f"[OK] Generated {total_reviews} reviews")
     print(f"[FILE] Saved to: {output_file}")
     print(f"[STATS] Statistics saved to: {stats_file}\n")
+    if manifest:
+        print(f"[MANIFEST] Scale-test selectivities (seed {args.seed}) saved to: {manifest_file}\n")
+    if profiler:
+        print_profile(profiler.report())
+        print(f"[PROFILE] Stage profile saved to: {profile_file}\n")
     
     print("WORD COUNT STATISTICS:")
     print(f"  Average:  {stats['word_count_stats']['average']:.1f} words")
@@ -467,20 +683,20 @@ if __name__ == "__main__":
     
     print("\nPLATFORM DISTRIBUTION:")
     for platform, count in sorted(stats["platform_distribution"].items()):
-        percentage = (count / len(reviews)) * 100
+        percentage = (count / total_reviews) * 100
         print(f"   {platform:20s}: {count:4d} ({percentage:5.1f}%)")
     
     print("\nRATING DISTRIBUTION:")
     for rating in sorted(stats["rating_distribution"].keys()):
         count = stats["rating_distribution"][rating]
-        percentage = (count / len(reviews)) * 100
+        percentage = (count / total_reviews) * 100
         bar = "=" * int(percentage / 2)
         print(f"   {rating} star: {count:4d} ({percentage:5.1f}%) {bar}")
     
     print("\nPLATFORM-SPECIFIC FEATURES:")
-    print(f"   Reviews with titles:      {stats['has_title_count']:4d} ({stats['has_title_count']/len(reviews)*100:5.1f}%)")
-    print(f"   Reviews with helpful votes: {stats['has_helpful_count']:4d} ({stats['has_helpful_count']/len(reviews)*100:5.1f}%)")
-    print(f"   Verified reviews:         {stats['verified_count']:4d} ({stats['verified_count']/len(reviews)*100:5.1f}%)")
+    print(f"   Reviews with titles:      {stats['has_title_count']:4d} ({stats['has_title_count']/total_reviews*100:5.1f}%)")
+    print(f"   Reviews with helpful votes: {stats['has_helpful_count']:4d} ({stats['has_helpful_count']/total_reviews*100:5.1f}%)")
+    print(f"   Verified reviews:         {stats['verified_count']:4d} ({stats['verified_count']/total_reviews*100:5.1f}%)")
     
     print(f"\n{'=' * 70}")
     print("Ready for seamless transition to real scraped reviews!")
@@ -0,0 +1,166 @@
+"""
+Regex fast path for the structured annotations in problem-focused reviews
+enhance_review_text in generate_problem_focused_reviews.py wraps every
+review in machine-written annotations:
+
+    Billing Issue (Primary) - Customer for 14 months: <review text>
+    Use Case: Work from home full-time (mission critical).
+    Resolution Status: Issue remains unresolved.
+    Churn Risk: High - Considering switching. Will switch to Cox when contract ends in 4 months.
+
+They carry the primary category, customer tenure, use case, resolution
+status, churn risk and competitor of the extraction schema, so a review
+whose annotations give all of them can skip the LLM. Matching is anchored
+at the start of the text and at the annotation markers found by rfind, so
+a row costs two compiled-regex matches and other reviews fail on the first.
+
+    python review_annotations.py reviews.ndjson     # coverage and rows/sec
+"""
+
+import argparse
+import re
+import time
+from collections import Counter, namedtuple
+
+from generate_problem_focused_reviews import CATEGORY_LABELS
+from review_core import read_reviews
+
+# Schema main_categories for each problem category label
+SCHEMA_CATEGORIES = {
+    "billing": "Pricing & Billing",
+    "network": "Network Performance",
+    "customer_service": "Customer Service",
+    "installation": "Installation & Setup",
+    "equipment": "Equipment & Hardware",
+    "cancellation": "Contracts & Terms",
+}
+LABEL_CATEGORIES = {CATEGORY_LABELS[category]: schema for category, schema in SCHEMA_CATEGORIES.items()}
+LABEL_CATEGORIES["Service Issue (Primary)"] = "Overall Satisfaction"
+
+# Upper bounds (months) of the schema's tenure categories
+TENURE_CATEGORIES = ((6, "new_customer"), (24, "established"), (60, "long_term"))
+
+PREAMBLE = re.compile(r"([A-Za-z ]+ Issue \(Primary\)) - Customer for (\d+) months: ")
+SUFFIX = re.compile(r"(?: Use Case: ([^.]+)\.)?(?: Resolution Status: ([^.]+)\.)?"
+                    r" Churn Risk: (\w+) - ([^.]+)\.(?: Will switch to (.+?) when contract ends in (\d+) months\."
+                    r"| Considering (.+?) as alternative\.)?$")
+
+CHURN_MARKER = " Churn Risk: "
+RESOLUTION_MARKER = " Resolution Status: "
+USE_CASE_MARKER = " Use Case: "
+
+# The suffix annotations fit in this many trailing characters, so the
+# marker searches never scan the review body
+SUFFIX_WINDOW = 400
+
+# Fields read from one review; None where the annotation is missing
+Annotations = namedtuple("Annotations", ["primary_category", "tenure_months", "use_case", "resolution_status",
+                                         "churn_risk", "switching_intent", "competitor", "contract_end_months"])
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def parse_annotations(text):
+    """Annotations of one review text, or None if it has no category preamble or churn line"""
+    preamble = PREAMBLE.match(text)
+    if preamble is None:
+        return None
+    window = max(0, len(text) - SUFFIX_WINDOW)
+    churn = text.rfind(CHURN_MARKER, window)
+    if churn < 0:
+        return None
+    # The suffix starts at the last use case or resolution marker before the churn line, if any
+    start = text.rfind(RESOLUTION_MARKER, window, churn)
+    if start < 0:
+        start = churn
+    use_case = text.rfind(USE_CASE_MARKER, window, start)
+    suffix = SUFFIX.match(text, use_case) if use_case > 0 else None
+    if suffix is None:
+        suffix = SUFFIX.match(text, start)
+        if suffix is None:
+            return None
+
+    use_case, resolution, risk, intent, contract_competitor, months, considered = suffix.groups()
+    if resolution is not None:
+        # Every annotated status is some form of "unresolved"
+        resolution = "unresolved"
+    elif "unresolved" in text.lower():
+        # The generator leaves the annotation out when the text already says so
+        resolution = "unresolved"
+    label, tenure = preamble.groups()
+    return Annotations(LABEL_CATEGORIES.get(label), int(tenure), use_case, resolution, risk.lower(), intent,
+                       contract_competitor or considered, int(months) if months else None)
+
+def covers(annotations):
+    """True if the annotations give every field the fast path fills"""
+    return (annotations is not None and annotations.primary_category is not None
+            and annotations.resolution_status is not None)
+
+def tenure_category(months):
+    for limit, category in TENURE_CATEGORIES:
+        if months < limit:
+            return category
+    return "very_long_term"
+
+def annotation_attributes(annotations):
+    """ai_attributes in extraction-schema shape for the fields the annotations give"""
+    competitors = [annotations.competitor] if annotations.competitor else []
+    return {
+        "extraction_method": "annotations",
+        "reviewer_profile": {
+            "customer_tenure": {"duration_months": annotations.tenure_months,
+                                "tenure_category": tenure_category(annotations.tenure_months)},
+            "use_cases": [annotations.use_case] if annotations.use_case else [],
+        },
+        "classification": {"primary_category": annotations.primary_category,
+                           "all_categories": [annotations.primary_category]},
+        "technical_issues": {"resolution_status": annotations.resolution_status},
+        "churn_analysis": {
+            "churn_risk": annotations.churn_risk,
+            "switching_intent": {"intent_expressed": True,
+                                 "statement": annotations.switching_intent,
+                                 "specific_competitor_mentioned": bool(competitors),
+                                 "contract_end_months": annotations.contract_end_months},
+        },
+        "competitive_data": {"competitors_mentioned": competitors},
+    }
+
+def fast_attributes(text):
+    """ai_attributes for a review the annotations fully cover, else None (route it to the LLM)"""
+    annotations = parse_annotations(text) if text else None
+    return annotation_attributes(annotations) if covers(annotations) else None
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse problem-focused review annotations and report coverage")
+    parser.add_argument("inputs", nargs="+", help="NDJSON or JSON review files")
+    args = parser.parse_args()
+
+    texts = [review.get("review_text") or "" for input_file in args.inputs for review in read_reviews(input_file)]
+    start = time.perf_counter()
+    parsed = [parse_annotations(text) for text in texts]
+    seconds = time.perf_counter() - start
+
+    fields = Counter()
+    covered = 0
+    for annotations in parsed:
+        if annotations is None:
+            continue
+        fields.update(name for name, value in zip(Annotations._fields, annotations) if value is not None)
+        covered += covers(annotations)
+    rows = len(texts)
+
+    print("=" * 70)
+    print("REVIEW ANNOTATION FAST PATH")
+    print("=" * 70)
+    print(f"\n[OK] Parsed {rows} reviews in {seconds:.3f}s ({rows / seconds if seconds else 0:,.0f} rows/sec)")
+    print(f"[STATS] {covered} fully covered ({covered / rows if rows else 0:.1%}), "
+          f"{rows - covered} need the LLM")
+    print("\nFIELDS FOUND:")
+    for name in Annotations._fields:
+        print(f"   {name:22s} {fields[name]:8d} ({fields[name] / rows if rows else 0:6.1%})")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,122 @@
+"""
+Arrow / Parquet output for the Frontier review generators
+Columns follow the core fields of Create_FRONTIER_REVIEWS_Table.sql, with a
+real DATE column instead of per-platform date strings and dictionary-encoded
+platform, location and reviewer_name columns
+"""
+
+from datetime import datetime
+from itertools import islice
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Rows per row group / record batch. Reviews are buffered one group at a time,
+# so memory stays flat no matter how many rows are written.
+ROW_GROUP_SIZE = 50000
+
+# Low-cardinality text columns stored as dictionaries
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+REVIEW_SCHEMA = pa.schema([
+    pa.field("review_id", pa.int32(), nullable=False),
+    pa.field("platform", DICTIONARY, nullable=False),
+    pa.field("review_date", pa.date32(), nullable=False),
+    pa.field("rating", pa.int16(), nullable=False),
+    pa.field("reviewer_name", DICTIONARY, nullable=False),
+    pa.field("location", DICTIONARY),
+    pa.field("review_text", pa.string(), nullable=False),
+    pa.field("helpful_count", pa.int32()),
+    pa.field("review_url", pa.string(), nullable=False),
+    pa.field("title", pa.string()),
+    pa.field("verified_reviewer", pa.bool_()),
+    pa.field("verified_customer", pa.bool_()),
+    pa.field("local_guide", pa.bool_()),
+])
+
+# review_date is parsed from the generators' "date" field
+SOURCE_FIELDS = {"review_date": "date"}
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def reviews_to_table(reviews, date_formats):
+    """Convert a list of review dicts into an Arrow table with REVIEW_SCHEMA.
+
+    date_formats maps each platform to the strftime format its dates use.
+    Fields a platform does not have (title, helpful_count, verification
+    flags) become nulls.
+    """
+    # Only a few thousand distinct (platform, date) strings exist per run
+    parsed = {}
+    dates = []
+    for review in reviews:
+        key = (review["platform"], review["date"])
+        day = parsed.get(key)
+        if day is None:
+            day = parsed[key] = datetime.strptime(key[1], date_formats[key[0]]).date()
+        dates.append(day)
+
+    columns = []
+    for field in REVIEW_SCHEMA:
+        if field.name == "review_date":
+            values = dates
+        else:
+            source = SOURCE_FIELDS.get(field.name, field.name)
+            values = [review.get(source) for review in reviews]
+        columns.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(columns, schema=REVIEW_SCHEMA)
+
+def iter_tables(reviews, date_formats, row_group_size=ROW_GROUP_SIZE):
+    """Yield Arrow tables of up to row_group_size reviews from any review iterable"""
+    reviews = iter(reviews)
+    while True:
+        chunk = list(islice(reviews, row_group_size))
+        if not chunk:
+            return
+        yield reviews_to_table(chunk, date_formats)
+
+def write_parquet(reviews, output_file, date_formats, row_group_size=ROW_GROUP_SIZE):
+    """Stream reviews into a Parquet file, one row group per chunk, and return the row count"""
+    count = 0
+    with pq.ParquetWriter(output_file, REVIEW_SCHEMA, compression="zstd") as writer:
+        for table in iter_tables(reviews, date_formats, row_group_size):
+            writer.write_table(table, row_group_size=row_group_size)
+            count += table.num_rows
+    return count
+
+def write_arrow(reviews, output_file, date_formats, row_group_size=ROW_GROUP_SIZE):
+    """Stream reviews into an Arrow IPC stream, one record batch per chunk, and return the row count.
+
+    The IPC stream format is used rather than the file format because each
+    chunk carries its own dictionaries, which the file format does not allow.
+    """
+    count = 0
+    with pa.OSFile(output_file, "wb") as sink, pa.ipc.new_stream(sink, REVIEW_SCHEMA) as writer:
+        for table in iter_tables(reviews, date_formats, row_group_size):
+            writer.write_table(table, max_chunksize=row_group_size)
+            count += table.num_rows
+    return count
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def _batch_rows(batch):
+    """Turn a record batch back into review dicts, dropping null fields"""
+    for row in batch.to_pylist():
+        yield {key: value for key, value in row.items() if value is not None}
+
+def read_parquet(input_file):
+    """Yield reviews from a Parquet file one row group at a time"""
+    parquet = pq.ParquetFile(input_file)
+    for idx in range(parquet.num_row_groups):
+        for batch in parquet.read_row_group(idx).to_batches():
+            yield from _batch_rows(batch)
+
+def read_arrow(input_file):
+    """Yield reviews from an Arrow IPC stream one record batch at a time"""
+    with pa.memory_map(input_file) as source:
+        for batch in pa.ipc.open_stream(source):
+            yield from _batch_rows(batch)
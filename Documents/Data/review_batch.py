@@ -0,0 +1,389 @@
+"""
+NumPy Columnar Batch Engine for the Frontier review generators
+Draws whole columns (ratings, area types, locations, day offsets, names,
+titles, helpful counts, verification flags, URL ids) for a block of reviews
+at once and only builds review dicts at the output boundary.
+Requires numpy; the per-review generators do not.
+"""
+
+from datetime import date, timedelta
+from itertools import repeat
+from operator import itemgetter
+
+import numpy as np
+
+from review_core import DATE_WINDOW_DAYS, split_quotas
+
+DEFAULT_BATCH_SIZE = 20000
+ANONYMOUS_IDS = (1000, 10000)  # "User1000" .. "User9999"
+URL_IDS = (100000, 1000000)
+
+# ============================================================================
+# SPEC AND LOOKUP TABLES
+# ============================================================================
+
+class BatchSpec:
+    """Generator-specific inputs for the batch engine.
+
+    `cells` are the quota keys in a fixed order. For each cell, `platforms`,
+    `rating_pools` and `title_pools` give its platform and the lists its
+    rating and title are drawn from uniformly. `text_column(cell_codes, rng)`
+    returns the review texts for a block plus their word counts as an array.
+    `cell_labels` is each cell's generator label, written to `label_field`
+    when labels are kept. The remaining arguments are the generator's
+    module-level constants.
+    """
+
+    def __init__(self, cells, platforms, rating_pools, title_pools, text_column,
+                 platform_configs, locations, area_weights, first_names, last_initials,
+                 anonymous_rate, verified_rate, helpful_limits, label_field=None, cell_labels=None):
+        self.cells = list(cells)
+        self.platforms = list(platforms)
+        self.rating_pools = rating_pools
+        self.title_pools = title_pools
+        self.text_column = text_column
+        self.platform_configs = platform_configs
+        self.locations = locations
+        self.area_weights = area_weights
+        self.first_names = first_names
+        self.last_initials = last_initials
+        self.anonymous_rate = anonymous_rate
+        self.verified_rate = verified_rate
+        self.helpful_limits = helpful_limits
+        self.label_field = label_field
+        self.cell_labels = cell_labels
+
+class PoolTable:
+    """Per-cell value pools flattened so one draw covers a whole block"""
+
+    def __init__(self, pools, dtype=object):
+        lengths = [len(pool) for pool in pools]
+        self.values = np.array([value for pool in pools for value in pool], dtype=dtype)
+        self.lengths = np.array(lengths, dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lengths)[:-1])).astype(np.int64)
+
+    def draw_index(self, cell_codes, rng):
+        """Flat index of one uniformly drawn pool entry per row"""
+        picks = (rng.random(cell_codes.size) * self.lengths[cell_codes]).astype(np.int64)
+        return self.offsets[cell_codes] + picks
+
+    def draw(self, cell_codes, rng):
+        return self.values[self.draw_index(cell_codes, rng)]
+
+class BatchTables:
+    """Lookup tables the engine indexes into, built once per run"""
+
+    def __init__(self, spec, reference=None, skew=None):
+        reference = reference or date.today()
+        configs = spec.platform_configs
+        self.platform_names = list(configs)
+        self.cell_platform = np.array([self.platform_names.index(p) for p in spec.platforms], dtype=np.int64)
+        self.has_title = [configs[p]["has_title"] for p in self.platform_names]
+        self.has_helpful = [configs[p]["has_helpful_count"] for p in self.platform_names]
+        self.verified_fields = [configs[p]["verified_field"] for p in self.platform_names]
+        self.url_prefixes = [f"https://example.com/reviews/{p.lower().replace(' ', '')}/" for p in self.platform_names]
+        self.platform_keys = [tuple(self.row_keys(p)) for p in range(len(self.platform_names))]
+
+        # Pre-formatted dates: one row per platform, one column per day offset
+        start = reference - timedelta(days=DATE_WINDOW_DAYS)
+        days = [start + timedelta(days=offset) for offset in range(DATE_WINDOW_DAYS)]
+        self.dates = np.array([[day.strftime(configs[p]["date_format"]) for day in days]
+                               for p in self.platform_names], dtype=object)
+
+        # Locations flattened with the probability of area weight / area size
+        total_weight = sum(spec.area_weights.values())
+        names, probs, areas = [], [], []
+        for area_code, (area, weight) in enumerate(spec.area_weights.items()):
+            for location in spec.locations[area]:
+                names.append(location)
+                probs.append(weight / total_weight / len(spec.locations[area]))
+                areas.append(area_code)
+        self.area_types = list(spec.area_weights)
+        self.locations = np.array(names, dtype=object)
+        self.location_probs = np.array(probs)
+        self.location_areas = np.array(areas, dtype=np.int64)
+
+        # Scale-test runs draw locations and days from skewed distributions
+        self.day_probs = None
+        if skew is not None:
+            from review_scale import day_weights, location_weights
+            weights = location_weights(skew, spec.locations)
+            self.location_probs = np.array([weights[name] for name in names])
+            self.location_probs /= self.location_probs.sum()
+            self.day_probs = np.array(day_weights(skew))
+            self.day_probs /= self.day_probs.sum()
+
+        # Reviewer names: anonymous handles first, then "First I." combinations
+        anonymous = [f"User{number}" for number in range(*ANONYMOUS_IDS)]
+        named = [f"{first} {initial}." for first in spec.first_names for initial in spec.last_initials]
+        self.anonymous_count = len(anonymous)
+        self.named_count = len(named)
+        self.names = np.array(anonymous + named, dtype=object)
+
+        self.ratings = PoolTable(spec.rating_pools, dtype=np.int64)
+        self.titles = PoolTable(spec.title_pools)
+
+    def row_keys(self, platform):
+        """Review keys for a platform code, in the same order as generate_review"""
+        keys = ["review_id", "platform", "date", "rating", "reviewer_name", "location", "review_text"]
+        if self.has_title[platform]:
+            keys.append("title")
+        if self.has_helpful[platform]:
+            keys.append("helpful_count")
+        if self.verified_fields[platform]:
+            keys.append(self.verified_fields[platform])
+        keys.append("review_url")
+        return keys
+
+# ============================================================================
+# COLUMN DRAWS
+# ============================================================================
+
+def draw_columns(spec, tables, cell_codes, rng):
+    """Draw every column for one block of reviews as arrays"""
+    n = cell_codes.size
+    texts, word_counts = spec.text_column(cell_codes, rng)
+
+    location_index = rng.choice(tables.locations.size, size=n, p=tables.location_probs)
+    anonymous = rng.random(n) < spec.anonymous_rate
+    name_index = np.where(anonymous,
+                          rng.integers(0, tables.anonymous_count, n),
+                          tables.anonymous_count + rng.integers(0, tables.named_count, n))
+
+    word_threshold, high, low = spec.helpful_limits
+    max_helpful = np.where(word_counts > word_threshold, high, low)
+
+    return {
+        "cell": cell_codes,
+        "platform": tables.cell_platform[cell_codes],
+        "rating": tables.ratings.draw(cell_codes, rng),
+        "review_text": texts,
+        "word_count": word_counts,
+        "location_index": location_index,
+        "area_type": tables.location_areas[location_index],
+        "day_offset": (rng.integers(0, DATE_WINDOW_DAYS, n) if tables.day_probs is None
+                       else rng.choice(DATE_WINDOW_DAYS, size=n, p=tables.day_probs)),
+        "name_index": name_index,
+        "title_index": tables.titles.draw_index(cell_codes, rng),
+        "helpful_count": rng.integers(0, max_helpful + 1),
+        "verified": rng.random(n) < spec.verified_rate,
+        "url_id": rng.integers(*URL_IDS, n),
+    }
+
+def build_rows(tables, columns, first_id=1):
+    """Turn one block of columns into review dicts with platform-specific fields.
+
+    Rows are built per platform group, then put back in block order with a
+    single gather; review IDs follow block order.
+    """
+    platforms = columns["platform"]
+    order = np.argsort(platforms, kind="stable")
+    bounds = np.searchsorted(platforms[order], np.arange(len(tables.platform_names) + 1))
+    texts = np.empty(platforms.size, dtype=object)
+    texts[:] = columns["review_text"]
+
+    grouped = []
+    for platform in range(len(tables.platform_names)):
+        idx = order[bounds[platform]:bounds[platform + 1]]
+        if not idx.size:
+            continue
+        values = [
+            (idx + first_id).tolist(),
+            repeat(tables.platform_names[platform]),
+            tables.dates[platform, columns["day_offset"][idx]].tolist(),
+            columns["rating"][idx].tolist(),
+            tables.names[columns["name_index"][idx]].tolist(),
+            tables.locations[columns["location_index"][idx]].tolist(),
+            texts[idx].tolist(),
+        ]
+        if tables.has_title[platform]:
+            values.append(tables.titles.values[columns["title_index"][idx]].tolist())
+        if tables.has_helpful[platform]:
+            values.append(columns["helpful_count"][idx].tolist())
+        if tables.verified_fields[platform]:
+            values.append(columns["verified"][idx].tolist())
+        values.append(list(map(tables.url_prefixes[platform].__add__, map(str, columns["url_id"][idx].tolist()))))
+        keys = tables.platform_keys[platform]
+        grouped.extend([dict(zip(keys, row)) for row in zip(*values)])
+
+    if len(grouped) == 1:
+        return grouped
+    return list(itemgetter(*np.argsort(order).tolist())(grouped))
+
+def iter_blocks(spec, quotas, seed=None, batch_size=DEFAULT_BATCH_SIZE, tables=None):
+    """Yield (tables, columns) for blocks of at most batch_size reviews.
+
+    Each block gets its share of every cell's quota, shuffled within the
+    block, so the per-cell totals match the sequential generator exactly.
+    """
+    rng = np.random.default_rng(seed)
+    tables = tables or BatchTables(spec)
+    cell_codes = {cell: code for code, cell in enumerate(spec.cells)}
+
+    total = sum(quotas.values())
+    block_count = max(1, -(-total // batch_size))
+    for block in split_quotas(quotas, block_count):
+        codes = np.repeat(np.array([cell_codes[cell] for cell in block], dtype=np.int64),
+                          list(block.values()))
+        if codes.size:
+            yield tables, draw_columns(spec, tables, rng.permutation(codes), rng)
+
+def iter_batched(spec, quotas, seed=None, batch_size=DEFAULT_BATCH_SIZE, reference=None, skew=None,
+                 labels=False):
+    """Yield review dicts from the columnar engine with sequential review IDs.
+
+    Dates are relative to `reference` (default today), like ReviewTables;
+    `skew` is a review_scale.ScaleSkew for scale-test runs. With labels,
+    every review also gets its cell's label under spec.label_field.
+    """
+    cell_labels = np.array(spec.cell_labels, dtype=object) if labels else None
+    next_id = 1
+    for tables, columns in iter_blocks(spec, quotas, seed, batch_size, BatchTables(spec, reference, skew)):
+        rows = build_rows(tables, columns, next_id)
+        next_id += len(rows)
+        if labels:
+            for row, label in zip(rows, cell_labels[columns["cell"]].tolist()):
+                row[spec.label_field] = label
+        yield from rows
+
+# ============================================================================
+# TEXT COLUMNS
+# ============================================================================
+
+def _words(text):
+    return len(text.split())
+
+def template_text_column(cell_pools, variations=(), variation_rate=0.0):
+    """Build a text_column for generators that render CompiledTemplates.
+
+    `cell_pools` gives, per cell, the compiled templates a review in that cell
+    is drawn from. Placeholder values are drawn per template as index arrays.
+    Word counts come from the template plus the extra words in each sampled
+    value; the language variations never change a word count.
+    """
+    templates, pools, seen = [], [], {}
+    for pool in cell_pools:
+        ids = []
+        for template in pool:
+            if id(template) not in seen:
+                seen[id(template)] = len(templates)
+                templates.append(template)
+            ids.append(seen[id(template)])
+        pools.append(ids)
+
+    pool_table = PoolTable(pools, dtype=np.int64)
+    base_words = np.array([_words(t.text) for t in templates], dtype=np.int64)
+    domains = [[np.array(domain, dtype=object) for domain in t.domains] for t in templates]
+    extra_words = [[np.array([value.count(" ") * t.slots.count(j) for value in domain], dtype=np.int64)
+                    for j, domain in enumerate(t.domains)] for t in templates]
+
+    def text_column(cell_codes, rng):
+        n = cell_codes.size
+        template_ids = pool_table.draw(cell_codes, rng)
+        word_counts = base_words[template_ids]
+        texts = np.empty(n, dtype=object)
+
+        for tid in np.unique(template_ids).tolist():
+            rows = np.flatnonzero(template_ids == tid)
+            template = templates[tid]
+            if not template.domains:
+                texts[rows] = template.parts[0]
+                continue
+            picks = [rng.integers(0, domain.size, rows.size) for domain in domains[tid]]
+            for extra, pick in zip(extra_words[tid], picks):
+                word_counts[rows] += extra[pick]
+            value_columns = [domain[pick].tolist() for domain, pick in zip(domains[tid], picks)]
+            pieces = [repeat(part) for part in template.parts]
+            pieces[1::2] = [value_columns[slot] for slot in template.slots]
+            texts[rows] = list(map("".join, zip(*pieces)))
+
+        texts = texts.tolist()
+
+        # Apply 1-2 random variations to a share of reviews
+        varied = np.flatnonzero(rng.random(n) < variation_rate) if variations else np.empty(0, np.int64)
+        if varied.size:
+            counts = rng.integers(1, 3, varied.size).tolist()
+            picks = rng.integers(0, len(variations), (varied.size, 2)).tolist()
+            for row, count, pick in zip(varied.tolist(), counts, picks):
+                text = texts[row]
+                for k in pick[:count]:
+                    old, new = variations[k]
+                    if old in text:
+                        text = text.replace(old, new, 1)
+                texts[row] = text
+
+        return texts, word_counts
+
+    return text_column
+
+def enhanced_text_column(cell_categories, category_templates, category_labels, use_cases,
+                         competitors, churn_risks, switching_intents, resolution_statuses):
+    """Build a text_column that mirrors generate_problem_focused_reviews.enhance_review_text.
+
+    Every attribute of the preamble and suffix is drawn as a column of indices
+    into tables of pre-formatted pieces, and each row is a single join.
+    Word counts are summed from the same tables.
+    """
+    categories = list(category_templates)
+    category_of_cell = np.array([categories.index(c) for c in cell_categories], dtype=np.int64)
+
+    templates, pools = [], []
+    for c in categories:
+        pools.append(list(range(len(templates), len(templates) + len(category_templates[c]))))
+        templates.extend(category_templates[c])
+    template_table = PoolTable(pools, dtype=np.int64)
+
+    labels = [category_labels.get(c, "Service Issue (Primary)") for c in categories]
+    risks = [r.capitalize() for r in churn_risks]
+    tenures = range(3, 25)
+    contract_ends = range(0, 13)
+
+    # Every piece of the preamble and suffix, pre-formatted with its leading
+    # or trailing space; index 0 of the optional tables is the empty piece
+    prefixes = np.array([[f"{label} - Customer for {m} months: " for m in tenures] for label in labels], dtype=object)
+    use_case_pieces = np.array([""] + [f" Use Case: {u}." for u in use_cases], dtype=object)
+    resolution_pieces = np.array([""] + [f" Resolution Status: {r}." for r in resolution_statuses], dtype=object)
+    churn_pieces = np.array([[f" Churn Risk: {r} - {s}." for s in switching_intents] for r in risks], dtype=object)
+    competitor_pieces = np.array([[""] * len(contract_ends)] + [
+        [f" Will switch to {c} when contract ends in {m} months." if m else f" Considering {c} as alternative."
+         for m in contract_ends] for c in competitors], dtype=object)
+
+    template_texts = np.array(templates, dtype=object)
+    template_words = np.array([_words(t) for t in templates], dtype=np.int64)
+    mentions_wfh = np.array(["work from home" in t.lower() for t in templates])
+    mentions_resolved = np.array(["resolved" in t.lower() for t in templates])
+    work_use_case = np.array(["work" in u.lower() for u in use_cases])
+
+    word_table = np.vectorize(_words, otypes=[np.int64])
+    prefix_words = word_table(prefixes)
+    use_case_words = word_table(use_case_pieces)
+    resolution_words = word_table(resolution_pieces)
+    churn_words = word_table(churn_pieces)
+    competitor_words = word_table(competitor_pieces)
+
+    def text_column(cell_codes, rng):
+        n = cell_codes.size
+        category = category_of_cell[cell_codes]
+        template = template_table.draw(category, rng)
+        tenure = rng.integers(0, len(tenures), n)
+        contract = np.where(rng.random(n) < 0.7, rng.integers(0, len(contract_ends), n), 0)
+        use_case = rng.integers(0, len(use_cases), n)
+        competitor = np.where(rng.random(n) < 0.6, rng.integers(1, len(competitors) + 1, n), 0)
+        risk = rng.integers(0, len(risks), n)
+        intent = rng.integers(0, len(switching_intents), n)
+        resolution = rng.integers(0, len(resolution_statuses), n)
+
+        # Use case only when work matters and the text doesn't say it already;
+        # resolution status only when the text doesn't mention resolution
+        use_case = np.where(~mentions_wfh[template] & work_use_case[use_case], use_case + 1, 0)
+        resolution = np.where(mentions_resolved[template], 0, resolution + 1)
+
+        pieces = (prefixes[category, tenure], template_texts[template], use_case_pieces[use_case],
+                  resolution_pieces[resolution], churn_pieces[risk, intent], competitor_pieces[competitor, contract])
+        texts = list(map("".join, zip(*(piece.tolist() for piece in pieces))))
+        word_counts = (prefix_words[category, tenure] + template_words[template] + use_case_words[use_case]
+                       + resolution_words[resolution] + churn_words[risk, intent]
+                       + competitor_words[competitor, contract])
+        return texts, word_counts
+
+    return text_column
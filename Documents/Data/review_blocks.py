@@ -0,0 +1,330 @@
+"""
+Block-compressed NDJSON with a review_id index
+Reviews are written as NDJSON in blocks of BLOCK_ROWS rows, each block an
+independent gzip member or zstd frame, so the file is still an ordinary
+.ndjson.gz (zcat reads it) or .ndjson.zst. A sidecar <file>.index.ndjson
+holds a header line and then one line per block with its review_id range,
+byte offset, size and row count; appending a chunk only appends lines.
+BlockReader uses it to seek straight to the blocks holding the requested
+reviews and decompress only those, and full scans decompress blocks on a
+thread pool ahead of parsing (zlib and zstd release the GIL). zstd needs
+the zstandard package.
+
+    python review_blocks.py pack reviews.ndjson --output reviews.ndjson.gz
+    python review_blocks.py get reviews.ndjson.gz 17 42 1000-1100 [--output sample.ndjson]
+    python review_blocks.py scan reviews.ndjson.gz [--workers 4]
+"""
+
+import argparse
+import bisect
+import gzip
+import importlib.util
+import json
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from review_core import read_reviews
+
+FORMAT = "review-blocks"
+FORMAT_VERSION = 2
+INDEX_SUFFIX = ".index.ndjson"
+
+# Rows per compressed block: smaller blocks make lookups cheaper and compress worse
+BLOCK_ROWS = 1000
+
+# Codec per generator --format, and the file suffix each codec gets
+FORMAT_CODECS = {"ndjson-gz": "gzip", "ndjson-zst": "zstd"}
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Compression levels: gzip's own default, and zstd's
+LEVELS = {"gzip": 6, "zstd": 3}
+
+# Bytes read from the end of an index to find its last block line
+INDEX_TAIL_BYTES = 4096
+
+# zlib window bits that read and write a gzip header and trailer
+GZIP_WBITS = 31
+
+# How json.dumps starts a generated review, so lookups can read its id without parsing
+ID_PREFIX = '{"review_id": '
+
+# Threads decompressing ahead of a full scan
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# ============================================================================
+# CODECS
+# ============================================================================
+
+def codec_functions(codec, level=None):
+    """(compress, decompress) for a codec; each block is compressed on its own"""
+    level = LEVELS[codec] if level is None else level
+    if codec == "gzip":
+        def compress(data):
+            compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+            return compressor.compress(data) + compressor.flush()
+        return compress, lambda data: zlib.decompress(data, GZIP_WBITS)
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=level).compress, zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Unknown codec {codec!r}")
+
+def codec_available(codec):
+    """Whether a codec can be used here; zstd needs the zstandard package"""
+    return codec != "zstd" or importlib.util.find_spec("zstandard") is not None
+
+def index_file(output_file):
+    return output_file + INDEX_SUFFIX
+
+def index_header(codec):
+    return {"format": FORMAT, "version": FORMAT_VERSION, "codec": codec}
+
+def _check_header(header, input_file):
+    if header.get("format") != FORMAT or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{index_file(input_file)} is not a version {FORMAT_VERSION} {FORMAT} index")
+    return header
+
+def load_index(input_file):
+    """The index header with its "blocks" list; a last line cut short by a crash is ignored"""
+    with open(index_file(input_file), "r", encoding="utf-8") as f:
+        index = _check_header(json.loads(f.readline() or "{}"), input_file)
+        blocks = []
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            blocks.append(json.loads(line))
+    index["blocks"] = blocks
+    return index
+
+def _index_tail(input_file):
+    """(header, end) of an index without loading every block line.
+
+    end is the byte offset just past the last indexed block, or None when
+    the index ends in a line cut short by a crash.
+    """
+    path = index_file(input_file)
+    with open(path, "rb") as f:
+        header = _check_header(json.loads(f.readline() or b"{}"), input_file)
+        f.seek(max(f.tell(), os.path.getsize(path) - INDEX_TAIL_BYTES))
+        tail = f.read()
+    if not tail:
+        return header, 0
+    if not tail.endswith(b"\n"):
+        return header, None
+    _, _, offset, size, _ = json.loads(tail[:-1].rsplit(b"\n", 1)[-1])
+    return header, offset + size
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def encode_block(reviews):
+    """One block's NDJSON bytes, exactly as write_ndjson writes those reviews"""
+    return "".join(json.dumps(review, ensure_ascii=False) + "\n" for review in reviews).encode("utf-8")
+
+def write_blocks(reviews, output_file, codec="gzip", block_rows=BLOCK_ROWS, level=None, append=False):
+    """Write reviews as compressed NDJSON blocks plus the index, and return the number written.
+
+    When appending, new block lines are appended to the index, so each
+    chunk of a checkpointed run costs only its own blocks. Index entries past
+    the end of the file (blocks of a run cut short and since truncated) are
+    dropped first; only then is the whole index rewritten.
+    """
+    compress, _ = codec_functions(codec, level)
+    rewrite = None
+    if append and os.path.exists(output_file) and os.path.exists(index_file(output_file)):
+        header, end = _index_tail(output_file)
+        if header["codec"] != codec:
+            raise ValueError(f"{output_file} holds {header['codec']} blocks, not {codec}")
+        size = os.path.getsize(output_file)
+        if end is None or end > size:
+            rewrite = [block for block in load_index(output_file)["blocks"] if block[2] + block[3] <= size]
+    else:
+        rewrite = []
+
+    blocks = []
+    count = 0
+    reviews = iter(reviews)
+    with open(output_file, "ab" if append else "wb") as f:
+        while True:
+            chunk = list(islice(reviews, block_rows))
+            if not chunk:
+                break
+            data = compress(encode_block(chunk))
+            ids = [review["review_id"] for review in chunk]
+            blocks.append([min(ids), max(ids), f.tell(), len(data), len(chunk)])
+            f.write(data)
+            count += len(chunk)
+
+    if rewrite is None:
+        with open(index_file(output_file), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(block) + "\n" for block in blocks)
+    else:
+        with open(index_file(output_file), "w", encoding="utf-8") as f:
+            f.write(json.dumps(index_header(codec)) + "\n")
+            f.writelines(json.dumps(block) + "\n" for block in rewrite + blocks)
+    return count
+
+# ============================================================================
+# READING
+# ============================================================================
+
+class BlockReader:
+    """Random access and parallel scans over a block-compressed file and its index.
+
+    Index entries are [first review_id, last review_id, offset, size, rows];
+    when the ranges ascend without overlapping (as generated files do), a
+    lookup is a bisection, otherwise every range is checked.
+    """
+
+    __slots__ = ("input_file", "codec", "blocks", "firsts", "ordered", "decompress")
+
+    def __init__(self, input_file):
+        index = load_index(input_file)
+        self.input_file = input_file
+        self.codec = index["codec"]
+        self.blocks = index["blocks"]
+        self.firsts = [block[0] for block in self.blocks]
+        self.ordered = all(before[1] < after[0] for before, after in zip(self.blocks, self.blocks[1:]))
+        _, self.decompress = codec_functions(self.codec)
+
+    def __len__(self):
+        return sum(block[4] for block in self.blocks)
+
+    def blocks_for(self, review_id):
+        """Indexes of the blocks whose review_id range holds review_id"""
+        if self.ordered:
+            position = bisect.bisect_right(self.firsts, review_id) - 1
+            return [position] if position >= 0 and review_id <= self.blocks[position][1] else []
+        return [position for position, (first, last, *_) in enumerate(self.blocks) if first <= review_id <= last]
+
+    def _read(self, f, position):
+        _, _, offset, size, _ = self.blocks[position]
+        f.seek(offset)
+        return f.read(size)
+
+    def _blocks(self, positions, workers):
+        """NDJSON lines of each block at positions, in order, decompressed up to 2 * workers blocks ahead"""
+        with open(self.input_file, "rb") as f, ThreadPoolExecutor(workers) as pool:
+            pending = deque()
+            for position in positions:
+                pending.append(pool.submit(self.decompress, self._read(f, position)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result().decode("utf-8").split("\n")
+            while pending:
+                yield pending.popleft().result().decode("utf-8").split("\n")
+
+    def get(self, review_ids, workers=DEFAULT_WORKERS):
+        """{review_id: review} for the requested ids found in the file; only their blocks are read.
+
+        Lines that start with another review_id are skipped without parsing.
+        """
+        wanted = set(review_ids)
+        positions = sorted({position for review_id in wanted for position in self.blocks_for(review_id)})
+        found = {}
+        for lines in self._blocks(positions, workers):
+            for line in lines:
+                if line.startswith(ID_PREFIX):
+                    head = line[len(ID_PREFIX):line.find(",", len(ID_PREFIX))]
+                    if head.isdigit() and int(head) not in wanted:
+                        continue
+                if line:
+                    review = json.loads(line)
+                    if review.get("review_id") in wanted:
+                        found[review["review_id"]] = review
+        return found
+
+    def scan(self, workers=DEFAULT_WORKERS):
+        """Every review in file order"""
+        for lines in self._blocks(range(len(self.blocks)), workers):
+            for line in lines:
+                if line:
+                    yield json.loads(line)
+
+    def __iter__(self):
+        return self.scan()
+
+def read_blocks(input_file):
+    """Yield reviews from a block-compressed file, through its index if it has one.
+
+    Without an index a .gz file is read as one gzip stream.
+    """
+    if os.path.exists(index_file(input_file)):
+        return iter(BlockReader(input_file))
+    return read_gzip(input_file)
+
+def read_gzip(input_file):
+    """Yield reviews from gzip-compressed NDJSON read as one stream"""
+    with gzip.open(input_file, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def parse_ids(values):
+    """review_ids from CLI arguments such as 17 or 1000-1100"""
+    ids = []
+    for value in values:
+        first, _, last = value.partition("-")
+        ids.extend(range(int(first), int(last or first) + 1))
+    return ids
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write, query or scan block-compressed review files")
+    parser.add_argument("command", choices=["pack", "get", "scan"])
+    parser.add_argument("input", help="Reviews to pack (NDJSON or JSON), or a block-compressed file")
+    parser.add_argument("ids", nargs="*", help="review_ids or ranges (e.g. 1000-1100) for get")
+    parser.add_argument("--output", help="Output file for pack, or NDJSON output for get")
+    parser.add_argument("--codec", choices=sorted(CODEC_SUFFIXES), default="gzip", help="Codec for pack")
+    parser.add_argument("--block-rows", type=int, default=BLOCK_ROWS, help="Rows per block for pack")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Decompression threads for get and scan")
+    args = parser.parse_args()
+    if args.command == "pack" and not args.output:
+        parser.error("pack needs --output")
+    if args.command == "pack" and not codec_available(args.codec):
+        parser.error(f"--codec {args.codec} requires the zstandard package")
+    if args.command == "get" and not args.ids:
+        parser.error("get needs review_ids")
+
+    print("=" * 70)
+    print("BLOCK-COMPRESSED REVIEWS")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    if args.command == "pack":
+        count = write_blocks(read_reviews(args.input), args.output, args.codec, args.block_rows)
+        seconds = time.perf_counter() - start
+        in_size, out_size = os.path.getsize(args.input), os.path.getsize(args.output)
+        print(f"\n[OK] Packed {count} reviews in {seconds:.2f}s ({count / seconds if seconds else 0:,.0f} rows/sec)")
+        print(f"[FILE] {args.input}: {in_size:,} bytes -> {args.output}: {out_size:,} bytes "
+              f"({out_size / in_size if in_size else 0:.1%})")
+        print(f"[FILE] Index saved to: {index_file(args.output)}")
+    elif args.command == "get":
+        reader = BlockReader(args.input)
+        ids = parse_ids(args.ids)
+        found = reader.get(ids, args.workers)
+        seconds = time.perf_counter() - start
+        blocks = len({position for review_id in ids for position in reader.blocks_for(review_id)})
+        print(f"\n[OK] Found {len(found)} of {len(ids)} reviews in {seconds:.3f}s, "
+              f"reading {blocks} of {len(reader.blocks)} blocks")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                for review_id in ids:
+                    if review_id in found:
+                        f.write(json.dumps(found[review_id], ensure_ascii=False))
+                        f.write("\n")
+            print(f"[FILE] Saved to: {args.output}")
+    else:
+        reader = BlockReader(args.input)
+        count = sum(1 for _ in reader.scan(args.workers))
+        seconds = time.perf_counter() - start
+        print(f"\n[OK] Scanned {count} reviews in {len(reader.blocks)} blocks with {args.workers} thread{'s' if args.workers != 1 else ''} "
+              f"in {seconds:.2f}s ({count / seconds if seconds else 0:,.0f} rows/sec)")
+    print(f"\n{'=' * 70}\n")
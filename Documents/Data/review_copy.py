@@ -0,0 +1,311 @@
+"""
+PostgreSQL COPY output for the Frontier review generators
+Writes frontier_reviews / frontier_reviews_processed rows in COPY text or
+binary format with the geographic and temporal metadata already filled in,
+so a bulk load can skip the per-row calculate_review_metadata() trigger.
+days_ago depends on the day the rows are loaded, not generated, so the load
+script adds it with CURRENT_DATE like the trigger does
+"""
+
+import os
+import struct
+from datetime import date, datetime, timedelta
+
+# Core review columns shared by both tables, with their COPY wire types
+REVIEW_COLUMNS = [
+    ("review_id", "int4"),
+    ("platform", "text"),
+    ("review_date", "date"),
+    ("rating", "int2"),
+    ("reviewer_name", "text"),
+    ("location", "text"),
+    ("review_text", "text"),
+    ("helpful_count", "int4"),
+    ("review_url", "text"),
+    ("title", "text"),
+    ("verified_reviewer", "bool"),
+    ("verified_customer", "bool"),
+    ("local_guide", "bool"),
+]
+
+# Columns calculate_review_metadata() would otherwise fill in, except days_ago
+METADATA_COLUMNS = [
+    ("city", "text"),
+    ("state", "text"),
+    ("region", "text"),
+    ("area_type", "text"),
+    ("date_parsed", "date"),
+    ("year", "int4"),
+    ("month", "int4"),
+    ("quarter", "text"),
+    ("week_of_year", "int4"),
+]
+
+TABLE_COLUMNS = {
+    "frontier_reviews": REVIEW_COLUMNS + METADATA_COLUMNS,
+    "frontier_reviews_processed": REVIEW_COLUMNS + METADATA_COLUMNS + [("processing_status", "text")],
+}
+
+# Insert trigger from Create_Metadata_Trigger.sql, per table
+METADATA_TRIGGERS = {
+    "frontier_reviews": "trigger_calculate_review_metadata",
+}
+
+# Same rules as calculate_review_metadata()
+STATE_REGIONS = {"CA": "West Coast", "TX": "South"}
+DEFAULT_REGION = "Other"
+
+# review_date is parsed from the generators' "date" field
+SOURCE_FIELDS = {"review_date": "date"}
+
+# ============================================================================
+# DERIVED METADATA
+# ============================================================================
+
+def location_metadata(location, area_type=None):
+    """Return (city, state, region, area_type) for a location string.
+
+    Mirrors calculate_review_metadata(): "City, ST" splits into city and
+    state, "Rural ..." keeps the whole string as the city. area_type comes
+    from the generator's LOCATIONS table when the caller knows it, and
+    otherwise falls back to the trigger's rural/suburban rule.
+    """
+    if location is None:
+        return None, None, DEFAULT_REGION, area_type or "suburban"
+    if "," in location:
+        city, state = location.split(",")[:2]
+        city, state = city.strip(), state.strip()
+    elif location.startswith("Rural"):
+        city, state = location, None
+    else:
+        city, state = None, None
+    if area_type is None:
+        area_type = "rural" if location.startswith("Rural") else "suburban"
+    return city, state, STATE_REGIONS.get(state, DEFAULT_REGION), area_type
+
+def date_metadata(day):
+    """Return (date_parsed, year, month, quarter, week_of_year) for a DATE"""
+    quarter = f"Q{(day.month - 1) // 3 + 1} {day.year}"
+    return day, day.year, day.month, quarter, day.isocalendar()[1]
+
+def copy_rows(reviews, table, date_formats, locations):
+    """Yield one tuple per review in TABLE_COLUMNS[table] order.
+
+    date_formats maps each platform to its strftime date format and
+    locations is the generator's {area_type: [location, ...]} table. Fields
+    a platform does not have are None (NULL). Metadata is cached per
+    distinct location and date, since both come from small tables.
+    """
+    area_types = {location: area for area, names in locations.items() for location in names}
+    review_fields = [SOURCE_FIELDS.get(name, name) for name, _ in REVIEW_COLUMNS]
+    processed = table == "frontier_reviews_processed"
+    places = {}
+    days = {}
+
+    for review in reviews:
+        values = [review.get(field) for field in review_fields]
+
+        key = (review["platform"], review["date"])
+        day_meta = days.get(key)
+        if day_meta is None:
+            day = datetime.strptime(key[1], date_formats[key[0]]).date()
+            day_meta = days[key] = date_metadata(day)
+        values[2] = day_meta[0]
+
+        location = review.get("location")
+        place_meta = places.get(location)
+        if place_meta is None:
+            place_meta = places[location] = location_metadata(location, area_types.get(location))
+
+        row = tuple(values) + place_meta + day_meta
+        if processed:
+            row += ("pending",)
+        yield row
+
+# ============================================================================
+# TEXT FORMAT
+# ============================================================================
+
+TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+TEXT_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+TEXT_NULL = "\\N"
+
+TEXT_ENCODERS = {
+    "int2": str,
+    "int4": str,
+    "date": date.isoformat,
+    "bool": lambda value: "t" if value else "f",
+    "text": lambda value: value.translate(TEXT_ESCAPES),
+}
+
+TEXT_DECODERS = {
+    "int2": int,
+    "int4": int,
+    "date": date.fromisoformat,
+    "bool": lambda value: value == "t",
+    "text": lambda value: value,
+}
+
+def _unescape(field):
+    """Undo COPY text escaping for one field"""
+    if "\\" not in field:
+        return field
+    out = []
+    chars = iter(field)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            char = TEXT_UNESCAPES.get(char, char)
+        out.append(char)
+    return "".join(out)
+
+def write_copy_text(rows, output_file, columns, append=False):
+    """Write rows in COPY text format (tab separated, \\N for NULL) and return the count"""
+    encoders = [TEXT_ENCODERS[kind] for _, kind in columns]
+    count = 0
+    with open(output_file, "a" if append else "w", encoding="utf-8", newline="\n") as f:
+        for row in rows:
+            f.write("\t".join([TEXT_NULL if value is None else encode(value)
+                               for encode, value in zip(encoders, row)]))
+            f.write("\n")
+            count += 1
+    return count
+
+def read_copy_text(input_file, columns):
+    """Yield rows from a COPY text file as dicts of their non-NULL columns"""
+    names = [name for name, _ in columns]
+    decoders = [TEXT_DECODERS[kind] for _, kind in columns]
+    with open(input_file, "r", encoding="utf-8", newline="\n") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            yield {name: decode(_unescape(field))
+                   for name, decode, field in zip(names, decoders, fields)
+                   if field != TEXT_NULL}
+
+# ============================================================================
+# BINARY FORMAT
+# ============================================================================
+
+BINARY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+BINARY_HEADER = BINARY_SIGNATURE + struct.pack(">ii", 0, 0)
+BINARY_TRAILER = struct.pack(">h", -1)
+BINARY_NULL = struct.pack(">i", -1)
+POSTGRES_EPOCH = date(2000, 1, 1)
+
+def _binary_text(value):
+    """Length-prefixed UTF-8 field"""
+    data = value.encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+BINARY_ENCODERS = {
+    "int2": lambda value: struct.pack(">ih", 2, value),
+    "int4": lambda value: struct.pack(">ii", 4, value),
+    "date": lambda value: struct.pack(">ii", 4, (value - POSTGRES_EPOCH).days),
+    "bool": lambda value: b"\x00\x00\x00\x01\x01" if value else b"\x00\x00\x00\x01\x00",
+    "text": _binary_text,
+}
+
+BINARY_DECODERS = {
+    "int2": lambda data: struct.unpack(">h", data)[0],
+    "int4": lambda data: struct.unpack(">i", data)[0],
+    "date": lambda data: POSTGRES_EPOCH + timedelta(days=struct.unpack(">i", data)[0]),
+    "bool": lambda data: data != b"\x00",
+    "text": lambda data: data.decode("utf-8"),
+}
+
+def write_copy_binary(rows, output_file, columns, append=False):
+    """Write rows in PostgreSQL binary COPY format and return the count.
+
+    With append, rows are added to an existing file by overwriting its
+    end-of-data trailer.
+    """
+    encoders = [BINARY_ENCODERS[kind] for _, kind in columns]
+    field_count = struct.pack(">h", len(columns))
+    count = 0
+    append = append and os.path.exists(output_file) and os.path.getsize(output_file) > 0
+    with open(output_file, "r+b" if append else "wb") as f:
+        if append:
+            f.seek(-len(BINARY_TRAILER), os.SEEK_END)
+        else:
+            f.write(BINARY_HEADER)
+        for row in rows:
+            f.write(field_count + b"".join([BINARY_NULL if value is None else encode(value)
+                                            for encode, value in zip(encoders, row)]))
+            count += 1
+        f.write(BINARY_TRAILER)
+    return count
+
+def read_copy_binary(input_file, columns):
+    """Yield rows from a binary COPY file as dicts of their non-NULL columns"""
+    names = [name for name, _ in columns]
+    decoders = [BINARY_DECODERS[kind] for _, kind in columns]
+    with open(input_file, "rb") as f:
+        header = f.read(len(BINARY_SIGNATURE) + 8)
+        if not header.startswith(BINARY_SIGNATURE):
+            raise ValueError(f"{input_file} is not a binary COPY file")
+        f.read(struct.unpack(">i", header[-4:])[0])
+
+        while True:
+            field_count = struct.unpack(">h", f.read(2))[0]
+            if field_count == -1:
+                return
+            row = {}
+            for name, decode in zip(names, decoders):
+                length = struct.unpack(">i", f.read(4))[0]
+                if length >= 0:
+                    row[name] = decode(f.read(length))
+            yield row
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def psql_literal(value):
+    """Quote a string for a psql command argument such as the \\copy file name"""
+    return "'" + value.replace("'", "''") + "'"
+
+def load_script(table, data_file, binary=False):
+    """Return a psql script that bulk-loads data_file with one \\copy.
+
+    The file is copied into a temporary staging table with the target's
+    column types (no indexes or triggers), then moved into the table with
+    one INSERT ... SELECT that adds days_ago as of the load, so every row is
+    written to the table once. The metadata trigger is disabled for the
+    insert (the file already has the derived columns) and re-enabled in the
+    same transaction.
+    """
+    columns = ", ".join(name for name, _ in TABLE_COLUMNS[table])
+    copy_format = "binary" if binary else "text"
+    trigger = METADATA_TRIGGERS.get(table)
+    staging = f"{table}_load"
+
+    lines = ["BEGIN;",
+             f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {columns} FROM {table} WITH NO DATA;",
+             f"\\copy {staging} ({columns}) FROM {psql_literal(data_file)} WITH (FORMAT {copy_format})"]
+    if trigger:
+        lines.append(f"ALTER TABLE {table} DISABLE TRIGGER {trigger};")
+    lines.append(f"INSERT INTO {table} ({columns}, days_ago) "
+                 f"SELECT {columns}, CURRENT_DATE - review_date FROM {staging};")
+    if trigger:
+        lines.append(f"ALTER TABLE {table} ENABLE TRIGGER {trigger};")
+    lines.append("COMMIT;")
+    return "\n".join(lines) + "\n"
+
+def write_copy(reviews, output_file, table, date_formats, locations, binary=False, append=False):
+    """Write reviews as a COPY file for `table` plus a `<output_file>.sql` load script.
+
+    Returns the number of rows written. With append, rows are added to an
+    existing COPY file of the same table and format.
+    """
+    columns = TABLE_COLUMNS[table]
+    rows = copy_rows(reviews, table, date_formats, locations)
+    writer = write_copy_binary if binary else write_copy_text
+    count = writer(rows, output_file, columns, append)
+    with open(f"{output_file}.sql", "w", encoding="utf-8") as f:
+        f.write(load_script(table, output_file, binary))
+    return count
+
+def read_copy(input_file, table, binary=False):
+    """Yield the rows of a COPY file written by write_copy() as dicts"""
+    reader = read_copy_binary if binary else read_copy_text
+    return reader(input_file, TABLE_COLUMNS[table])
@@ -0,0 +1,763 @@
+"""
+Shared helpers for the Frontier review generators
+Platform and location tables, date and name helpers, quota scheduling,
+sharded parallel generation, streaming statistics, checkpointed (resumable)
+generation, compact in-memory datasets and JSON I/O used by both
+generate_platform_authentic_reviews.py and generate_problem_focused_reviews.py
+"""
+
+import json
+import os
+import random
+import sys
+import zlib
+from array import array
+from bisect import bisect
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
+from operator import itemgetter
+
+# Rows per shard in parallel mode. Shards are cut by row count rather than by
+# worker count, so a given seed produces the same dataset on any machine.
+DEFAULT_SHARD_SIZE = 50000
+
+# ============================================================================
+# PLATFORM-SPECIFIC CONFIGURATIONS
+# ============================================================================
+
+PLATFORM_CONFIGS = {
+    "Trustpilot": {
+        "has_title": True,
+        "has_helpful_count": True,
+        "date_format": "%Y-%m-%d",
+        "verified_field": "verified_customer"
+    },
+    "BBB": {
+        "has_title": True,
+        "has_helpful_count": False,
+        "date_format": "%m/%d/%Y",
+        "verified_field": "verified_customer"
+    },
+    "Google Reviews": {
+        "has_title": False,
+        "has_helpful_count": True,
+        "date_format": "%B %d, %Y",  # "January 15, 2024"
+        "verified_field": "local_guide"
+    },
+    "ConsumerAffairs": {
+        "has_title": True,
+        "has_helpful_count": True,
+        "date_format": "%m/%d/%Y",
+        "verified_field": "verified_reviewer"
+    },
+    "Yelp": {
+        "has_title": False,
+        "has_helpful_count": True,
+        "date_format": "%m/%d/%Y",
+        "verified_field": None  # Yelp doesn't have verified badge
+    }
+}
+
+# ============================================================================
+# LOCATION DATA
+# ============================================================================
+
+LOCATIONS = {
+    "urban": [
+        "Los Angeles, CA", "San Diego, CA", "San Jose, CA", "San Francisco, CA", 
+        "Fresno, CA", "Sacramento, CA", "Long Beach, CA", "Oakland, CA",
+        "Houston, TX", "Dallas, TX", "San Antonio, TX", "Austin, TX",
+        "Fort Worth, TX", "El Paso, TX", "Arlington, TX", "Corpus Christi, TX"
+    ],
+    "suburban": [
+        "Riverside, CA", "Anaheim, CA", "Santa Ana, CA", "Irvine, CA",
+        "Bakersfield, CA", "Fremont, CA", "Stockton, CA", "Glendale, CA",
+        "Plano, TX", "Irving, TX", "Garland, TX", "Frisco, TX",
+        "McKinney, TX", "Grand Prairie, TX", "Mesquite, TX", "Carrollton, TX"
+    ],
+    "rural": [
+        "Rural Northern California", "Rural Central California", "Rural Southern California",
+        "Rural North Texas", "Rural Central Texas", "Rural West Texas", "Rural South Texas"
+    ]
+}
+
+# ============================================================================
+# DATES AND NAMES
+# ============================================================================
+
+# Reviews are dated within this many days before today
+DATE_WINDOW_DAYS = 545
+
+def random_date_last_18_months(rng=random):
+    """Generate random date within last 18 months"""
+    end = datetime.now()
+    start = end - timedelta(days=DATE_WINDOW_DAYS)
+    time_between = end - start
+    days_between = time_between.days
+    random_days = rng.randrange(days_between)
+    return start + timedelta(days=random_days)
+
+def format_date_for_platform(date_obj, platform):
+    """Format date according to platform standards"""
+    format_str = PLATFORM_CONFIGS[platform]["date_format"]
+    return date_obj.strftime(format_str)
+
+FIRST_NAMES = ["John", "Sarah", "Michael", "Jessica", "David", "Emily", "Robert", "Ashley",
+               "James", "Amanda", "William", "Jennifer", "Richard", "Lisa", "Joseph", "Michelle",
+               "Thomas", "Nicole", "Christopher", "Karen", "Daniel", "Nancy", "Matthew", "Betty",
+               "Anthony", "Margaret", "Mark", "Sandra", "Donald", "Carol", "Steve", "Linda",
+               "Paul", "Maria", "Andrew", "Susan", "Brian", "Angela", "Kevin", "Patricia"]
+LAST_INITIALS = ["A", "B", "C", "D", "E", "F", "G", "H", "J", "K", "L", "M", "N", "P", "R", "S", "T", "W", "Y", "Z"]
+ANONYMOUS_RATE = 0.25
+
+def random_name(rng=random, first_names=FIRST_NAMES):
+    """Generate random reviewer name"""
+    if rng.random() < ANONYMOUS_RATE:  # 25% anonymous
+        return f"User{rng.randint(1000, 9999)}"
+    else:
+        return f"{rng.choice(first_names)} {rng.choice(LAST_INITIALS)}."
+
+# ============================================================================
+# LOOKUP TABLES
+# ============================================================================
+
+class ReviewTables:
+    """Date, name and location tables for the per-review hot path, built once per run.
+
+    Every date in the window is pre-formatted for every platform relative to
+    one reference date, so all shards of a run (and a resumed run) date
+    reviews the same way even across midnight. Each draw makes the same RNG
+    calls as random_date_last_18_months + format_date_for_platform,
+    random_name and a weighted area choice, so a seed gives the same reviews
+    as the helper functions.
+    """
+
+    __slots__ = ("reference", "dates", "anonymous", "named", "areas", "area_cum_weights", "area_total", "locations")
+
+    def __init__(self, area_weights, first_names=FIRST_NAMES, reference=None,
+                 locations=LOCATIONS, platform_configs=PLATFORM_CONFIGS):
+        self.reference = reference or date.today()
+        start = self.reference - timedelta(days=DATE_WINDOW_DAYS)
+        days = [start + timedelta(days=offset) for offset in range(DATE_WINDOW_DAYS)]
+        self.dates = {platform: [day.strftime(config["date_format"]) for day in days]
+                      for platform, config in platform_configs.items()}
+        # "User1000".."User9999", and every "First I." grouped by first name
+        self.anonymous = [f"User{number}" for number in range(1000, 10000)]
+        self.named = [[f"{first} {initial}." for initial in LAST_INITIALS] for first in first_names]
+        self.areas = list(area_weights)
+        self.area_cum_weights = list(accumulate(area_weights.values()))
+        self.area_total = self.area_cum_weights[-1] + 0.0
+        self.locations = locations
+
+    def date(self, platform, rng=random):
+        """Formatted review date within the window"""
+        return rng.choice(self.dates[platform])
+
+    def name(self, rng=random):
+        """Reviewer name, anonymous for ANONYMOUS_RATE of reviews"""
+        if rng.random() < ANONYMOUS_RATE:
+            return rng.choice(self.anonymous)
+        return rng.choice(rng.choice(self.named))
+
+    def location(self, rng=random):
+        """Location drawn by area weight, then uniformly within the area"""
+        # What rng.choices(areas, cum_weights=...) does, without its per-call setup
+        area = self.areas[bisect(self.area_cum_weights, rng.random() * self.area_total, 0, len(self.areas) - 1)]
+        return rng.choice(self.locations[area])
+
+# Table methods timed by the generators' --profile, as {method: stage name}
+TABLE_PROFILE_STAGES = {
+    "date": "review_date (date table)",
+    "name": "random_name (name table)",
+    "location": "location (area table)",
+}
+
+# ============================================================================
+# QUOTA SCHEDULING
+# ============================================================================
+
+def interleave_cells(quotas, rng=random):
+    """Yield cell keys in random order, each exactly as often as its quota.
+
+    Picks the next cell with probability proportional to its remaining quota,
+    which gives the same distribution as building the full list and calling
+    random.shuffle, but only keeps one counter per cell in memory.
+    """
+    cells = [cell for cell, count in quotas.items() if count > 0]
+    remaining = [quotas[cell] for cell in cells]
+    left = sum(remaining)
+
+    while left:
+        pick = rng.randrange(left)
+        for idx, count in enumerate(remaining):
+            if pick < count:
+                break
+            pick -= count
+        remaining[idx] -= 1
+        left -= 1
+        yield cells[idx]
+
+def split_quotas(quotas, parts):
+    """Split a quota table into `parts` tables whose counts sum back to the original.
+
+    Remainders are rotated across shards so every shard ends up within one
+    row of the same size.
+    """
+    shards = [dict.fromkeys(quotas, 0) for _ in range(parts)]
+    offset = 0
+    for cell, count in quotas.items():
+        base, extra = divmod(count, parts)
+        for idx in range(parts):
+            shards[idx][cell] = base + (1 if (idx - offset) % parts < extra else 0)
+        offset = (offset + extra) % parts
+    return shards
+
+def shard_seeds(seed, count):
+    """Derive independent, reproducible per-shard seeds from one run seed"""
+    master = random.Random(seed)
+    return [master.getrandbits(64) for _ in range(count)]
+
+# ============================================================================
+# PARALLEL GENERATION
+# ============================================================================
+
+def iter_shards(shard_fn, tasks, workers):
+    """Run shard_fn over tasks and yield each result in task order.
+
+    With more than one worker the shards run in a process pool, and at most
+    two shards per worker are in flight so memory stays bounded. shard_fn
+    must be a module-level function so it can be pickled.
+    """
+    tasks = iter(tasks)
+    if workers <= 1:
+        for task in tasks:
+            yield shard_fn(task)
+        return
+
+    # Imported here: multiprocessing is slow to import and most runs never need it
+    import multiprocessing
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque(pool.apply_async(shard_fn, (task,)) for task in islice(tasks, workers * 2))
+        while pending:
+            result = pending.popleft().get()
+            task = next(tasks, None)
+            if task is not None:
+                pending.append(pool.apply_async(shard_fn, (task,)))
+            yield result
+
+def iter_sharded(shard_fn, quotas, seed, workers, shard_size=DEFAULT_SHARD_SIZE, reference=None, skew=None,
+                 labels=False):
+    """Generate shards in a process pool and yield their reviews with contiguous IDs.
+
+    shard_fn must be a module-level function taking a (quotas, seed,
+    reference, skew, labels) tuple and returning that shard's list of
+    reviews; every shard gets the same reference date, scale-test skew (None
+    for a normal run) and labels flag (keep each review's generator label).
+    Shards are merged in shard order.
+    """
+    total = sum(quotas.values())
+    shard_count = max(1, -(-total // shard_size))
+    reference = reference or date.today()
+    tasks = ((shard, shard_seed, reference, skew, labels)
+             for shard, shard_seed in zip(split_quotas(quotas, shard_count), shard_seeds(seed, shard_count)))
+
+    review_id = 0
+    for reviews in iter_shards(shard_fn, tasks, workers):
+        for review in reviews:
+            review_id += 1
+            review["review_id"] = review_id
+            yield review
+
+# ============================================================================
+# STREAMING STATISTICS
+# ============================================================================
+
+class ReviewStats:
+    """Single-pass, mergeable review statistics.
+
+    Keeps exact counters only: platforms, ratings, free-form tags (e.g.
+    "has_title" or a problem category) and a histogram of word counts.
+    Word counts are small bounded integers, so the histogram gives an exact
+    median without holding every value. Accumulators from different shards
+    or files combine with merge(), and to_dict()/from_dict() round-trip
+    through JSON.
+    """
+
+    __slots__ = ("platforms", "ratings", "word_counts", "tags")
+
+    def __init__(self):
+        self.platforms = Counter()
+        self.ratings = Counter()
+        self.word_counts = Counter()
+        self.tags = Counter()
+
+    def add(self, platform, rating, word_count, tags=()):
+        """Count one review"""
+        self.platforms[platform] += 1
+        self.ratings[rating] += 1
+        self.word_counts[word_count] += 1
+        self.tags.update(tags)
+
+    def add_batch(self, platforms, ratings, word_counts, tags=()):
+        """Count a batch of reviews given as parallel sequences (lists or arrays).
+
+        tags is an iterable of tag names, one entry per tagged review.
+        """
+        self.platforms.update(platforms)
+        self.ratings.update(ratings)
+        self.word_counts.update(word_counts)
+        self.tags.update(tags)
+
+    def merge(self, other):
+        """Fold another accumulator into this one and return self"""
+        self.platforms.update(other.platforms)
+        self.ratings.update(other.ratings)
+        self.word_counts.update(other.word_counts)
+        self.tags.update(other.tags)
+        return self
+
+    @property
+    def total(self):
+        return sum(self.word_counts.values())
+
+    def word_count_stats(self):
+        """min, max, average and median word count (median is the middle element
+        of the sorted counts, index total // 2, as before)"""
+        total = self.total
+        if not total:
+            return {"min": 0, "max": 0, "average": 0, "median": 0}
+
+        middle = total // 2
+        seen = 0
+        for words in sorted(self.word_counts):
+            seen += self.word_counts[words]
+            if seen > middle:
+                median = words
+                break
+        return {
+            "min": min(self.word_counts),
+            "max": max(self.word_counts),
+            "average": sum(words * count for words, count in self.word_counts.items()) / total,
+            "median": median
+        }
+
+    def to_dict(self):
+        """JSON-safe state (integer keys become strings in JSON, so pairs are stored)"""
+        return {name: sorted(getattr(self, name).items(), key=str) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        for name in cls.__slots__:
+            getattr(stats, name).update(dict(map(tuple, state.get(name, []))))
+        return stats
+
+def tally(reviews, stats, tags_fn=None):
+    """Pass reviews through unchanged while counting them into `stats`.
+
+    Lets a writer and the statistics share one pass over a review stream.
+    tags_fn(review) returns the tags to count for a review.
+    """
+    for review in reviews:
+        stats.add(review["platform"], review["rating"], len(review["review_text"].split()),
+                  tags_fn(review) if tags_fn else ())
+        yield review
+
+# ============================================================================
+# CHECKPOINTED GENERATION
+# ============================================================================
+
+CHECKPOINT_VERSION = 1
+
+# Output formats chunk_writer can append to chunk by chunk
+CHECKPOINT_FORMATS = ("ndjson", "ndjson-gz", "ndjson-zst", "template", "parquet", "arrow", "copy", "copy-binary")
+
+# Every --format the generators write; json alone is built in memory
+OUTPUT_FORMATS = ("json",) + CHECKPOINT_FORMATS
+
+def new_checkpoint(output_file, output_format, seed=None, **settings):
+    """Checkpoint for a run that has not written anything yet.
+
+    settings (engine, table, ...) are stored as-is so a resumed run can
+    recreate the same writer.
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    return {
+        "version": CHECKPOINT_VERSION,
+        "output": output_file,
+        "format": output_format,
+        "seed": seed,
+        "settings": settings,
+        "total": 0,
+        "last_review_id": 0,
+        "chunks": 0,
+        "position": 0,
+        "rng_state": _encode_rng_state(random.Random(seed).getstate()),
+        "done": [],
+        "statistics": ReviewStats().to_dict()
+    }
+
+def _encode_rng_state(state):
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+def _decode_rng_state(state):
+    version, internal, gauss_next = state
+    return version, tuple(internal), gauss_next
+
+def save_checkpoint(checkpoint, checkpoint_file):
+    """Write the checkpoint atomically, so a crash never leaves a half-written one"""
+    temp_file = checkpoint_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_file, checkpoint_file)
+
+def load_checkpoint(checkpoint_file):
+    with open(checkpoint_file, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{checkpoint_file}: unsupported checkpoint version {checkpoint.get('version')}")
+    return checkpoint
+
+def resume_quotas(checkpoint, total, build_quotas):
+    """Cell quotas for a checkpointed run started, resumed or extended to `total`.
+
+    build_quotas(total, rng) spreads reviews over the cells with random
+    extras, so recomputing it for a larger total can lower some cells below
+    what was already written. The quotas recorded in the checkpoint are kept
+    instead and only the reviews past them are spread with build_quotas, so
+    no cell's quota ever shrinks.
+    """
+    seed = checkpoint["seed"]
+    if "quotas" in checkpoint:
+        quotas = {tuple(cell): count for cell, count in checkpoint["quotas"]}
+    elif checkpoint["total"]:
+        # Checkpoint written before quotas were recorded: its run used the full table
+        quotas = build_quotas(checkpoint["total"], random.Random(seed))
+    else:
+        return build_quotas(total, random.Random(seed))
+    extra = total - sum(quotas.values())
+    if extra > 0:
+        for cell, count in build_quotas(extra, random.Random(seed + sum(quotas.values()))).items():
+            quotas[cell] = quotas.get(cell, 0) + count
+    return quotas
+
+def iter_chunks(shard_fn, quotas, done, rng, workers=1, chunk_size=DEFAULT_SHARD_SIZE, reference=None):
+    """Yield (reviews, chunk_quotas, rng_state) for every chunk still needed to
+    bring the `done` counts up to `quotas`.
+
+    Each chunk is seeded from `rng`; rng_state is the state right after that
+    chunk's seed was drawn, i.e. what a checkpoint written after the chunk
+    must store. Chunks may be generated in a process pool but always come
+    back in order, and all of them use the same reference date.
+    """
+    reference = reference or date.today()
+    left = {cell: max(0, count - done.get(cell, 0)) for cell, count in quotas.items()}
+    states = deque()
+
+    def tasks():
+        while any(left.values()):
+            chunk = split_quotas(left, -(-sum(left.values()) // chunk_size))[0]
+            for cell, count in chunk.items():
+                left[cell] -= count
+            seed = rng.getrandbits(64)
+            states.append((chunk, _encode_rng_state(rng.getstate())))
+            yield chunk, seed, reference, None, False
+
+    for reviews in iter_shards(shard_fn, tasks(), workers):
+        chunk, state = states.popleft()
+        yield reviews, chunk, state
+
+def run_checkpointed(checkpoint, checkpoint_file, quotas, shard_fn, write_chunk, tags_fn=None,
+                     workers=1, chunk_size=DEFAULT_SHARD_SIZE):
+    """Generate the reviews missing from a checkpointed run, one chunk at a time.
+
+    write_chunk(reviews, chunk_index) appends a chunk to the output and
+    returns the output position to record (see chunk_writer). After every
+    chunk the checkpoint is saved with the RNG state, last review_id,
+    per-cell quotas and counts and statistics, so an interrupted run resumes from its
+    last completed chunk. Reviews are dated relative to the checkpoint's
+    reference_date setting, so resumed chunks match the earlier ones.
+    Returns the final ReviewStats.
+    """
+    rng = random.Random()
+    rng.setstate(_decode_rng_state(checkpoint["rng_state"]))
+    done = {tuple(cell): count for cell, count in checkpoint["done"]}
+    stats = ReviewStats.from_dict(checkpoint["statistics"])
+    checkpoint["total"] = sum(quotas.values())
+    checkpoint["quotas"] = [[list(cell), count] for cell, count in quotas.items()]
+    reference = checkpoint["settings"].get("reference_date")
+    reference = date.fromisoformat(reference) if reference else None
+
+    for reviews, chunk, state in iter_chunks(shard_fn, quotas, done, rng, workers, chunk_size, reference):
+        review_id = checkpoint["last_review_id"]
+        for review in tally(reviews, stats, tags_fn):
+            review_id += 1
+            review["review_id"] = review_id
+
+        checkpoint["position"] = write_chunk(reviews, checkpoint["chunks"])
+        for cell, count in chunk.items():
+            done[cell] = done.get(cell, 0) + count
+        checkpoint.update(
+            last_review_id=review_id,
+            chunks=checkpoint["chunks"] + 1,
+            rng_state=state,
+            done=[[list(cell), count] for cell, count in done.items()],
+            statistics=stats.to_dict()
+        )
+        save_checkpoint(checkpoint, checkpoint_file)
+    return stats
+
+def chunk_writer(checkpoint, date_formats=None, locations=None):
+    """Return write_chunk(reviews, chunk_index) for the checkpoint's output.
+
+    NDJSON (plain or block-compressed), template-encoded and COPY files are
+    appended to, and their byte size is the
+    recorded position; anything past the checkpointed position (a chunk cut
+    short by a crash) is truncated first. Parquet and Arrow files cannot be
+    appended to, so their output is a directory with one part file per
+    chunk; later parts are removed instead.
+    """
+    output_file = checkpoint["output"]
+    output_format = checkpoint["format"]
+    settings = checkpoint["settings"]
+    if output_format not in CHECKPOINT_FORMATS:
+        raise ValueError(f"Checkpointed runs do not support --format {output_format}")
+
+    if output_format in ("parquet", "arrow"):
+        import review_arrow
+        write = review_arrow.write_parquet if output_format == "parquet" else review_arrow.write_arrow
+        os.makedirs(output_file, exist_ok=True)
+        for name in os.listdir(output_file):
+            if name.startswith("part-") and int(name[5:10]) >= checkpoint["chunks"]:
+                os.remove(os.path.join(output_file, name))
+
+        def write_chunk(reviews, chunk_index):
+            write(reviews, os.path.join(output_file, f"part-{chunk_index:05d}.{output_format}"), date_formats)
+            return chunk_index + 1
+        return write_chunk
+
+    if checkpoint["position"] or os.path.exists(output_file):
+        with open(output_file, "ab") as f:
+            f.truncate(checkpoint["position"])
+
+    if output_format == "ndjson":
+        def write_chunk(reviews, chunk_index):
+            write_ndjson(reviews, output_file, append=True)
+            return os.path.getsize(output_file)
+        return write_chunk
+
+    if output_format in ("ndjson-gz", "ndjson-zst"):
+        from review_blocks import FORMAT_CODECS, write_blocks
+
+        def write_chunk(reviews, chunk_index):
+            # Appending also drops index entries for blocks past the truncated end
+            write_blocks(reviews, output_file, FORMAT_CODECS[output_format], append=True)
+            return os.path.getsize(output_file)
+        return write_chunk
+
+    if output_format == "template":
+        from review_encoding import write_encoded
+
+        def write_chunk(reviews, chunk_index):
+            # The first chunk writes the template dictionary header
+            write_encoded(reviews, output_file, append=os.path.exists(output_file) and os.path.getsize(output_file) > 0)
+            return os.path.getsize(output_file)
+        return write_chunk
+
+    if output_format in ("copy", "copy-binary"):
+        from review_copy import write_copy
+
+        def write_chunk(reviews, chunk_index):
+            write_copy(reviews, output_file, settings["table"], date_formats, locations,
+                       output_format == "copy-binary", append=True)
+            return os.path.getsize(output_file)
+        return write_chunk
+
+# ============================================================================
+# COMPACT IN-MEMORY DATASETS
+# ============================================================================
+
+# ReviewBlock keeps these fields as compressed text and review_id in an int64
+# array; every other field is dictionary-coded
+TEXT_FIELDS = ("review_text", "review_url")
+ID_FIELD = "review_id"
+
+# Rows per compressed text block, and the zlib level it is compressed at
+BLOCK_ROWS = 4096
+BLOCK_COMPRESSION = 1
+
+# Next wider unsigned typecode for a code array that outgrows its own
+WIDER_CODES = {"B": "H", "H": "I", "I": "Q"}
+
+class CodedColumn:
+    """Dictionary-coded values: one small unsigned code per row, widened as values are added"""
+
+    __slots__ = ("codes", "values", "lookup")
+
+    def __init__(self, rows=0):
+        # Code 0 is None, which also stands in for rows without the field
+        self.codes = array("B", bytes(rows))
+        self.values = [None]
+        self.lookup = {None: 0}
+
+    def extend(self, values):
+        lookup = self.lookup
+        for value in dict.fromkeys(values):
+            if value not in lookup:
+                lookup[value] = len(self.values)
+                self.values.append(value)
+        while len(self.values) > 1 << 8 * self.codes.itemsize:
+            self.codes = array(WIDER_CODES[self.codes.typecode], self.codes)
+        self.codes.extend(map(lookup.__getitem__, values))
+
+    def decode(self, start, stop):
+        return list(map(self.values.__getitem__, self.codes[start:stop]))
+
+def row_getter(indexes):
+    """Function picking the values at indexes out of a row tuple, always as a tuple"""
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: (row[index],)
+    return itemgetter(*indexes) if indexes else (lambda row: ())
+
+class ReviewBlock:
+    """Struct-of-arrays store for a dataset held in memory.
+
+    A dict per review costs around a kilobyte before its text is counted.
+    Here reviews are buffered BLOCK_ROWS at a time and then stored by
+    column: review ids in an int64 array, repeating values (platform, date,
+    name, location, title, rating, helpful count, flags, labels) as one- or
+    two-byte CodedColumns, and review text and URLs joined into one
+    zlib-compressed string per block. Each row also keeps a code for its key
+    order, so iterating rebuilds the original dicts exactly; they exist only
+    while being consumed, e.g. by write_json. Values of a coded field must be
+    hashable and of one type (1 and True would share a code).
+    """
+
+    __slots__ = ("fields", "shapes", "ids", "columns", "blocks", "pending")
+
+    def __init__(self, reviews=()):
+        self.fields = []             # every field seen, in first-seen order
+        self.shapes = CodedColumn()  # key tuple of each row
+        self.ids = array("q")
+        self.columns = {}            # coded field -> CodedColumn
+        self.blocks = []             # (rows, text fields, array of text lengths, compressed UTF-8)
+        self.pending = []            # reviews not yet stored by column
+        self.extend(reviews)
+
+    def __len__(self):
+        return len(self.ids) + len(self.pending)
+
+    def append(self, review):
+        self.pending.append(review)
+        if len(self.pending) == BLOCK_ROWS:
+            self._seal()
+
+    def extend(self, reviews):
+        for review in reviews:
+            self.append(review)
+
+    def _seal(self):
+        """Store the pending reviews by column"""
+        reviews = self.pending
+        shapes = [tuple(review) for review in reviews]
+        for shape in dict.fromkeys(shapes):
+            for field in shape:
+                if field not in self.fields:
+                    self.fields.append(field)
+                    if field not in TEXT_FIELDS and field != ID_FIELD:
+                        self.columns[field] = CodedColumn(len(self.ids))
+        self.shapes.extend(shapes)
+        for field, column in self.columns.items():
+            column.extend([review.get(field) for review in reviews])
+        self.ids.extend([review.get(ID_FIELD, 0) for review in reviews])
+
+        fields = tuple(field for field in self.fields if field in TEXT_FIELDS)
+        texts = [review.get(field, "") for field in fields for review in reviews]
+        data = zlib.compress("".join(texts).encode("utf-8"), BLOCK_COMPRESSION)
+        self.blocks.append((len(reviews), fields, array("I", map(len, texts)), data))
+        self.pending = []
+
+    def __iter__(self):
+        positions = {field: i for i, field in enumerate(self.fields)}
+        shapes = self.shapes.values
+        getters = [None] + [row_getter([positions[field] for field in shape]) for shape in shapes[1:]]
+        start = 0
+        for rows, fields, lengths, data in self.blocks:
+            stop = start + rows
+            text = zlib.decompress(data).decode("utf-8")
+            offsets = [0, *accumulate(lengths)]
+            texts = [text[begin:end] for begin, end in zip(offsets, offsets[1:])]
+            texts = {field: texts[i * rows:(i + 1) * rows] for i, field in enumerate(fields)}
+            columns = [self.ids[start:stop] if field == ID_FIELD
+                       else texts.get(field) or [""] * rows if field in TEXT_FIELDS
+                       else self.columns[field].decode(start, stop) for field in self.fields]
+            rows = zip(*columns) if columns else [()] * rows
+            for code, row in zip(self.shapes.codes[start:stop], rows):
+                yield dict(zip(shapes[code], getters[code](row)))
+            start = stop
+        yield from self.pending
+
+# ============================================================================
+# JSON I/O
+# ============================================================================
+
+# Rows encoded per json.dumps call by write_json
+JSON_CHUNK_ROWS = 1000
+
+def write_json(reviews, output_file):
+    """Write reviews as one indented JSON array and return the number written.
+
+    The bytes match json.dump(list(reviews), f, indent=2, ensure_ascii=False),
+    but only JSON_CHUNK_ROWS reviews are materialized at a time.
+    """
+    reviews = iter(reviews)
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("[")
+        while True:
+            chunk = list(islice(reviews, JSON_CHUNK_ROWS))
+            if not chunk:
+                break
+            # Drop the chunk's own "[\n" and "\n]"
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(chunk, indent=2, ensure_ascii=False)[2:-2])
+            count += len(chunk)
+        f.write("\n]" if count else "]")
+    return count
+
+def write_ndjson(reviews, output_file, append=False):
+    """Write reviews one JSON object per line and return the number written"""
+    count = 0
+    with open(output_file, "a" if append else "w", encoding="utf-8") as f:
+        for review in reviews:
+            f.write(json.dumps(review, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+def read_ndjson(input_file):
+    """Yield reviews from a newline-delimited JSON file"""
+    with open(input_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def read_reviews(input_file):
+    """Yield reviews from an NDJSON file, a JSON array file, a template-encoded or block-compressed
+    file, or '-' for NDJSON on stdin"""
+    if input_file == "-":
+        return (json.loads(line) for line in sys.stdin if line.strip())
+    if input_file.endswith((".gz", ".zst")):
+        from review_blocks import read_blocks
+        return read_blocks(input_file)
+    if input_file.endswith(".template"):
+        from review_encoding import EncodedReader
+        return iter(EncodedReader(input_file))
+    if input_file.endswith(".json"):
+        with open(input_file, "r", encoding="utf-8") as f:
+            return iter(json.load(f))
+    return read_ndjson(input_file)
@@ -0,0 +1,110 @@
+"""
+Template corpora for the Frontier review generators
+Review templates live in corpora/<name>.json as {list name: [template, ...]}
+and are read the first time a generator needs them, so importing a generator
+(or a worker process importing it) does not parse tens of kilobytes of text.
+Each corpus is also written to a binary cache, corpora/<name>.cache, holding
+the lists plus every template already split into literals and placeholders;
+later loads read that instead of the JSON. To rebuild the caches:
+
+    python review_corpus.py [--rebuild]
+"""
+
+import argparse
+import json
+import marshal
+import os
+import sys
+
+from review_templates import PLACEHOLDER_PATTERN
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+
+# Bump when the cache layout changes; marshal data is also tied to the Python version
+CACHE_FORMAT = 1
+
+# Corpora loaded in this process, as name -> (lists, tokens)
+_LOADED = {}
+
+def corpus_file(name):
+    return os.path.join(CORPUS_DIR, f"{name}.json")
+
+def cache_file(name):
+    return os.path.join(CORPUS_DIR, f"{name}.cache")
+
+def _cache_key(source):
+    stat = os.stat(source)
+    return (CACHE_FORMAT, sys.version_info[:2], stat.st_mtime_ns, stat.st_size)
+
+def _read_cache(name, key):
+    """Return (lists, tokens) from the cache if it matches the source, else None"""
+    try:
+        with open(cache_file(name), "rb") as f:
+            cached = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached["lists"], cached["tokens"]
+
+def _write_cache(name, key, lists, tokens):
+    """Write the cache atomically; a read-only corpus directory just goes uncached"""
+    path = cache_file(name)
+    try:
+        with open(path + ".tmp", "wb") as f:
+            marshal.dump({"key": key, "lists": lists, "tokens": tokens}, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+def _parse(name, use_cache=True):
+    source = corpus_file(name)
+    key = _cache_key(source)
+    if use_cache:
+        cached = _read_cache(name, key)
+        if cached is not None:
+            return cached
+    with open(source, "r", encoding="utf-8") as f:
+        lists = json.load(f)
+    tokens = {text: PLACEHOLDER_PATTERN.split(text) for texts in lists.values() for text in texts}
+    if use_cache:
+        _write_cache(name, key, lists, tokens)
+    return lists, tokens
+
+def load_corpus(name, use_cache=True):
+    """Return {list name: [template, ...]} for a corpus, loading it once per process"""
+    if name not in _LOADED:
+        _LOADED[name] = _parse(name, use_cache)
+    return _LOADED[name][0]
+
+def corpus_tokens(name):
+    """Return {template: pieces} for a corpus, as split by PLACEHOLDER_PATTERN"""
+    load_corpus(name)
+    return _LOADED[name][1]
+
+def available_corpora():
+    return sorted(entry[:-len(".json")] for entry in os.listdir(CORPUS_DIR) if entry.endswith(".json"))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the binary caches for the review template corpora")
+    parser.add_argument("--rebuild", action="store_true", help="Rewrite caches even if they are current")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("REVIEW TEMPLATE CORPORA")
+    print("=" * 70)
+    for name in available_corpora():
+        if args.rebuild and os.path.exists(cache_file(name)):
+            os.remove(cache_file(name))
+        lists = load_corpus(name)
+        templates = sum(len(texts) for texts in lists.values())
+        print(f"\n[OK] {name}: {len(lists)} lists, {templates} templates")
+        for list_name, texts in lists.items():
+            print(f"   {list_name:28s}: {len(texts):3d} templates")
+        if os.path.exists(cache_file(name)):
+            print(f"[FILE] Cache: {cache_file(name)} ({os.path.getsize(cache_file(name)) / 1024:.1f} KB)")
+    print(f"\n{'=' * 70}\n")
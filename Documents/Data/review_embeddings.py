@@ -0,0 +1,311 @@
+"""
+Content-addressed embedding cache for Frontier reviews
+The generators reuse a small pool of templates, so many review texts are the
+same once case and whitespace are normalized. Each normalized text is hashed
+and looked up in a persistent SQLite map from hash to vector; only the misses
+are sent to the GTE endpoint, and every vector is fanned back out to all the
+reviews that share its text. The cache holds at most --max-entries vectors
+and evicts the least recently used ones.
+
+    DATABRICKS_TOKEN=... python review_embeddings.py reviews.ndjson --output embeddings.ndjson
+    python review_embeddings.py reviews.ndjson --local     # offline, review_hash_embedder.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import unicodedata
+import urllib.request
+from array import array
+from collections import Counter
+
+from review_core import read_reviews
+
+# Same endpoint as n8n/databricks_gte_http_node.json
+DEFAULT_ENDPOINT = ("https://dbc-4a93b454-f17b.cloud.databricks.com"
+                    "/serving-endpoints/databricks-gte-large-en/invocations")
+EMBEDDING_MODEL = "databricks-gte-large-en"
+TOKEN_VARIABLE = "DATABRICKS_TOKEN"
+
+# frontier_reviews_processed.gte_embedding is VECTOR(768)
+EMBEDDING_DIM = 768
+
+DEFAULT_CACHE = "gte_embedding_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 1000000
+
+# Texts per endpoint request, and reviews deduplicated and looked up together
+DEFAULT_BATCH_SIZE = 64
+CHUNK_SIZE = 10000
+
+# SQLite limits the number of ? parameters in one statement
+LOOKUP_BATCH = 500
+
+WHITESPACE = re.compile(r"\s+")
+
+# ============================================================================
+# TEXT KEYS
+# ============================================================================
+
+def normalize_text(text):
+    """Unicode NFKC, casefolded, with runs of whitespace collapsed.
+
+    The GTE tokenizer lowercases its input, so texts that differ only in case
+    or spacing embed identically and can share one cache entry.
+    """
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+def text_key(text, model=EMBEDDING_MODEL):
+    """16-byte BLAKE2b digest of the model name and normalized text"""
+    return hashlib.blake2b(f"{model}\0{normalize_text(text)}".encode("utf-8"), digest_size=16).digest()
+
+def vector_literal(vector):
+    """pgvector text form, '[0.1,0.2,...]', as databricks_gte_parser.js builds it"""
+    return "[" + ",".join(f"{value:.9g}" for value in vector) + "]"
+
+# ============================================================================
+# PERSISTENT CACHE
+# ============================================================================
+
+class EmbeddingCache:
+    """SQLite map from text key to float32 vector with LRU eviction.
+
+    pgvector stores float32, so keeping vectors at that precision loses
+    nothing the database would keep. Recency is a counter bumped on every
+    lookup and insert; when the cache grows past max_entries the entries
+    with the oldest counter value are deleted.
+    """
+
+    __slots__ = ("path", "max_entries", "db", "tick", "entries", "hits", "misses", "evictions")
+
+    def __init__(self, path=DEFAULT_CACHE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS embeddings "
+                        "(key BLOB PRIMARY KEY, vector BLOB NOT NULL, used INTEGER NOT NULL) WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS embeddings_used ON embeddings (used)")
+        self.tick, self.entries = self.db.execute("SELECT COALESCE(MAX(used), 0), COUNT(*) FROM embeddings").fetchone()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return self.entries
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys that are cached, marking them as used"""
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[start:start + LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for key, blob in self.db.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch):
+                vector = array("f")
+                vector.frombytes(blob)
+                found[key] = vector
+        if found:
+            self.tick += 1
+            self.db.executemany("UPDATE embeddings SET used = ? WHERE key = ?", ((self.tick, key) for key in found))
+            self.db.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, vector) pairs, then evict down to max_entries"""
+        self.tick += 1
+        cursor = self.db.executemany("INSERT OR IGNORE INTO embeddings (key, vector, used) VALUES (?, ?, ?)",
+                                     ((key, array("f", vector).tobytes(), self.tick) for key, vector in items))
+        self.entries += cursor.rowcount
+        self.evict()
+        self.db.commit()
+
+    def evict(self):
+        """Delete least recently used entries beyond max_entries"""
+        excess = self.entries - self.max_entries
+        if excess > 0:
+            self.db.execute("DELETE FROM embeddings WHERE key IN "
+                            "(SELECT key FROM embeddings ORDER BY used LIMIT ?)", (excess,))
+            self.entries -= excess
+            self.evictions += excess
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ============================================================================
+# EMBEDDING ENDPOINT
+# ============================================================================
+
+def parse_embeddings(response):
+    """Vectors from a serving-endpoint response, accepting the formats databricks_gte_parser.js does"""
+    if isinstance(response, dict) and isinstance(response.get("predictions"), list):
+        return response["predictions"]
+    if isinstance(response, dict) and isinstance(response.get("data"), list):
+        return [item["embedding"] for item in response["data"]]
+    if isinstance(response, dict) and isinstance(response.get("embedding"), list):
+        return [response["embedding"]]
+    if isinstance(response, list):
+        return response
+    raise ValueError(f"Unexpected embedding response: {json.dumps(response)[:200]}")
+
+class HttpEmbedder:
+    """Batched client for a GTE serving endpoint: POST {"input": [text, ...]}, one vector back per text"""
+
+    __slots__ = ("endpoint", "token", "batch_size", "timeout", "model", "requests", "texts")
+
+    def __init__(self, endpoint=DEFAULT_ENDPOINT, token=None, batch_size=DEFAULT_BATCH_SIZE, timeout=30,
+                 model=EMBEDDING_MODEL):
+        self.endpoint = endpoint
+        self.token = token
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.model = model
+        self.requests = 0
+        self.texts = 0
+
+    def _post(self, texts):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.endpoint, json.dumps({"input": texts}).encode("utf-8"), headers)
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+    def embed(self, texts):
+        """Return one vector per text, in order"""
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            embedded = parse_embeddings(self._post(batch))
+            if len(embedded) != len(batch):
+                raise ValueError(f"Endpoint returned {len(embedded)} vectors for {len(batch)} texts")
+            vectors.extend(embedded)
+            self.requests += 1
+            self.texts += len(batch)
+        return vectors
+
+# ============================================================================
+# CACHED EMBEDDING
+# ============================================================================
+
+def embed_reviews(reviews, cache, embedder, summary=None, dimension=None, chunk_size=CHUNK_SIZE,
+                  field="review_text"):
+    """Yield (review, vector) for every review, embedding only texts the cache does not hold.
+
+    Reviews are handled chunk_size at a time: duplicate texts within a chunk
+    are embedded once, then every review gets the vector for its text key.
+    summary, if given, is a Counter updated with reviews / unique_texts /
+    cache_hits / embedded counts. With dimension, vectors of any other
+    length are rejected before they reach the cache.
+    """
+    summary = summary if summary is not None else Counter()
+    chunk = []
+    for review in reviews:
+        chunk.append(review)
+        if len(chunk) >= chunk_size:
+            yield from _embed_chunk(chunk, cache, embedder, summary, dimension, field)
+            chunk = []
+    if chunk:
+        yield from _embed_chunk(chunk, cache, embedder, summary, dimension, field)
+
+def _embed_chunk(chunk, cache, embedder, summary, dimension, field):
+    keys = [text_key(review[field], embedder.model) for review in chunk]
+    texts = dict(zip(keys, (review[field] for review in chunk)))
+    vectors = cache.get_many(texts)
+    missing = [key for key in texts if key not in vectors]
+    if missing:
+        embedded = embedder.embed([texts[key] for key in missing])
+        for vector in embedded:
+            if dimension and len(vector) != dimension:
+                raise ValueError(f"Expected {dimension}-dim embeddings, got {len(vector)}")
+        cache.put_many(zip(missing, embedded))
+        vectors.update(zip(missing, embedded))
+    summary["reviews"] += len(chunk)
+    summary["unique_texts"] += len(texts)
+    summary["cache_hits"] += len(texts) - len(missing)
+    summary["embedded"] += len(missing)
+    for review, key in zip(chunk, keys):
+        yield review, vectors[key]
+
+def embed_files(input_files, cache, embedder, output_file=None, dimension=None, chunk_size=CHUNK_SIZE):
+    """Embed every review in input_files and return summary counts.
+
+    With output_file, one {"review_id", "gte_embedding", ...} line per review
+    is written as NDJSON, with the same fields databricks_gte_parser.js adds.
+    """
+    summary = Counter()
+    out = open(output_file, "w", encoding="utf-8") if output_file else None
+    try:
+        for input_file in input_files:
+            for review, vector in embed_reviews(read_reviews(input_file), cache, embedder, summary,
+                                                dimension, chunk_size):
+                if out:
+                    out.write(json.dumps({
+                        "review_id": review.get("review_id"),
+                        "gte_embedding": vector_literal(vector),
+                        "embedding_dimension": len(vector),
+                        "embedding_model": embedder.model,
+                    }))
+                    out.write("\n")
+    finally:
+        if out:
+            out.close()
+    summary["requests"] = embedder.requests
+    summary["evictions"] = cache.evictions
+    return summary
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed review files through a persistent content-hash cache")
+    parser.add_argument("inputs", nargs="+", help="NDJSON or JSON review files ('-' reads NDJSON from stdin)")
+    parser.add_argument("--output", help="Write per-review embeddings as NDJSON")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="SQLite cache file")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES, help="Vectors kept in the cache")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="GTE serving endpoint URL")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Texts per endpoint request")
+    parser.add_argument("--model", default=EMBEDDING_MODEL,
+                        help="Model name the cache keys include; set it when --endpoint serves another model")
+    parser.add_argument("--local", action="store_true",
+                        help="Embed in-process with the deterministic hashed n-gram stand-in (requires numpy)")
+    parser.add_argument("--dimension", type=int,
+                        help=f"Reject embeddings of any other size (gte_embedding is VECTOR({EMBEDDING_DIM}))")
+    args = parser.parse_args()
+
+    if args.local:
+        from review_hash_embedder import HashedNgramEmbedder
+        embedder = HashedNgramEmbedder(args.dimension or EMBEDDING_DIM)
+    else:
+        embedder = HttpEmbedder(args.endpoint, os.environ.get(TOKEN_VARIABLE), args.batch_size, model=args.model)
+    with EmbeddingCache(args.cache, args.max_entries) as cache:
+        summary = embed_files(args.inputs, cache, embedder, args.output, args.dimension)
+        cached = len(cache)
+    reviews = summary["reviews"] or 1
+
+    print("=" * 70)
+    print("CACHED REVIEW EMBEDDING")
+    print("=" * 70)
+    print(f"\n[OK] Embedded {summary['reviews']} reviews")
+    if args.output:
+        print(f"[FILE] Embeddings saved to: {args.output}")
+    print(f"[CACHE] {args.cache}: {cached} vectors, {summary['evictions']} evicted this run")
+
+    print("\nEMBEDDING CALLS:")
+    print(f"   Distinct texts per chunk:  {summary['unique_texts']:8d} ({summary['unique_texts'] / reviews * 100:5.1f}%)")
+    print(f"   Cache hits:                {summary['cache_hits']:8d}")
+    print(f"   Texts sent to endpoint:    {summary['embedded']:8d} ({summary['embedded'] / reviews * 100:5.1f}%)")
+    print(f"   Endpoint requests:         {summary['requests']:8d}")
+    print(f"   Reviews per embedded text: {summary['reviews'] / max(summary['embedded'], 1):8.1f}x")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,335 @@
+"""
+Template-encoded review datasets
+Almost every review_text is one of a few dozen corpus templates with a
+handful of substituted values, an occasional language variation and, for
+problem-focused reviews, the annotations enhance_review_text wraps around
+it. A template-encoded file stores each text as
+
+    [template id, [placeholder values], [ops]]
+
+against the template dictionary in its header. Ops are applied in order
+to the filled template: ["v", k] replaces the first occurrence of
+variation k, ["p", text] prepends and ["s", text] appends. A text that
+matches no template is stored as id -1 with the text as its only value.
+The file is NDJSON: the header line, then one review per line with
+review_text replaced by review_template in the same position.
+
+Encoding matches finished texts, so it works for every generation engine
+and for existing files, and every encoded text expands back exactly.
+EncodedReader expands texts only as reviews are read (a template without
+placeholders or ops comes back as the dictionary's own string), and lets
+a consumer walk the dictionary to embed or classify each template once.
+
+    python review_encoding.py encode reviews.ndjson --output reviews.template
+    python review_encoding.py decode reviews.template --output reviews.ndjson
+    python review_encoding.py templates reviews.template     # rows per template
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache
+
+import generate_platform_authentic_reviews as platform_reviews
+import generate_problem_focused_reviews as problem_reviews
+from review_annotations import PREAMBLE
+from review_core import read_reviews
+from review_corpus import load_corpus
+from review_templates import CompiledTemplate
+
+FORMAT = "review-templates"
+FORMAT_VERSION = 1
+TEMPLATE_SUFFIX = ".template"
+
+TEXT_FIELD = "review_text"
+ENCODED_FIELD = "review_template"
+
+# Template id of a text stored as is
+RAW = -1
+
+# Templates are looked up by this many leading characters
+HEAD = 12
+
+# Most variations generate_review applies to one text
+MAX_VARIATIONS = 2
+
+# CLI verb per command
+VERBS = {"encode": "Encoded", "decode": "Decoded", "templates": "Scanned"}
+
+# One entry of the template dictionary
+Template = namedtuple("Template", ["id", "name", "text"])
+
+# One encoded review text
+EncodedText = namedtuple("EncodedText", ["template", "values", "ops"])
+
+# ============================================================================
+# TEMPLATE DICTIONARY
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def default_encoder():
+    """TemplateEncoder for the corpus templates of both generators (built once)"""
+    compiled = platform_reviews.compiled_by_text()
+    templates = {}
+    for name in platform_reviews.TEMPLATE_LISTS:
+        for text in load_corpus(platform_reviews.CORPUS)[name]:
+            templates.setdefault(text, (name, compiled[text]))
+    for name in problem_reviews.TEMPLATE_LISTS:
+        for text in load_corpus(problem_reviews.CORPUS)[name]:
+            templates.setdefault(text, (name, CompiledTemplate(text, {})))
+    names, compiled = zip(*templates.values())
+    return TemplateEncoder(compiled, names, platform_reviews.LANGUAGE_VARIATIONS)
+
+def template_pattern(template, variations=()):
+    """Regex matching any fill of a template, with the variations allowed in its literals.
+
+    Each placeholder is a lazy group on first use and a backreference after
+    that, so match.groups() are the values in template.names order.
+    """
+    # Every form an old string takes after up to MAX_VARIATIONS of its variations ("." -> ".." -> "...")
+    alternatives = {}
+    for old, _ in variations:
+        forms = {old}
+        for _ in range(MAX_VARIATIONS):
+            forms |= {form.replace(old, new, 1) for form in forms for source, new in variations if source == old}
+        alternatives[old] = "(?:" + "|".join(map(re.escape, sorted(forms, key=len, reverse=True))) + ")"
+    olds = re.compile("(" + "|".join(map(re.escape, sorted(alternatives, key=len, reverse=True))) + ")"
+                      if alternatives else "(?!)")
+
+    def literal(text):
+        pieces = olds.split(text)
+        pieces[0::2] = map(re.escape, pieces[0::2])
+        pieces[1::2] = map(alternatives.__getitem__, pieces[1::2])
+        return "".join(pieces)
+
+    pattern = [literal(template.parts[0])]
+    seen = set()
+    for slot, part in zip(template.slots, template.parts[2::2]):
+        pattern.append(f"(?P=v{slot})" if slot in seen else f"(?P<v{slot}>.+?)")
+        seen.add(slot)
+        pattern.append(literal(part))
+    return re.compile("".join(pattern), re.S)
+
+def template_starts(text):
+    """Offsets a template can start at: the text start, and past a problem-focused preamble"""
+    preamble = PREAMBLE.match(text)
+    return (0, preamble.end()) if preamble else (0,)
+
+# ============================================================================
+# ENCODING AND EXPANSION
+# ============================================================================
+
+def expand(encoded, templates, variations):
+    """The review text an EncodedText stands for"""
+    template, values, ops = encoded
+    text = values[0] if template == RAW else templates[template].fill(values)
+    for op, argument in ops:
+        if op == "v":
+            old, new = variations[argument]
+            text = text.replace(old, new, 1)
+        elif op == "p":
+            text = argument + text
+        else:
+            text += argument
+    return text
+
+class TemplateEncoder:
+    """Encodes review texts against a template dictionary.
+
+    templates are CompiledTemplates; names label them in the dictionary (the
+    corpus list each came from). Candidates are found by the first HEAD
+    characters at each template_starts offset, and every template is tried
+    only when a variation has changed those characters.
+    """
+
+    __slots__ = ("templates", "names", "variations", "patterns", "heads")
+
+    def __init__(self, templates, names, variations=()):
+        self.templates = list(templates)
+        self.names = list(names)
+        self.variations = [tuple(variation) for variation in variations]
+        self.patterns = [template_pattern(template, self.variations) for template in self.templates]
+        self.heads = defaultdict(list)
+        for index, template in enumerate(self.templates):
+            self.heads[template.parts[0][:HEAD]].append(index)
+
+    def header(self):
+        """First line of an encoded file"""
+        return {
+            "format": FORMAT,
+            "version": FORMAT_VERSION,
+            "templates": [{"name": name, "text": template.text, "placeholders": template.names}
+                          for name, template in zip(self.names, self.templates)],
+            "variations": self.variations,
+        }
+
+    def encode(self, text):
+        """EncodedText for one review text"""
+        starts = template_starts(text)
+        for start in starts:
+            for index in self.heads.get(text[start:start + HEAD], ()):
+                encoded = self._match(index, text, start)
+                if encoded:
+                    return encoded
+        for start in starts:
+            for index in range(len(self.templates)):
+                encoded = self._match(index, text, start)
+                if encoded:
+                    return encoded
+        return EncodedText(RAW, [text], [])
+
+    def _match(self, index, text, start):
+        match = self.patterns[index].match(text, start)
+        if match is None:
+            return None
+        values = list(match.groups())
+        ops = self._variation_ops(self.templates[index].fill(values), text[start:match.end()])
+        if ops is None:
+            return None
+        if start:
+            ops.append(["p", text[:start]])
+        if match.end() < len(text):
+            ops.append(["s", text[match.end():]])
+        return EncodedText(index, values, ops)
+
+    def _variation_ops(self, filled, span):
+        """Variation ops turning the filled template into span, or None if none do"""
+        if filled == span:
+            return []
+        candidates = [k for k, (old, new) in enumerate(self.variations) if old in filled and new in span]
+        sequences = [[]]
+        for _ in range(MAX_VARIATIONS):
+            sequences = [sequence + [k] for sequence in sequences for k in candidates]
+            for sequence in sequences:
+                text = filled
+                for k in sequence:
+                    old, new = self.variations[k]
+                    text = text.replace(old, new, 1)
+                if text == span:
+                    return [["v", k] for k in sequence]
+        return None
+
+    def encode_review(self, review):
+        """The review with review_text replaced by review_template in the same position"""
+        return {ENCODED_FIELD if key == TEXT_FIELD else key: self.encode(value) if key == TEXT_FIELD else value
+                for key, value in review.items()}
+
+# ============================================================================
+# FILE I/O
+# ============================================================================
+
+def write_encoded(reviews, output_file, append=False, encoder=None):
+    """Write reviews template-encoded and return the number written.
+
+    The header is written unless appending to an existing file.
+    """
+    encoder = encoder or default_encoder()
+    count = 0
+    with open(output_file, "a" if append else "w", encoding="utf-8") as f:
+        if not append:
+            f.write(json.dumps(encoder.header(), ensure_ascii=False))
+            f.write("\n")
+        for review in reviews:
+            f.write(json.dumps(encoder.encode_review(review), ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+class EncodedReader:
+    """Reader for a template-encoded file.
+
+    Only the header is read up front. Iterating yields reviews with
+    review_text expanded one row at a time; records() yields the stored
+    rows and their EncodedTexts without expanding anything.
+    """
+
+    __slots__ = ("input_file", "templates", "names", "variations")
+
+    def __init__(self, input_file):
+        self.input_file = input_file
+        with open(input_file, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+        if header.get("format") != FORMAT or header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{input_file} is not a version {FORMAT_VERSION} {FORMAT} file")
+        self.names = [entry["name"] for entry in header["templates"]]
+        # Only the recorded placeholders are slots, exactly as when the file was written
+        self.templates = [CompiledTemplate(entry["text"], dict.fromkeys(entry["placeholders"], ()))
+                          for entry in header["templates"]]
+        self.variations = [tuple(variation) for variation in header["variations"]]
+
+    def iter_templates(self):
+        """The template dictionary, as Template(id, name, text) with placeholders left in"""
+        for index, (name, template) in enumerate(zip(self.names, self.templates)):
+            yield Template(index, name, template.text)
+
+    def records(self):
+        """(stored review, EncodedText) per row"""
+        with open(self.input_file, "r", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                if line.strip():
+                    review = json.loads(line)
+                    yield review, EncodedText(*review[ENCODED_FIELD])
+
+    def expand(self, encoded):
+        return expand(encoded, self.templates, self.variations)
+
+    def __iter__(self):
+        for review, encoded in self.records():
+            yield {TEXT_FIELD if key == ENCODED_FIELD else key: self.expand(encoded) if key == ENCODED_FIELD else value
+                   for key, value in review.items()}
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encode, decode or inspect template-encoded review files")
+    parser.add_argument("command", choices=["encode", "decode", "templates"])
+    parser.add_argument("input", help="Reviews to encode (NDJSON or JSON), or a template-encoded file")
+    parser.add_argument("--output", help="Output file for encode (template-encoded) or decode (NDJSON)")
+    args = parser.parse_args()
+    if args.command != "templates" and not args.output:
+        parser.error(f"{args.command} needs --output")
+
+    print("=" * 70)
+    print("TEMPLATE-ENCODED REVIEWS")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    if args.command == "encode":
+        count = write_encoded(read_reviews(args.input), args.output)
+    elif args.command == "decode":
+        with open(args.output, "w", encoding="utf-8") as f:
+            count = 0
+            for review in EncodedReader(args.input):
+                f.write(json.dumps(review, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+    else:
+        reader = EncodedReader(args.input)
+        rows = Counter()
+        ops = Counter()
+        for _, encoded in reader.records():
+            rows[encoded.template] += 1
+            ops.update(op for op, _ in encoded.ops)
+        count = sum(rows.values())
+    seconds = time.perf_counter() - start
+
+    print(f"\n[OK] {VERBS[args.command]} {count} reviews in {seconds:.2f}s "
+          f"({count / seconds if seconds else 0:,.0f} rows/sec)")
+    if args.command == "templates":
+        print(f"[STATS] {len(reader.templates)} templates, {count - rows[RAW]} rows encoded, {rows[RAW]} raw; "
+              f"ops: {ops['v']} variations, {ops['p']} prefixes, {ops['s']} suffixes")
+        print("\nROWS PER TEMPLATE:")
+        for template in reader.iter_templates():
+            if rows[template.id]:
+                print(f"   {template.id:4d} {template.name:26s} {rows[template.id]:8d}  {template.text[:30]!r}")
+    else:
+        in_size, out_size = os.path.getsize(args.input), os.path.getsize(args.output)
+        print(f"[FILE] {args.input}: {in_size:,} bytes -> {args.output}: {out_size:,} bytes "
+              f"({out_size / in_size if in_size else 0:.1%})")
+    print(f"\n{'=' * 70}\n")
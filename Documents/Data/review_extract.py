@@ -0,0 +1,744 @@
+"""
+Concurrent Claude extraction for Frontier reviews
+Python counterpart of the n8n/nimbus_ai_processor.json extraction step.
+Instead of one review per request round trip, rows are claimed in batches
+and extracted by an asyncio client with bounded concurrency, a token-bucket
+request rate and retries with exponential backoff and full jitter. Each row
+ends as claude_processed (ai_attributes plus the extracted columns the n8n
+parser fills) or errored, with processing_attempts incremented per request.
+
+Rows come from frontier_reviews_processed (processing_status = 'pending',
+requires psycopg2) or, offline, from review files with results written as
+NDJSON. A local stub that replays n8n/sample_claude_response.json stands in
+for the Messages API so throughput can be measured without network access.
+Extractions are cached in SQLite by cleaned review text and prompt version,
+so repeated template texts are requested once, and problem-focused reviews
+whose annotations give every field are parsed locally (review_annotations;
+those rows are claude_processed with review_summary and sentiment NULL):
+
+    python review_extract.py reviews.ndjson --output extracted.ndjson --stub --concurrency 32
+    ANTHROPIC_API_KEY=... python review_extract.py --dsn postgresql://... --rate 5
+    python review_extract.py --serve-stub --port 8766
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import urllib.error
+import urllib.request
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain, islice
+
+from review_core import read_reviews
+
+N8N_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "n8n")
+SCHEMA_FILE = os.path.join(N8N_DIR, "claude_extraction_schema_prompt.json")
+SAMPLE_RESPONSE_FILE = os.path.join(N8N_DIR, "sample_claude_response.json")
+
+# Request settings used by the n8n "Prepare Claude Request" node
+API_URL = "https://api.anthropic.com/v1/messages"
+API_VERSION = "2023-06-01"
+API_KEY_VARIABLE = "ANTHROPIC_API_KEY"
+MODEL = "claude-sonnet-4-5-20250929"
+MAX_TOKENS = 4096
+SYSTEM_PROMPT = ("You are an expert at extracting structured information from telecom customer reviews. "
+                 "Always respond with valid JSON matching the provided schema. Do not include any markdown "
+                 "formatting or code blocks - return only the raw JSON object. Pay special attention to "
+                 "creating concise, informative summaries.")
+SUMMARY_CATEGORY = {"review_summary": "string - A concise 20-word summary capturing the essence of the review, "
+                                      "including main issue and outcome"}
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RATE = 5.0          # requests per second; 0 = unlimited
+DEFAULT_BATCH_SIZE = 200    # rows claimed per batch, like max_records in n8n
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_TIMEOUT = 300
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# Timeouts, rate limiting, server errors and Anthropic's 529 "overloaded"
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504, 529}
+
+DEFAULT_STUB_PORT = 8766
+
+DEFAULT_CACHE = "claude_extraction_cache.sqlite"
+DEFAULT_CACHE_ENTRIES = 1000000
+DEFAULT_CACHE_TTL_DAYS = 30
+LOOKUP_BATCH = 500
+
+# ============================================================================
+# REQUESTS AND RESPONSES
+# ============================================================================
+
+CONTROL_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\u200b-\u200d\ufeff]")
+CHARACTER_MAP = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'", "\u2013": "-",
+                               "\u2014": "-", "\u2026": "...", "\u00a0": " ", "\u2022": "*", "\u2023": "*",
+                               "\u2043": "*", "`": "'", "\u00b4": "'"})
+BLANK_LINES = re.compile(r"\n{3,}")
+SPACES = re.compile(r"[ \t]+")
+LINE_EDGES = re.compile(r"^[ \t]+|[ \t]+$", re.MULTILINE)
+FENCED_JSON = re.compile(r"```json\n([\s\S]*?)\n```")
+WHITESPACE = re.compile(r"\s+")
+
+def clean_text(text):
+    """Strip control characters and normalize quotes, dashes and whitespace, as the n8n node does"""
+    if not text:
+        return ""
+    text = CONTROL_CHARACTERS.sub("", text).translate(CHARACTER_MAP)
+    text = BLANK_LINES.sub("\n\n", text.replace("\r\n", "\n").replace("\r", "\n"))
+    return LINE_EDGES.sub("", SPACES.sub(" ", text)).strip()
+
+def load_schema(schema_file=SCHEMA_FILE):
+    """The extraction schema, with the summary category the n8n prompt adds"""
+    with open(schema_file, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    schema["categories"] = {"summary": SUMMARY_CATEGORY, **schema["categories"]}
+    return schema
+
+def build_prompt(review, schema):
+    return (f"Extract information from this telecom review according to the following schema:\n\n"
+            f"{json.dumps(schema, indent=2)}\n\n"
+            f"Review to analyze:\n{clean_text(review.get('review_text'))}\n\n"
+            "IMPORTANT: \n"
+            "1. Generate a 20-word summary that captures the main issue, sentiment, and outcome.\n"
+            "2. The summary should be concise, clear, and useful for quick review scanning.\n"
+            "3. Respond with a JSON object containing all extracted fields.\n"
+            "4. Return only the raw JSON without any markdown formatting.")
+
+def build_request(review, schema, model=MODEL):
+    return {
+        "model": model,
+        "max_tokens": MAX_TOKENS,
+        "temperature": 0.0,
+        "system": SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": build_prompt(review, schema)}],
+    }
+
+def prompt_version(schema, model=MODEL):
+    """Hex digest of everything but the review that shapes a request: model, system prompt, schema and template"""
+    prompt = f"{model}\0{SYSTEM_PROMPT}\0{build_prompt({}, schema)}"
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).hexdigest()
+
+def extraction_key(text, version):
+    """16-byte BLAKE2b digest of the prompt version and the cleaned review text, whitespace collapsed"""
+    normalized = WHITESPACE.sub(" ", unicodedata.normalize("NFKC", clean_text(text))).strip()
+    return hashlib.blake2b(f"{version}\0{normalized}".encode("utf-8"), digest_size=16).digest()
+
+def parse_response(response):
+    """ai_attributes from a Messages API response; raises ValueError if there is no JSON object"""
+    text = next((block.get("text", "") for block in response.get("content") or []
+                 if block.get("type") == "text"), "")
+    try:
+        attributes = json.loads(text)
+    except ValueError:
+        match = FENCED_JSON.search(text)
+        if not match:
+            raise ValueError(f"No JSON in response: {text[:200]!r}")
+        attributes = json.loads(match.group(1))
+    if not isinstance(attributes, dict):
+        raise ValueError("Response JSON is not an object")
+    return attributes
+
+def _path(attributes, *keys):
+    for key in keys:
+        if not isinstance(attributes, dict):
+            return None
+        attributes = attributes.get(key)
+    return attributes
+
+def attribute_columns(attributes, rating=None):
+    """The frontier_reviews_processed columns the n8n parser fills from ai_attributes"""
+    would_recommend = _path(attributes, "business_impact", "would_recommend")
+    if would_recommend is None and rating is not None:
+        would_recommend = True if rating >= 4 else (False if rating <= 2 else None)
+    return {
+        "review_summary": _path(attributes, "summary", "review_summary"),
+        "sentiment_score": _path(attributes, "sentiment_analysis", "sentiment_score"),
+        "overall_sentiment": _path(attributes, "sentiment_analysis", "overall_sentiment"),
+        "sentiment_intensity": _path(attributes, "sentiment_analysis", "sentiment_intensity"),
+        "urgency_level": _path(attributes, "sentiment_analysis", "urgency_level"),
+        "churn_risk": _path(attributes, "churn_analysis", "churn_risk"),
+        "churn_probability_score": _path(attributes, "churn_analysis", "churn_probability_score"),
+        "retention_opportunity": bool(_path(attributes, "churn_analysis", "retention_opportunity")),
+        "primary_category": _path(attributes, "classification", "primary_category"),
+        "nps_indicator": _path(attributes, "business_impact", "nps_indicator"),
+        "would_recommend": would_recommend,
+        "reputation_risk": _path(attributes, "business_impact", "reputation_risk"),
+        "resolution_urgency": _path(attributes, "business_impact", "resolution_urgency"),
+        "reviewer_type": _path(attributes, "reviewer_profile", "reviewer_type") or "residential",
+        "customer_tenure_months": _path(attributes, "reviewer_profile", "customer_tenure", "duration_months"),
+        "tenure_category": _path(attributes, "reviewer_profile", "customer_tenure", "tenure_category"),
+        "tech_savviness": _path(attributes, "reviewer_profile", "tech_savviness") or "medium",
+        "issue_severity": _path(attributes, "technical_issues", "severity"),
+        "issue_frequency": _path(attributes, "technical_issues", "frequency"),
+        "resolution_status": _path(attributes, "technical_issues", "resolution_status") or "unresolved",
+    }
+
+# ============================================================================
+# PERSISTENT CACHE
+# ============================================================================
+
+class ExtractionCache:
+    """SQLite map from extraction key to ai_attributes JSON, with TTL and LRU eviction.
+
+    Entries older than ttl seconds are treated as misses and deleted; past
+    max_entries the least recently used entries go, as in EmbeddingCache.
+    The prompt version the entries were made with is kept in a meta table,
+    and opening the cache with a different version (the schema file, model
+    or prompt changed) empties it.
+    """
+
+    __slots__ = ("path", "max_entries", "ttl", "version", "db", "tick", "entries",
+                 "hits", "misses", "expired", "evictions", "invalidated")
+
+    def __init__(self, version, path=DEFAULT_CACHE, max_entries=DEFAULT_CACHE_ENTRIES,
+                 ttl=DEFAULT_CACHE_TTL_DAYS * 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = version
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS extractions (key BLOB PRIMARY KEY, attributes TEXT NOT NULL, "
+                        "created INTEGER NOT NULL, used INTEGER NOT NULL) WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS extractions_used ON extractions (used)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS extractions_created ON extractions (created)")
+        self.hits = self.misses = self.expired = self.evictions = self.invalidated = 0
+        stored = self.db.execute("SELECT value FROM meta WHERE name = 'prompt_version'").fetchone()
+        if stored is None or stored[0] != version:
+            self.invalidated = self.db.execute("DELETE FROM extractions").rowcount
+            self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('prompt_version', ?)", (version,))
+            self.db.commit()
+        self.tick, self.entries = self.db.execute(
+            "SELECT COALESCE(MAX(used), 0), COUNT(*) FROM extractions").fetchone()
+
+    def __len__(self):
+        return self.entries
+
+    def get_many(self, keys):
+        """Return {key: ai_attributes} for the keys cached within the TTL, marking them as used"""
+        keys = list(keys)
+        oldest = int(time.time() - self.ttl) if self.ttl else 0
+        found = {}
+        stale = []
+        for start in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[start:start + LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for key, attributes, created in self.db.execute(
+                    f"SELECT key, attributes, created FROM extractions WHERE key IN ({placeholders})", batch):
+                if created < oldest:
+                    stale.append((key,))
+                else:
+                    found[key] = json.loads(attributes)
+        if stale:
+            self.db.executemany("DELETE FROM extractions WHERE key = ?", stale)
+            self.entries -= len(stale)
+            self.expired += len(stale)
+        if found:
+            self.tick += 1
+            self.db.executemany("UPDATE extractions SET used = ? WHERE key = ?", ((self.tick, key) for key in found))
+        if found or stale:
+            self.db.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store (key, ai_attributes) pairs, then evict down to max_entries"""
+        self.tick += 1
+        now = int(time.time())
+        cursor = self.db.executemany("INSERT OR IGNORE INTO extractions (key, attributes, created, used) "
+                                     "VALUES (?, ?, ?, ?)",
+                                     ((key, json.dumps(attributes, ensure_ascii=False), now, self.tick)
+                                      for key, attributes in items))
+        self.entries += cursor.rowcount
+        self.evict()
+        self.db.commit()
+
+    def evict(self):
+        """Delete expired entries, then least recently used entries beyond max_entries"""
+        if self.ttl:
+            removed = self.db.execute("DELETE FROM extractions WHERE created < ?",
+                                      (int(time.time() - self.ttl),)).rowcount
+            self.entries -= removed
+            self.expired += removed
+        excess = self.entries - self.max_entries
+        if excess > 0:
+            self.db.execute("DELETE FROM extractions WHERE key IN "
+                            "(SELECT key FROM extractions ORDER BY used LIMIT ?)", (excess,))
+            self.entries -= excess
+            self.evictions += excess
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ============================================================================
+# ASYNC CLIENT
+# ============================================================================
+
+# Outcome for one row: status is claude_processed or errored
+Extraction = namedtuple("Extraction", ["review", "status", "attributes", "error", "attempts"])
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, in bursts of up to `burst`"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "lock")
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class ExtractionClient:
+    """Runs extractions concurrently against a Messages API endpoint.
+
+    The event loop schedules requests, rate limits and backoff; the HTTP
+    calls themselves are blocking urllib requests run in a thread pool as
+    large as the concurrency limit, so no extra HTTP library is needed.
+    With an ExtractionCache, reviews whose text was extracted before (or
+    repeats within a batch) are answered without a request. With fast_path,
+    problem-focused reviews whose annotations give every field the regex
+    extractor in review_annotations fills are never sent either.
+    """
+
+    def __init__(self, url=API_URL, api_key=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                 burst=None, max_attempts=DEFAULT_MAX_ATTEMPTS, timeout=DEFAULT_TIMEOUT, model=MODEL,
+                 schema=None, rng=random, cache=None, fast_path=False):
+        self.url = url
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.model = model
+        self.schema = schema or load_schema()
+        self.rng = rng
+        self.cache = cache
+        self.fast_path = None
+        if fast_path:
+            from review_annotations import fast_attributes
+            self.fast_path = fast_attributes
+        self.version = prompt_version(self.schema, model)
+        self.executor = ThreadPoolExecutor(concurrency)
+        self.stats = Counter()
+        self.latencies = []
+        self.bucket = None
+        self.semaphore = None
+
+    def _post(self, payload):
+        """One blocking request: (status, retry-after seconds or None, parsed body or None)"""
+        headers = {"content-type": "application/json", "anthropic-version": API_VERSION}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        request = urllib.request.Request(self.url, json.dumps(payload).encode("utf-8"), headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, None, json.load(response)
+        except urllib.error.HTTPError as error:
+            retry_after = error.headers.get("retry-after")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            return error.code, retry_after, None
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry `attempt` (1-based): full jitter, or the server's retry-after"""
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_CAP)
+        return self.rng.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+    async def extract(self, review):
+        """Extract one review, retrying transient failures; returns an Extraction"""
+        loop = asyncio.get_running_loop()
+        payload = build_request(review, self.schema, self.model)
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            start = time.perf_counter()
+            try:
+                status, retry_after, body = await loop.run_in_executor(self.executor, self._post, payload)
+            except (OSError, ValueError) as exc:
+                # Connection failures and timeouts (URLError is an OSError), or an unreadable body
+                status, retry_after, body = None, None, None
+                error = f"{type(exc).__name__}: {exc}"
+            self.latencies.append(time.perf_counter() - start)
+
+            if status == 200:
+                try:
+                    return Extraction(review, "claude_processed", parse_response(body), None, attempt)
+                except ValueError as exc:
+                    return Extraction(review, "errored", None, str(exc), attempt)
+            if status is not None:
+                error = f"HTTP {status}"
+                if status not in RETRY_STATUSES:
+                    return Extraction(review, "errored", None, error, attempt)
+            if attempt < self.max_attempts:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff(attempt, retry_after))
+        return Extraction(review, "errored", None, error, self.max_attempts)
+
+    async def _bounded(self, review):
+        async with self.semaphore:
+            return await self.extract(review)
+
+    async def extract_batch(self, reviews):
+        """Extract a batch concurrently; results come back in input order"""
+        if self.bucket is None:
+            self.bucket = TokenBucket(self.rate, self.burst)
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        results = [None] * len(reviews)
+        remaining = list(range(len(reviews)))
+        if self.fast_path:
+            remaining = []
+            for i, review in enumerate(reviews):
+                attributes = self.fast_path(review.get("review_text"))
+                if attributes is None:
+                    remaining.append(i)
+                else:
+                    results[i] = Extraction(review, "claude_processed", attributes, None, 0)
+            self.stats["fast_path"] += len(reviews) - len(remaining)
+
+        pending = [reviews[i] for i in remaining]
+        if self.cache is None:
+            extracted = await asyncio.gather(*(self._bounded(review) for review in pending))
+        else:
+            extracted = await self._extract_cached(pending)
+        for i, result in zip(remaining, extracted):
+            results[i] = result
+        # Fast-path rows are counted under fast_path only, not as claude_processed
+        self.stats.update(result.status for result in extracted)
+        return results
+
+    async def _extract_cached(self, reviews):
+        """Serve cached texts from the cache and request each distinct uncached text once"""
+        keys = [extraction_key(review.get("review_text"), self.version) for review in reviews]
+        found = self.cache.get_many(set(keys))
+        pending = {}
+        for review, key in zip(reviews, keys):
+            if key not in found and key not in pending:
+                pending[key] = review
+        extracted = dict(zip(pending, await asyncio.gather(*(self._bounded(review) for review in pending.values()))))
+        self.cache.put_many((key, result.attributes) for key, result in extracted.items()
+                            if result.status == "claude_processed")
+
+        results = []
+        for review, key in zip(reviews, keys):
+            if key in found:
+                results.append(Extraction(review, "claude_processed", found[key], None, 0))
+            elif extracted[key].review is review:
+                results.append(extracted[key])
+            else:
+                # Same text as an earlier row of this batch: share its outcome, no request of its own
+                results.append(extracted[key]._replace(review=review, attempts=0))
+        cached = sum(key in found for key in keys)
+        self.stats["cache_lookups"] += len(keys)
+        self.stats["cached"] += cached
+        self.stats["shared"] += len(results) - cached - len(extracted)
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+async def process_rows(source, client, batch_size=DEFAULT_BATCH_SIZE, limit=0):
+    """Claim, extract and complete batches until the source is empty or `limit` rows are done"""
+    done = 0
+    while not limit or done < limit:
+        rows = source.claim(min(batch_size, limit - done) if limit else batch_size)
+        if not rows:
+            break
+        source.complete(await client.extract_batch(rows))
+        done += len(rows)
+    return done
+
+# ============================================================================
+# ROW SOURCES
+# ============================================================================
+
+def result_row(result):
+    """Column values written for one Extraction"""
+    row = {
+        "review_id": result.review.get("review_id"),
+        "processing_status": result.status,
+        "processing_attempts": result.attempts,
+        "error_message": result.error,
+        "ai_attributes": result.attributes,
+    }
+    if result.attributes is not None:
+        row.update(attribute_columns(result.attributes, result.review.get("rating")))
+    return row
+
+class FileRows:
+    """Offline source: every review in the input files is a pending row, results are written as NDJSON"""
+
+    def __init__(self, input_files, output_file=None):
+        self.reviews = chain.from_iterable(read_reviews(input_file) for input_file in input_files)
+        self.out = open(output_file, "w", encoding="utf-8") if output_file else None
+
+    def claim(self, limit):
+        return list(islice(self.reviews, limit))
+
+    def complete(self, results):
+        if self.out:
+            for result in results:
+                self.out.write(json.dumps(result_row(result), ensure_ascii=False))
+                self.out.write("\n")
+
+    def close(self):
+        if self.out:
+            self.out.close()
+
+class PostgresRows:
+    """frontier_reviews_processed rows with processing_status = 'pending' (requires psycopg2).
+
+    Each batch is claimed with FOR UPDATE SKIP LOCKED inside a transaction
+    that stays open until its results are written, so several processors
+    can drain the table without taking the same rows.
+
+    Fast-path rows (extraction_method "annotations" in ai_attributes) are
+    written as claude_processed too, since the status CHECK constraint has no
+    other done state, but no LLM ran: review_summary, the sentiment columns,
+    urgency, NPS and the other fields the annotations do not give stay NULL.
+    Select them with ai_attributes->>'extraction_method' = 'annotations' to
+    send them through the LLM later (--no-fast-path).
+    """
+
+    CLAIM_SQL = ("SELECT review_id, platform, review_date, rating, reviewer_name, location, review_text, title "
+                 "FROM {table} WHERE processing_status = 'pending' "
+                 "ORDER BY review_id FOR UPDATE SKIP LOCKED LIMIT %s")
+    COLUMNS = list(attribute_columns({}))
+
+    def __init__(self, dsn, schema="team_pegasus"):
+        import psycopg2
+        from psycopg2.extras import Json, RealDictCursor
+        self.json = Json
+        self.connection = psycopg2.connect(dsn)
+        self.cursor = self.connection.cursor(cursor_factory=RealDictCursor)
+        self.table = f"{schema}.frontier_reviews_processed" if schema else "frontier_reviews_processed"
+        assignments = ", ".join(f"{column} = COALESCE(%({column})s, {column})" for column in self.COLUMNS)
+        self.update_sql = (f"UPDATE {self.table} SET processing_status = %(processing_status)s, "
+                           f"error_message = %(error_message)s, "
+                           f"processing_attempts = COALESCE(processing_attempts, 0) + %(processing_attempts)s, "
+                           f"ai_attributes = COALESCE(%(ai_attributes)s, ai_attributes), {assignments}, "
+                           f"last_processed_at = NOW(), updated_at = NOW() WHERE review_id = %(review_id)s")
+
+    def claim(self, limit):
+        self.cursor.execute(self.CLAIM_SQL.format(table=self.table), (limit,))
+        return self.cursor.fetchall()
+
+    def complete(self, results):
+        rows = []
+        for result in results:
+            row = dict.fromkeys(self.COLUMNS)
+            row.update(result_row(result))
+            row["ai_attributes"] = self.json(row["ai_attributes"]) if row["ai_attributes"] is not None else None
+            rows.append(row)
+        self.cursor.executemany(self.update_sql, rows)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+# ============================================================================
+# STUB SERVER
+# ============================================================================
+
+def make_stub_server(response_file=SAMPLE_RESPONSE_FILE, host="127.0.0.1", port=DEFAULT_STUB_PORT,
+                     latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+    """Return an HTTP server that answers every Messages request with the sample extraction.
+
+    Each reply waits latency plus up to jitter seconds; a share error_rate
+    of requests gets a 529 overloaded error instead, to exercise retries.
+    """
+    with open(response_file, "r", encoding="utf-8") as f:
+        text = json.dumps(json.load(f))
+    rng = random.Random(seed)
+    counter = iter(range(1, 1 << 62))
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = "".join(message.get("content", "") for message in request.get("messages", []))
+            except (ValueError, AttributeError):
+                self._reply(400, {"type": "error", "error": {"type": "invalid_request_error",
+                                                             "message": "Request body is not valid JSON"}})
+                return
+            time.sleep(latency + rng.random() * jitter)
+            if rng.random() < error_rate:
+                self._reply(529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+                return
+            self._reply(200, {
+                "id": f"msg_stub_{next(counter)}",
+                "type": "message",
+                "role": "assistant",
+                "model": request.get("model", MODEL),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+            })
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    return server
+
+def start_stub(**settings):
+    """Start a stub server on a free port in a background thread; return (server, url)"""
+    server = make_stub_server(port=0, **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1/messages"
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent Claude extraction of pending reviews")
+    parser.add_argument("inputs", nargs="*", help="Review files to extract offline (NDJSON or JSON)")
+    parser.add_argument("--output", help="With review files, write one result row per review as NDJSON")
+    parser.add_argument("--dsn", help="PostgreSQL DSN; extract pending frontier_reviews_processed rows (requires psycopg2)")
+    parser.add_argument("--schema", default="team_pegasus", help="PostgreSQL schema of frontier_reviews_processed")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after this many rows (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows claimed per batch")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Requests per second (0 = unlimited)")
+    parser.add_argument("--burst", type=float, help="Token-bucket size (default: one second of --rate)")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Requests per row")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per request")
+    parser.add_argument("--url", default=API_URL, help="Messages API endpoint")
+    parser.add_argument("--model", default=MODEL)
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="Send annotated problem-focused reviews to the LLM too, instead of parsing them locally")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="SQLite extraction cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Request every row, without the cache")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES, help="Extractions kept")
+    parser.add_argument("--cache-ttl-days", type=float, default=DEFAULT_CACHE_TTL_DAYS,
+                        help="Days an extraction stays valid (0 = forever)")
+    parser.add_argument("--stub", action="store_true", help="Run against an in-process stub instead of --url")
+    parser.add_argument("--serve-stub", action="store_true", help="Only run the stub server until interrupted")
+    parser.add_argument("--port", type=int, default=DEFAULT_STUB_PORT, help="Port for --serve-stub")
+    parser.add_argument("--stub-latency-ms", type=float, default=800.0, help="Stub delay per request")
+    parser.add_argument("--stub-jitter-ms", type=float, default=400.0, help="Extra random stub delay, up to this")
+    parser.add_argument("--stub-error-rate", type=float, default=0.02, help="Share of stub requests answered 529")
+    args = parser.parse_args()
+    stub_settings = {"latency": args.stub_latency_ms / 1000, "jitter": args.stub_jitter_ms / 1000,
+                     "error_rate": args.stub_error_rate}
+
+    print("=" * 70)
+    print("CLAUDE REVIEW EXTRACTION")
+    print("=" * 70)
+
+    if args.serve_stub:
+        server = make_stub_server(port=args.port, **stub_settings)
+        print(f"\n[OK] Stub Messages API on http://127.0.0.1:{args.port}/v1/messages (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        print(f"\n{'=' * 70}\n")
+        raise SystemExit(0)
+
+    if bool(args.inputs) == bool(args.dsn):
+        parser.error("give review files or --dsn (not both)")
+    url = args.url
+    stub = None
+    if args.stub:
+        stub, url = start_stub(**stub_settings)
+        print(f"\n[OK] Stub replaying {os.path.basename(SAMPLE_RESPONSE_FILE)} at {url}")
+    source = PostgresRows(args.dsn, args.schema) if args.dsn else FileRows(args.inputs, args.output)
+    schema = load_schema()
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(prompt_version(schema, args.model), args.cache, args.cache_entries,
+                                args.cache_ttl_days * 86400)
+        if cache.invalidated:
+            print(f"\n[CACHE] Prompt or schema changed: dropped {cache.invalidated} cached extractions")
+    client = ExtractionClient(url, os.environ.get(API_KEY_VARIABLE), args.concurrency, args.rate, args.burst,
+                              args.max_attempts, args.timeout, args.model, schema, cache=cache,
+                              fast_path=not args.no_fast_path)
+    start = time.perf_counter()
+    try:
+        rows = asyncio.run(process_rows(source, client, args.batch_size, args.limit))
+    finally:
+        source.close()
+        client.close()
+        if cache:
+            cache.close()
+        if stub:
+            stub.shutdown()
+    seconds = time.perf_counter() - start
+
+    stats = client.stats
+    latencies = sorted(client.latencies) or [0.0]
+    print(f"\n[OK] Extracted {rows} rows in {seconds:.1f}s ({rows / seconds if seconds else 0:,.1f} rows/sec)")
+    if args.output:
+        print(f"[FILE] Results saved to: {args.output}")
+    print("\nROW STATUS:")
+    print(f"   claude_processed: {stats['claude_processed']:8d} (LLM or cache)")
+    print(f"   errored:          {stats['errored']:8d}")
+    print(f"   fast path:        {stats['fast_path']:8d} (annotations parsed locally, no request; "
+          f"summary and sentiment left NULL)")
+    print("\nREQUESTS:")
+    print(f"   Sent:             {stats['requests']:8d} ({stats['retries']} retries)")
+    print(f"   Latency p50:      {latencies[len(latencies) // 2] * 1000:8.0f} ms")
+    print(f"   Latency p95:      {latencies[int(len(latencies) * 0.95)] * 1000:8.0f} ms")
+    print(f"   Concurrency:      {args.concurrency:8d} (rate limit {args.rate or 'none'}/s)")
+    if cache:
+        lookups = stats["cache_lookups"]
+        print(f"\nCACHE ({args.cache}, version {cache.version}):")
+        print(f"   Rows from cache:  {stats['cached']:8d} (no request)")
+        print(f"   Rows shared:      {stats['shared']:8d} (same text as an earlier row in the batch, no request)")
+        print(f"   Hit rate:         {stats['cached'] / lookups if lookups else 0:8.1%} of {lookups} rows looked up "
+              f"({cache.hits} distinct-text hits, {cache.misses} misses)")
+        print(f"   Entries:          {len(cache):8d} ({cache.expired} expired, {cache.evictions} evicted)")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,313 @@
+"""
+Deterministic local stand-in for the Databricks GTE embedding endpoint
+Embeds review texts as 768-dim unit vectors with a hashed n-gram random
+projection: every word, word bigram and character trigram is hashed to a
+few signed coordinates and the counts are L2-normalized. The same text
+always gives the same vector on any machine, texts that share words point
+the same way, and no model or network is needed, so the embed-and-load path
+can be exercised and benchmarked offline at any scale.
+Requires numpy.
+
+    python review_hash_embedder.py --serve [--port 8765]      # fake serving endpoint
+    python review_hash_embedder.py reviews.ndjson             # time in-process embedding
+    python review_hash_embedder.py --check reviews.ndjson     # concurrent requests give the same vectors
+
+The server answers POST {"input": text or [text, ...]} on any path with
+{"predictions": [[...], ...]}, the format databricks_gte_parser.js expects.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from review_core import read_reviews
+from review_embeddings import EMBEDDING_DIM
+
+LOCAL_MODEL = f"local-hashed-ngram-{EMBEDDING_DIM}"
+DEFAULT_SEED = 0
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_SIZE = 256
+
+# Signed coordinates per feature: whole words and word pairs carry more
+# weight than the character trigrams that make misspellings land nearby
+WORD_HASHES = 4
+BIGRAM_HASHES = 4
+TRIGRAM_HASHES = 1
+
+TOKEN = re.compile(r"\w+")
+
+# Distinct tokens remembered; the vocabulary is reset past this
+VOCABULARY_LIMIT = 500000
+
+# 64-bit finalizer constants (MurmurHash3 fmix64) for hashing word pairs in NumPy
+MIX_1 = np.uint64(0xFF51AFD7ED558CCD)
+MIX_2 = np.uint64(0xC4CEB9FE1A85EC53)
+PAIR_STEP = np.uint64(0x9E3779B97F4A7C15)
+
+# A word pair's 64-bit hash is cut into 16-bit fields, one per coordinate:
+# 15 bits pick the index, the top bit the sign (so BIGRAM_HASHES is at most 4)
+PAIR_SHIFTS = np.arange(BIGRAM_HASHES, dtype=np.uint64) * np.uint64(16)
+
+def _mix(values):
+    values = values ^ (values >> np.uint64(33))
+    values = values * MIX_1
+    values = values ^ (values >> np.uint64(33))
+    values = values * MIX_2
+    return values ^ (values >> np.uint64(33))
+
+# ============================================================================
+# HASHED N-GRAM EMBEDDER
+# ============================================================================
+
+class HashedNgramEmbedder:
+    """Deterministic text -> unit vector map via signed feature hashing.
+
+    Each feature is hashed to a few coordinates with a sign, a sparse random
+    projection of the bag of n-grams; coordinate i with sign bit b is coded
+    as i + dim * b. Every distinct token is hashed once (keyed BLAKE2b) into
+    a row of `codes` holding its word and trigram codes plus a 64-bit token
+    hash, and word pairs are hashed from those in NumPy, so a batch of texts
+    is one gather and one np.bincount. The vocabulary is shared state, so
+    embed and embed_batch hold a lock and one embedder can serve many threads.
+    """
+
+    __slots__ = ("dim", "seed", "model", "key", "vocab", "codes", "hashes", "requests", "texts", "lock")
+
+    def __init__(self, dim=EMBEDDING_DIM, seed=DEFAULT_SEED, model=None):
+        self.dim = dim
+        self.seed = seed
+        self.model = model or (LOCAL_MODEL if dim == EMBEDDING_DIM else f"local-hashed-ngram-{dim}")
+        self.key = f"{seed}:{dim}".encode("utf-8")
+        self.requests = 0
+        self.texts = 0
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.vocab = {}
+        # Rows are padded with code 2 * dim, a slot embed_batch drops
+        self.codes = np.full((1024, WORD_HASHES + 8), 2 * self.dim, dtype=np.int64)
+        self.hashes = np.zeros(1024, dtype=np.uint64)
+
+    def _hash(self, feature, count):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4 * count, key=self.key).digest()
+        values = np.frombuffer(digest, dtype="<u4").astype(np.int64)
+        return values % self.dim + self.dim * (values >> 31)
+
+    def _add_token(self, token):
+        """Hash a new token into the vocabulary and return its row"""
+        row = len(self.vocab)
+        padded = f"<{token}>"
+        codes = np.concatenate([self._hash(token, WORD_HASHES)] +
+                               [self._hash(padded[i:i + 3], TRIGRAM_HASHES) for i in range(len(padded) - 2)])
+        rows, width = self.codes.shape
+        if row == rows or len(codes) > width:
+            grown = np.full((rows * 2 if row == rows else rows, max(width, len(codes))), 2 * self.dim, dtype=np.int64)
+            grown[:rows, :width] = self.codes
+            self.codes = grown
+            if row == rows:
+                self.hashes = np.concatenate([self.hashes, np.zeros(rows, dtype=np.uint64)])
+        self.codes[row, :len(codes)] = codes
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8, key=self.key).digest()
+        self.hashes[row] = int.from_bytes(digest, "little")
+        self.vocab[token] = row
+        return row
+
+    def embed_batch(self, texts):
+        """Return a float32 (len(texts), dim) matrix of unit vectors"""
+        with self.lock:
+            return self._embed(texts)
+
+    def _embed(self, texts):
+        dim = self.dim
+        stride = 2 * dim + 1
+        if len(self.vocab) > VOCABULARY_LIMIT:
+            self._reset()
+        vocab = self.vocab
+        add = self._add_token
+        ids = []
+        sizes = []
+        for text in texts:
+            # Same normalization as normalize_text; \w+ ignores the whitespace
+            tokens = TOKEN.findall(unicodedata.normalize("NFKC", text).casefold()) or [""]
+            ids.extend([vocab[token] if token in vocab else add(token) for token in tokens])
+            sizes.append(len(tokens))
+        ids = np.array(ids, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), sizes)
+        offsets = rows * stride
+
+        # Word and trigram codes straight from the vocabulary rows
+        word_codes = (self.codes[ids] + offsets[:, None]).ravel()
+
+        # Adjacent tokens in the same text form a bigram
+        pairs = np.flatnonzero(rows[1:] == rows[:-1])
+        hashes = self.hashes[ids]
+        fields = ((_mix(hashes[pairs] * PAIR_STEP + hashes[pairs + 1])[:, None] >> PAIR_SHIFTS)
+                  & np.uint64(0xFFFF)).astype(np.int64)
+        pair_codes = ((fields & 0x7FFF) % dim + dim * (fields >> 15) + offsets[pairs, None]).ravel()
+
+        counts = np.bincount(np.concatenate([word_codes, pair_codes]),
+                             minlength=len(texts) * stride).reshape(len(texts), stride)
+        matrix = (counts[:, :dim] - counts[:, dim:2 * dim]).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # A text whose signs all cancel still gets a unit vector
+        zero = norms[:, 0] == 0
+        matrix[zero, 0] = 1.0
+        norms[zero] = 1.0
+        matrix /= norms
+        return matrix
+
+    def embed(self, texts):
+        """Return one vector (a list of floats) per text, like HttpEmbedder.embed"""
+        with self.lock:
+            self.requests += 1
+            self.texts += len(texts)
+            matrix = self._embed(texts)
+        return matrix.tolist()
+
+# ============================================================================
+# HTTP STAND-IN
+# ============================================================================
+
+def make_server(embedder, host="127.0.0.1", port=DEFAULT_PORT, latency=0.0):
+    """Return an HTTP server that answers like a GTE serving endpoint.
+
+    latency (seconds) is added to every request to model the network and
+    queueing time of the real endpoint.
+    """
+
+    class EmbeddingHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                texts = body.get("input", body.get("inputs")) if isinstance(body, dict) else None
+                if isinstance(texts, str):
+                    texts = [texts]
+                if not isinstance(texts, list):
+                    raise ValueError('expected {"input": text or [text, ...]}')
+            except ValueError as error:
+                self._reply(400, {"error_code": "BAD_REQUEST", "message": str(error)})
+                return
+            if latency:
+                time.sleep(latency)
+            self._reply(200, {"predictions": embedder.embed(texts)})
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), EmbeddingHandler)
+
+def check_concurrency(embedder, texts, workers=8, batch_size=16):
+    """POST batches of texts to an in-process server from many threads at once.
+
+    Returns the number of batches that failed or whose vectors differ from a
+    fresh embedder with the same dim and seed; 0 means concurrent requests
+    are safe.
+    """
+    server = make_server(embedder, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def post(batch):
+        request = urllib.request.Request(url, json.dumps({"input": batch}).encode("utf-8"),
+                                         {"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return np.array(json.loads(response.read())["predictions"], dtype=np.float32)
+        except OSError:
+            # A request the server dropped counts as a mismatch
+            return None
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    try:
+        with ThreadPoolExecutor(workers) as pool:
+            results = list(pool.map(post, batches))
+    finally:
+        server.shutdown()
+        server.server_close()
+    reference = HashedNgramEmbedder(embedder.dim, embedder.seed)
+    return sum(result is None or not np.array_equal(result, reference.embed_batch(batch))
+               for result, batch in zip(results, batches))
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deterministic local GTE stand-in: serve it or time it")
+    parser.add_argument("inputs", nargs="*", help="NDJSON or JSON review files to embed and time")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP stand-in until interrupted")
+    parser.add_argument("--check", action="store_true",
+                        help="POST the input texts to an in-process server from many threads and compare")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent requests for --check")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every HTTP request")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Embedding dimension")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Hash key; changes every vector")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Texts per embedding batch")
+    args = parser.parse_args()
+    if not args.serve and not args.inputs:
+        parser.error("give review files to time or --check, or --serve")
+
+    embedder = HashedNgramEmbedder(args.dim, args.seed)
+
+    print("=" * 70)
+    print("LOCAL GTE STAND-IN")
+    print("=" * 70)
+
+    if args.serve:
+        server = make_server(embedder, args.host, args.port, args.latency_ms / 1000)
+        print(f"\n[OK] Serving {embedder.model} on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        print(f"\n[STATS] {embedder.requests} requests, {embedder.texts} texts embedded")
+    elif args.check:
+        texts = [review["review_text"] for input_file in args.inputs for review in read_reviews(input_file)]
+        start = time.perf_counter()
+        mismatched = check_concurrency(embedder, texts, args.threads, args.batch_size)
+        seconds = time.perf_counter() - start
+        batches = -(-len(texts) // args.batch_size)
+        print(f"\n[STATS] {embedder.requests} requests from {args.threads} threads, {len(texts)} texts, {seconds:.2f}s")
+        if mismatched:
+            print(f"[ERROR] {mismatched} of {batches} responses differ from a single-threaded embedder")
+            raise SystemExit(1)
+        print(f"[OK] All {batches} concurrent responses match a single-threaded embedder")
+    else:
+        rows = 0
+        start = time.perf_counter()
+        for input_file in args.inputs:
+            batch = []
+            for review in read_reviews(input_file):
+                batch.append(review["review_text"])
+                if len(batch) >= args.batch_size:
+                    rows += len(embedder.embed_batch(batch))
+                    batch = []
+            if batch:
+                rows += len(embedder.embed_batch(batch))
+        seconds = time.perf_counter() - start
+        print(f"\n[OK] Embedded {rows} reviews as {args.dim}-dim unit vectors with {embedder.model}")
+        print(f"[STATS] {seconds:.2f}s, {rows / seconds if seconds else 0:,.0f} reviews/sec")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,220 @@
+"""
+Multi-pattern keyword classifier for Frontier reviews
+All category keywords are compiled into one trie-shaped regular expression
+and each review text is scanned once; every matching category is reported
+with its hit count. Usable as a cheap pre-classifier before LLM extraction:
+
+    python review_keywords.py reviews.ndjson [more.ndjson ...] [--output hits.ndjson]
+    python review_keywords.py --check reviews.ndjson      # cache resets keep hits unchanged
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+
+from review_core import read_reviews
+
+PROBLEM_KEYWORDS = {
+    "billing": ["bill", "fee", "price", "charge", "billing", "promo", "promotional"],
+    "network": ["speed", "mbps", "outage", "oversold", "slow", "drop", "disconnect"],
+    "customer_service": ["support", "service", "call", "hold", "rep", "supervisor", "callback"],
+    "installation": ["install", "technician", "tech", "setup", "visit", "cable"],
+    "equipment": ["router", "equipment", "wifi", "hardware", "device"],
+    "cancellation": ["cancel", "cancellation", "termination", "contract", "collections"]
+}
+
+# ============================================================================
+# PATTERN COMPILATION
+# ============================================================================
+
+def trie_pattern(words):
+    """Build a regex alternation for `words` that shares common prefixes.
+
+    re tries alternatives one by one, so "bill|billing|bug" costs three
+    attempts per position while "b(?:ill(?:ing)?|ug)" costs one. Longer
+    continuations come first, so the longest keyword at a position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        ends = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            # Already a complete word here; the continuation is optional
+            return ("(?:" + body + ")?") if len(branches) == 1 and len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+# Cap on remembered tokens; the token caches are reset past this
+VOCABULARY_LIMIT = 1000000
+
+class KeywordClassifier:
+    """Match every category's keywords in one pass over the text.
+
+    Keywords match as lowercase substrings, like the original per-category
+    `keyword in text_lower` checks. None of them contain whitespace, so the
+    text is split into tokens once and the combined pattern runs once per
+    distinct token ever seen; after that a review costs a split and a set
+    intersection. Matches may overlap, so "reprice" hits both "rep" and
+    "price", but only the longest keyword starting at an offset counts:
+    "billing" is one billing hit, not two. A keyword that is a prefix of the
+    longer one still reports its category if that category differs.
+    """
+
+    __slots__ = ("categories", "lookup", "pattern", "seen", "token_hits", "vocabulary_limit")
+
+    def __init__(self, keywords=PROBLEM_KEYWORDS, vocabulary_limit=VOCABULARY_LIMIT):
+        self.categories = list(keywords)
+        self.vocabulary_limit = vocabulary_limit
+        owner = {}
+        for category, words in keywords.items():
+            for word in words:
+                owner.setdefault(word.lower(), category)
+        # Keyword -> categories of the keywords it starts with, itself included
+        self.lookup = {}
+        for word in owner:
+            prefixes = {owner[word[:end]] for end in range(1, len(word) + 1) if word[:end] in owner}
+            self.lookup[word] = [category for category in self.categories if category in prefixes]
+        # The lookahead matches at every offset, so overlapping keywords are all found
+        self.pattern = re.compile("(?=(" + trie_pattern(owner) + "))")
+        # Tokens already scanned, and the categories hit by those that match
+        self.seen = set()
+        self.token_hits = {}
+
+    def _learn(self, tokens):
+        """Run the combined pattern over tokens not seen before"""
+        lookup = self.lookup
+        for token in tokens:
+            found = self.pattern.findall(token)
+            if found:
+                self.token_hits[token] = [category for word in found for category in lookup[word]]
+        self.seen |= tokens
+
+    def hits(self, text):
+        """Return a Counter of category -> keyword hits for one text"""
+        tokens = text.lower().split()
+        if not self.seen.issuperset(tokens):
+            # Reset before picking the unseen tokens, so this text's seen ones are relearned
+            if len(self.seen) > self.vocabulary_limit:
+                self.seen = set()
+                self.token_hits = {}
+            self._learn(set(tokens) - self.seen)
+
+        token_hits = self.token_hits
+        found = Counter()
+        for token in filter(token_hits.__contains__, tokens):
+            for category in token_hits[token]:
+                found[category] += 1
+        return found
+
+    def primary(self, text):
+        """First category (in keyword-table order) with any hit, or None"""
+        found = self.hits(text)
+        for category in self.categories:
+            if found[category]:
+                return category
+        return None
+
+    def classify(self, reviews, field="review_text"):
+        """Yield (review, hits) for every review in a stream"""
+        for review in reviews:
+            yield review, self.hits(review[field])
+
+def check_cache_reset(texts, vocabulary_limit=3):
+    """Number of texts whose hits change when the token caches are reset every few tokens"""
+    reference = KeywordClassifier()
+    small = KeywordClassifier(vocabulary_limit=vocabulary_limit)
+    return sum(small.hits(text) != reference.hits(text) for text in texts)
+
+# ============================================================================
+# FILE / STREAM INPUT
+# ============================================================================
+
+def classify_files(input_files, classifier, output_file=None):
+    """Classify every review in input_files and return summary counts.
+
+    With output_file, one {"review_id", "categories"} line per review is
+    written as NDJSON so downstream steps can route reviews by category.
+    """
+    summary = {
+        "total_reviews": 0,
+        "unmatched": 0,
+        "reviews_per_category": Counter(),
+        "hits_per_category": Counter(),
+        "categories_per_review": Counter()
+    }
+    out = open(output_file, "w", encoding="utf-8") if output_file else None
+    try:
+        for input_file in input_files:
+            for review, found in classifier.classify(read_reviews(input_file)):
+                summary["total_reviews"] += 1
+                summary["reviews_per_category"].update(found.keys())
+                summary["hits_per_category"].update(found)
+                summary["categories_per_review"][len(found)] += 1
+                if not found:
+                    summary["unmatched"] += 1
+                if out:
+                    out.write(json.dumps({"review_id": review.get("review_id"), "categories": found}))
+                    out.write("\n")
+    finally:
+        if out:
+            out.close()
+    return summary
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword pre-classification of review files")
+    parser.add_argument("inputs", nargs="+", help="NDJSON or JSON review files ('-' reads NDJSON from stdin)")
+    parser.add_argument("--output", help="Write per-review category hits as NDJSON")
+    parser.add_argument("--check", action="store_true",
+                        help="Check that resetting the token caches every few tokens gives the same hits")
+    args = parser.parse_args()
+
+    if args.check:
+        texts = ["billing router zzz"] + [review["review_text"] for input_file in args.inputs
+                                          for review in read_reviews(input_file)]
+        mismatched = check_cache_reset(texts)
+        print("=" * 70)
+        print("KEYWORD CACHE CHECK")
+        print("=" * 70)
+        if mismatched:
+            print(f"\n[ERROR] {mismatched} of {len(texts)} texts get other hits with a vocabulary limit of 3")
+            raise SystemExit(1)
+        print(f"\n[OK] All {len(texts)} texts get the same hits with a vocabulary limit of 3")
+        print(f"\n{'=' * 70}\n")
+        raise SystemExit(0)
+
+    summary = classify_files(args.inputs, KeywordClassifier(), args.output)
+    total = summary["total_reviews"] or 1
+
+    print("=" * 70)
+    print("KEYWORD PRE-CLASSIFICATION")
+    print("=" * 70)
+    print(f"\n[OK] Classified {summary['total_reviews']} reviews")
+    if args.output:
+        print(f"[FILE] Per-review categories saved to: {args.output}")
+
+    print("\nREVIEWS PER CATEGORY:")
+    for category in PROBLEM_KEYWORDS:
+        count = summary["reviews_per_category"][category]
+        print(f"   {category:20s}: {count:6d} ({count / total * 100:5.1f}%)  "
+              f"{summary['hits_per_category'][category]:7d} hits")
+    print(f"   {'(no match)':20s}: {summary['unmatched']:6d} ({summary['unmatched'] / total * 100:5.1f}%)")
+
+    print("\nCATEGORIES PER REVIEW:")
+    for count in sorted(summary["categories_per_review"]):
+        print(f"   {count} categories: {summary['categories_per_review'][count]:6d}")
+    print(f"\n{'=' * 70}\n")
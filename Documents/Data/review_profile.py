@@ -0,0 +1,131 @@
+"""
+Opt-in per-stage profiling for the Frontier review generators
+Stage functions are swapped for timing wrappers only while a profiler is
+active, so normal runs execute the original functions with no overhead.
+Collects per-stage call counts, cumulative and self time, and optionally
+tracemalloc allocation deltas.
+"""
+
+import json
+import time
+import tracemalloc
+from functools import wraps
+
+class StageProfiler:
+    """Times named stages by wrapping the functions that implement them.
+
+    Stages nest: a stage's self time excludes time spent in stages it calls,
+    so for generate_review the self time is the work done inline (dict
+    assembly, location and URL draws). With trace_memory, the net bytes
+    still allocated when each stage returns are recorded the same way.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = {}
+        self.stack = []
+        self.patched = []
+        self.wall_seconds = 0.0
+        self.peak_bytes = 0
+        self.started = None
+
+    def wrap(self, name, fn):
+        """Return fn wrapped so its calls are counted under stage `name`"""
+        # calls, total ns, self ns, allocated bytes, self allocated bytes
+        record = self.records.setdefault(name, [0, 0, 0, 0, 0])
+        stack = self.stack
+        clock = time.perf_counter_ns
+        traced = tracemalloc.get_traced_memory if self.trace_memory else None
+
+        @wraps(fn)
+        def staged(*args, **kwargs):
+            entered = clock()
+            children = [0, 0]
+            stack.append(children)
+            before = traced()[0] if traced else 0
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                allocated = traced()[0] - before if traced else 0
+                stack.pop()
+                record[0] += 1
+                record[1] += elapsed
+                record[2] += elapsed - children[0]
+                record[3] += allocated
+                record[4] += allocated - children[1]
+                if stack:
+                    # The parent is charged this wrapper's bookkeeping too, so
+                    # its self time is not inflated by the profiling itself
+                    stack[-1][1] += allocated
+                    stack[-1][0] += clock() - entered
+        return staged
+
+    def instrument(self, target, stages):
+        """Replace target.<attribute> with a staged wrapper for each {attribute: stage} pair.
+
+        target is a module or class; the generators look their helpers up as
+        module globals at call time, so patching the module is enough.
+        """
+        for attribute, name in stages.items():
+            original = getattr(target, attribute)
+            self.patched.append((target, attribute, original))
+            setattr(target, attribute, self.wrap(name, original))
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+
+    def stop(self):
+        """Restore the original functions and stop tracing"""
+        self.wall_seconds += time.perf_counter() - self.started
+        for target, attribute, original in reversed(self.patched):
+            setattr(target, attribute, original)
+        self.patched = []
+        if self.trace_memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def report(self):
+        """Profile as a JSON-ready dict, stages ordered by self time"""
+        stages = {}
+        for name, (calls, total_ns, self_ns, allocated, self_allocated) in sorted(
+                self.records.items(), key=lambda item: -item[1][2]):
+            stage = {
+                "calls": calls,
+                "total_seconds": total_ns / 1e9,
+                "self_seconds": self_ns / 1e9,
+                "self_share": self_ns / 1e9 / self.wall_seconds if self.wall_seconds else 0,
+                "mean_self_us": self_ns / 1e3 / calls if calls else 0,
+            }
+            if self.trace_memory:
+                stage["allocated_bytes"] = allocated
+                stage["self_allocated_bytes"] = self_allocated
+            stages[name] = stage
+        report = {"wall_seconds": self.wall_seconds, "trace_memory": self.trace_memory, "stages": stages}
+        if self.trace_memory:
+            report["tracemalloc_peak_bytes"] = self.peak_bytes
+        return report
+
+    def save(self, output_file):
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+def print_profile(report, limit=10):
+    """Print the top stages of a profile report"""
+    print("\nPROFILE (self time per stage):")
+    for name, stage in list(report["stages"].items())[:limit]:
+        line = (f"   {name:32s}: {stage['self_seconds']:8.3f}s ({stage['self_share'] * 100:5.1f}%) "
+                f"{stage['calls']:9d} calls {stage['mean_self_us']:7.2f}us/call")
+        if report["trace_memory"]:
+            line += f" {stage['self_allocated_bytes'] / 2 ** 20:+8.1f}MB"
+        print(line)
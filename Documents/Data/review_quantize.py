@@ -0,0 +1,277 @@
+"""
+Quantized storage for 768-dim review embeddings
+float32 embeddings cost 3 KB per review. A quantized store keeps the same
+vectors in a fraction of that, memory-mapped from disk, and scores queries
+directly against the compressed codes:
+
+    float16  2 bytes per dimension
+    int8     1 byte per dimension plus a float32 scale per vector
+    pq       product quantization: the vector is cut into m sub-vectors and
+             each is stored as the 1-byte id of its nearest of 256 trained
+             centroids; a few queries at a time are scored by asymmetric
+             distance computation (ADC), summing per-subspace lookup
+             tables, larger batches by decoding one block of codes at a time
+
+Stores are built from a float32 index (review_vector_index.py), and the CLI
+reports each setting's size and its recall@k against exact float32 search.
+Requires numpy.
+
+    python review_quantize.py --index review_vectors --kinds float16 int8 pq --queries 500
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from review_vector_index import (BLOCK_ROWS, DEFAULT_K, VectorIndex, merge_top_k, normalize_rows,
+                                 recall_at_k, top_k)
+
+STORE_FORMAT = 1
+KINDS = ["float16", "int8", "pq"]
+
+# PQ: sub-vectors per embedding (must divide the dimension), centroids per subspace
+DEFAULT_SUBSPACES = 96
+PQ_CENTROIDS = 256
+PQ_TRAIN_ROWS = 32768
+PQ_ITERATIONS = 10
+
+# ADC costs one table lookup per subspace, row and query, while decoding a
+# block to float32 costs the same for any number of queries; batches larger
+# than this decode the block and score it with one matrix product instead
+ADC_MAX_QUERIES = 16
+
+# Score slack for recall against float32: float16 rounding alone moves a
+# score by up to ~4e-4, so hits closer than this to the k-th best are ties
+STORE_RECALL_EPSILON = 1e-3
+
+# ============================================================================
+# ENCODERS
+# ============================================================================
+
+def encode_int8(vectors):
+    """(codes, scales): symmetric per-vector scaling so each row's largest component maps to 127"""
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+def train_pq(vectors, subspaces, iterations=PQ_ITERATIONS, seed=0):
+    """Euclidean k-means per subspace: codebooks of shape (subspaces, centroids, dim // subspaces).
+
+    centroids is PQ_CENTROIDS, or the row count when fewer rows are given;
+    only trained centroids are kept, so encoding never picks an empty one.
+    """
+    rng = np.random.default_rng(seed)
+    count, dim = vectors.shape
+    if dim % subspaces:
+        raise ValueError(f"--pq-subspaces must divide the dimension ({dim})")
+    width = dim // subspaces
+    centroids = min(PQ_CENTROIDS, count)
+    codebooks = np.zeros((subspaces, centroids, width), dtype=np.float32)
+    for j in range(subspaces):
+        part = np.ascontiguousarray(vectors[:, j * width:(j + 1) * width])
+        book = part[rng.choice(count, centroids, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = _nearest(part, book)
+            counts = np.bincount(assignments, minlength=centroids)
+            sums = np.stack([np.bincount(assignments, weights=part[:, w], minlength=centroids)
+                             for w in range(width)], axis=1)
+            filled = counts > 0
+            book[filled] = sums[filled] / counts[filled, None]
+            # Re-seed empty centroids from random sub-vectors
+            book[~filled] = part[rng.choice(count, int((~filled).sum()))]
+        codebooks[j] = book
+    return codebooks
+
+def _nearest(part, book):
+    """Index of the closest (Euclidean) centroid for every sub-vector"""
+    return np.argmin((book ** 2).sum(axis=1) - 2 * part @ book.T, axis=1)
+
+def encode_pq(vectors, codebooks):
+    subspaces, _, width = codebooks.shape
+    codes = np.empty((len(vectors), subspaces), dtype=np.uint8)
+    for j in range(subspaces):
+        codes[:, j] = _nearest(vectors[:, j * width:(j + 1) * width], codebooks[j])
+    return codes
+
+# ============================================================================
+# BUILDING
+# ============================================================================
+
+def build_store(path, index, kind, subspaces=DEFAULT_SUBSPACES, seed=0):
+    """Quantize a VectorIndex into a store directory and return the QuantizedStore"""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown quantization {kind!r}; expected one of {KINDS}")
+    os.makedirs(path, exist_ok=True)
+    count, dim = index.vectors.shape
+    meta = {"format": STORE_FORMAT, "kind": kind, "count": count, "dim": dim}
+    if kind == "pq":
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(count, min(count, PQ_TRAIN_ROWS), replace=False))
+        codebooks = train_pq(np.asarray(index.vectors[sample]), subspaces, seed=seed)
+        np.save(os.path.join(path, "codebooks.npy"), codebooks)
+        meta["subspaces"] = subspaces
+        shape, dtype = (count, subspaces), np.uint8
+    else:
+        shape, dtype = (count, dim), (np.float16 if kind == "float16" else np.int8)
+
+    codes = np.lib.format.open_memmap(os.path.join(path, "codes.npy"), mode="w+", dtype=dtype, shape=shape)
+    scales = np.empty(count, dtype=np.float32) if kind == "int8" else None
+    for start in range(0, count, BLOCK_ROWS):
+        block = np.asarray(index.vectors[start:start + BLOCK_ROWS])
+        if kind == "float16":
+            codes[start:start + BLOCK_ROWS] = block.astype(np.float16)
+        elif kind == "int8":
+            codes[start:start + BLOCK_ROWS], scales[start:start + BLOCK_ROWS] = encode_int8(block)
+        else:
+            codes[start:start + BLOCK_ROWS] = encode_pq(block, codebooks)
+    codes.flush()
+    del codes
+    if scales is not None:
+        np.save(os.path.join(path, "scales.npy"), scales)
+    np.save(os.path.join(path, "review_ids.npy"), np.asarray(index.review_ids))
+    with open(os.path.join(path, "store.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return QuantizedStore(path)
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+class QuantizedStore:
+    """A quantized store directory, codes memory-mapped read-only"""
+
+    __slots__ = ("path", "meta", "kind", "codes", "scales", "codebooks", "review_ids")
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "store.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != STORE_FORMAT:
+            raise ValueError(f"{path}: unsupported store format {self.meta.get('format')}")
+        self.kind = self.meta["kind"]
+        self.codes = np.load(os.path.join(path, "codes.npy"), mmap_mode="r")
+        self.review_ids = np.load(os.path.join(path, "review_ids.npy"), mmap_mode="r")
+        self.scales = np.load(os.path.join(path, "scales.npy")) if self.kind == "int8" else None
+        self.codebooks = np.load(os.path.join(path, "codebooks.npy")) if self.kind == "pq" else None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def bytes_per_vector(self):
+        """Code bytes per vector, including the int8 scale"""
+        return self.codes.shape[1] * self.codes.itemsize + (4 if self.kind == "int8" else 0)
+
+    def decode(self, start, end):
+        """Approximate float32 vectors for rows start:end"""
+        codes = np.asarray(self.codes[start:end])
+        if self.kind == "float16":
+            return codes.astype(np.float32)
+        if self.kind == "int8":
+            return codes.astype(np.float32) * self.scales[start:end, None]
+        subspaces = self.codebooks.shape[0]
+        return self.codebooks[np.arange(subspaces), codes].reshape(len(codes), -1)
+
+    def _block_scores(self, queries, start, end):
+        """Query-by-row scores for rows start:end, computed on the codes"""
+        if self.kind != "pq" or len(queries) > ADC_MAX_QUERIES:
+            return queries @ self.decode(start, end).T
+        # ADC: tables[q, j, c] = <query sub-vector j, centroid c of subspace j>
+        subspaces, centroids, width = self.codebooks.shape
+        tables = np.einsum("qjw,jcw->qjc", queries.reshape(len(queries), subspaces, width), self.codebooks)
+        codes = np.asarray(self.codes[start:end])
+        scores = np.zeros((len(queries), end - start), dtype=np.float32)
+        for j in range(subspaces):
+            scores += tables[:, j, codes[:, j]]
+        return scores
+
+    def search(self, queries, k=DEFAULT_K):
+        """Top-k by approximate cosine score: (review_ids, scores), best first"""
+        queries = normalize_rows(np.atleast_2d(queries))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(self), BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, len(self))
+            scores, columns = top_k(self._block_scores(queries, start, end), k)
+            best_scores, best_rows = merge_top_k(best_scores, best_rows, scores, columns + start, k)
+        order = np.argsort(-best_scores, axis=1)
+        rows = np.take_along_axis(best_rows, order, axis=1)
+        return np.asarray(self.review_ids)[rows], np.take_along_axis(best_scores, order, axis=1)
+
+def compare_stores(index, stores, queries, k=DEFAULT_K):
+    """Size, speed and recall@k of each store against exact float32 search on the index.
+
+    A store's hits are rescored with the float32 vectors, so recall measures
+    how often quantization ranks a clearly worse review into the top k.
+    """
+    start = time.perf_counter()
+    _, exact_scores = index.search(queries, k)
+    seconds = time.perf_counter() - start
+    full_bytes = index.vectors.shape[1] * 4
+    rows = [{"kind": "float32", "bytes_per_vector": full_bytes, "compression": 1.0, "recall_at_k": 1.0,
+             "queries_per_sec": len(queries) / seconds}]
+    for store in stores:
+        start = time.perf_counter()
+        approx_ids, _ = store.search(queries, k)
+        seconds = time.perf_counter() - start
+        rows.append({
+            "kind": store.kind if store.kind != "pq" else f"pq{store.meta['subspaces']}",
+            "bytes_per_vector": store.bytes_per_vector(),
+            "compression": full_bytes / store.bytes_per_vector(),
+            "recall_at_k": recall_at_k(exact_scores, index.rescore(queries, approx_ids), STORE_RECALL_EPSILON),
+            "queries_per_sec": len(queries) / seconds,
+        })
+    return rows
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize review embeddings and report the recall cost")
+    parser.add_argument("--index", default="review_vectors", help="float32 index built by review_vector_index.py")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS, help="Quantizations to build")
+    parser.add_argument("--pq-subspaces", type=int, default=DEFAULT_SUBSPACES,
+                        help="PQ sub-vectors (bytes) per embedding; must divide the dimension")
+    parser.add_argument("--reuse", action="store_true", help="Load existing stores instead of rebuilding them")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for PQ training and query sampling")
+    parser.add_argument("--queries", type=int, default=500, help="Stored vectors sampled as evaluation queries")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Neighbours per query")
+    parser.add_argument("--output", help="Save the comparison as JSON")
+    args = parser.parse_args()
+
+    index = VectorIndex(args.index)
+
+    print("=" * 70)
+    print("QUANTIZED EMBEDDING STORES")
+    print("=" * 70)
+    print(f"\n[LOAD] {args.index}: {len(index)} vectors, {index.meta['dim']}-dim float32")
+
+    stores = []
+    for kind in args.kinds:
+        path = f"{args.index}.{kind}"
+        start = time.perf_counter()
+        if args.reuse and os.path.exists(os.path.join(path, "store.json")):
+            store = QuantizedStore(path)
+        else:
+            store = build_store(path, index, kind, args.pq_subspaces, args.seed)
+        stores.append(store)
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        print(f"[FILE] {path}/ ({size / 2 ** 20:.1f} MB, {time.perf_counter() - start:.1f}s)")
+
+    rng = np.random.default_rng(args.seed)
+    sample = np.sort(rng.choice(len(index), min(args.queries, len(index)), replace=False))
+    rows = compare_stores(index, stores, np.asarray(index.vectors[sample]), args.k)
+
+    print(f"\nRECALL AGAINST FLOAT32 ({len(sample)} queries, top-{args.k}):")
+    for row in rows:
+        print(f"   {row['kind']:8s}: {row['bytes_per_vector']:5d} B/vector ({row['compression']:5.1f}x)  "
+              f"recall@{args.k} {row['recall_at_k']:.3f}  {row['queries_per_sec']:8,.0f} queries/sec")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n[FILE] Comparison saved to: {args.output}")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,262 @@
+"""
+Scale-test mode for the Frontier review generators
+The normal datasets are balanced and uniform, which hides the hot spots the
+Postgres indexes see in production. A scale-test run skews them instead:
+locations follow a Zipf distribution, review dates burst after simulated
+outages, and a heavy-tailed share of reviews run long. A manifest records
+the expected selectivity of every filter value next to the row counts the
+run actually produced, so query plans can be checked against known
+cardinalities.
+"""
+
+import json
+import random
+import re
+from bisect import bisect
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+from review_core import DATE_WINDOW_DAYS, ReviewTables
+from review_copy import location_metadata
+
+# Skew settings for one run. seed fixes the Zipf ranking of locations, the
+# outage days and the extra review text, so every shard agrees on them.
+ScaleSkew = namedtuple("ScaleSkew", ["seed", "zipf_s", "outages", "burst_share", "burst_days", "text_tail"])
+
+SCALE_DEFAULTS = {
+    "zipf_s": 1.1,        # location rank exponent
+    "outages": 6,         # simulated outage events in the date window
+    "burst_share": 0.35,  # share of reviews dated in an outage burst
+    "burst_days": 14,     # length of each burst
+    "text_tail": 1.5,     # Pareto shape of appended sentences (smaller = longer tail)
+}
+
+# Longest run of sentences appended to one review
+MAX_EXTRA_SENTENCES = 200
+
+# Word-count ranges reported in the manifest; None means open-ended
+LENGTH_BUCKETS = [(0, 49), (50, 149), (150, 299), (300, 999), (1000, None)]
+
+CHURN_PATTERN = re.compile(r"Churn Risk: (\w+)")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def scale_skew(seed, **settings):
+    """ScaleSkew for a run; settings left as None take their SCALE_DEFAULTS value"""
+    return ScaleSkew(seed, **{name: default if settings.get(name) is None else settings[name]
+                              for name, default in SCALE_DEFAULTS.items()})
+
+def quota_shares(quotas, position=0):
+    """Expected {platform: fraction} from a quota table keyed by cells with the platform at `position`"""
+    shares = Counter()
+    for cell, count in quotas.items():
+        shares[cell[position]] += count
+    total = sum(shares.values()) or 1
+    return {platform: count / total for platform, count in shares.items()}
+
+# ============================================================================
+# SKEWED DISTRIBUTIONS
+# ============================================================================
+
+def location_weights(skew, locations):
+    """Return {location: probability} with Zipf weights over a seeded ranking of all locations"""
+    ranked = [location for names in locations.values() for location in names]
+    random.Random(f"{skew.seed}:locations").shuffle(ranked)
+    weights = [1 / rank ** skew.zipf_s for rank in range(1, len(ranked) + 1)]
+    total = sum(weights)
+    return {location: weight / total for location, weight in zip(ranked, weights)}
+
+def outage_starts(skew):
+    """Day offsets (0 = oldest day in the window) on which outages begin"""
+    rng = random.Random(f"{skew.seed}:outages")
+    return sorted(rng.sample(range(DATE_WINDOW_DAYS - skew.burst_days), skew.outages))
+
+def day_weights(skew):
+    """Probability per day offset: a uniform base plus one burst per outage.
+
+    Each burst starts on the outage day and halves every quarter of
+    burst_days, the way complaints pile up right after an incident.
+    """
+    starts = outage_starts(skew)
+    share = skew.burst_share if starts else 0.0
+    weights = [(1 - share) / DATE_WINDOW_DAYS] * DATE_WINDOW_DAYS
+    half_life = max(1.0, skew.burst_days / 4)
+    shape = [0.5 ** (day / half_life) for day in range(skew.burst_days)]
+    for start in starts:
+        for day, weight in enumerate(shape):
+            weights[start + day] += share / len(starts) * weight / sum(shape)
+    return weights
+
+class SkewedTables(ReviewTables):
+    """ReviewTables that draw locations and dates from the scale-test distributions"""
+
+    __slots__ = ("skew", "location_list", "location_cum", "day_cum")
+
+    def __init__(self, area_weights, first_names, reference, skew, **tables):
+        super().__init__(area_weights, first_names, reference, **tables)
+        self.skew = skew
+        weights = location_weights(skew, self.locations)
+        self.location_list = list(weights)
+        self.location_cum = _cumulative(weights.values())
+        self.day_cum = _cumulative(day_weights(skew))
+
+    def date(self, platform, rng=random):
+        offset = bisect(self.day_cum, rng.random() * self.day_cum[-1], 0, DATE_WINDOW_DAYS - 1)
+        return self.dates[platform][offset]
+
+    def location(self, rng=random):
+        return self.location_list[bisect(self.location_cum, rng.random() * self.location_cum[-1],
+                                         0, len(self.location_list) - 1)]
+
+def _cumulative(weights):
+    total = 0.0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+# ============================================================================
+# HEAVY-TAILED TEXT
+# ============================================================================
+
+def sentence_pool(corpus):
+    """Every placeholder-free sentence in a {list name: [template, ...]} corpus"""
+    sentences = []
+    for texts in corpus.values():
+        for text in texts:
+            sentences.extend(s for s in SENTENCE_END.split(text.strip()) if s and "{" not in s)
+    return sorted(set(sentences))
+
+def lengthen_texts(reviews, skew, sentences):
+    """Append a Pareto-distributed number of extra sentences to each review.
+
+    int(paretovariate(alpha)) - 1 extra sentences means P(at least k) is
+    (k + 1) ** -alpha: most reviews are untouched and a few run to thousands
+    of words. Drawn from the skew's own RNG in stream order, so the result
+    is the same however the reviews were sharded.
+    """
+    rng = random.Random(f"{skew.seed}:text")
+    for review in reviews:
+        extra = min(int(rng.paretovariate(skew.text_tail)) - 1, MAX_EXTRA_SENTENCES)
+        if extra > 0:
+            review["review_text"] += " " + " ".join(rng.choice(sentences) for _ in range(extra))
+        yield review
+
+# ============================================================================
+# SELECTIVITY MANIFEST
+# ============================================================================
+
+class ScaleManifest:
+    """Counts the filterable values of generated reviews and writes the manifest"""
+
+    __slots__ = ("date_formats", "rows", "platforms", "locations", "days", "churn", "_parsed")
+
+    def __init__(self, date_formats):
+        self.date_formats = date_formats
+        self.rows = 0
+        self.platforms = Counter()
+        self.locations = Counter()
+        self.days = Counter()
+        self.churn = Counter()
+        self._parsed = {}
+
+    def add(self, review):
+        self.rows += 1
+        self.platforms[review["platform"]] += 1
+        self.locations[review["location"]] += 1
+        key = (review["platform"], review["date"])
+        day = self._parsed.get(key)
+        if day is None:
+            day = self._parsed[key] = datetime.strptime(key[1], self.date_formats[key[0]]).date()
+        self.days[day] += 1
+        match = CHURN_PATTERN.search(review["review_text"])
+        if match:
+            self.churn[match.group(1).lower()] += 1
+
+    def count(self, reviews):
+        """Pass reviews through, counting each one"""
+        for review in reviews:
+            self.add(review)
+            yield review
+
+    def _entries(self, expected, observed, order=None):
+        """{value: {expected, rows, selectivity}} for one filter; expected is None when unknown"""
+        rows = self.rows or 1
+        entries = {}
+        for value in order or sorted(set(expected or ()) | set(observed), key=str):
+            entries["(null)" if value is None else str(value)] = {
+                "expected": expected.get(value, 0.0) if expected is not None else None,
+                "rows": observed.get(value, 0),
+                "selectivity": observed.get(value, 0) / rows,
+            }
+        return entries
+
+    def build(self, skew, reference, locations, platform_shares, churn_shares=None, stats=None):
+        """Return the manifest dict.
+
+        platform_shares and churn_shares are the generator's expected
+        {value: fraction}; stats is the run's ReviewStats, for review lengths.
+        """
+        start = reference - timedelta(days=DATE_WINDOW_DAYS)
+        day_probs = day_weights(skew)
+        location_probs = location_weights(skew, locations)
+        area_types = {location: area for area, names in locations.items() for location in names}
+
+        # Location-derived columns, as the metadata trigger fills them
+        expected_meta = {"city": Counter(), "state": Counter(), "region": Counter(), "area_type": Counter()}
+        observed_meta = {"city": Counter(), "state": Counter(), "region": Counter(), "area_type": Counter()}
+        for location in set(location_probs) | set(self.locations):
+            city, state, region, area_type = location_metadata(location, area_types.get(location))
+            for column, value in zip(("city", "state", "region", "area_type"), (city, state, region, area_type)):
+                expected_meta[column][value] += location_probs.get(location, 0.0)
+                observed_meta[column][value] += self.locations.get(location, 0)
+
+        expected_months = Counter()
+        for offset, probability in enumerate(day_probs):
+            expected_months[(start + timedelta(days=offset)).strftime("%Y-%m")] += probability
+        observed_months = Counter()
+        for day, count in self.days.items():
+            observed_months[day.strftime("%Y-%m")] += count
+
+        outages = []
+        for offset in outage_starts(skew):
+            first = start + timedelta(days=offset)
+            last = first + timedelta(days=skew.burst_days - 1)
+            rows = sum(count for day, count in self.days.items() if first <= day <= last)
+            outages.append({"start": first.isoformat(), "end": last.isoformat(),
+                            "expected": sum(day_probs[offset:offset + skew.burst_days]),
+                            "rows": rows, "selectivity": rows / (self.rows or 1)})
+
+        filters = {
+            "platform": self._entries(platform_shares, self.platforms),
+            "location": self._entries(location_probs, self.locations),
+            "review_month": self._entries(expected_months, observed_months),
+        }
+        for column in ("city", "state", "region", "area_type"):
+            filters[column] = self._entries(expected_meta[column], observed_meta[column])
+        if churn_shares is not None:
+            filters["churn_risk"] = self._entries(churn_shares, self.churn)
+        if stats is not None:
+            buckets = [f"{low}-{high}" if high is not None else f"{low}+" for low, high in LENGTH_BUCKETS]
+            lengths = Counter()
+            for words, count in stats.word_counts.items():
+                for bucket, (low, high) in zip(buckets, LENGTH_BUCKETS):
+                    if words >= low and (high is None or words <= high):
+                        lengths[bucket] += count
+                        break
+            filters["review_length_words"] = self._entries(None, lengths, buckets)
+
+        return {
+            "rows": self.rows,
+            "reference_date": reference.isoformat(),
+            "date_window": [start.isoformat(), (reference - timedelta(days=1)).isoformat()],
+            "skew": skew._asdict(),
+            "outages": outages,
+            "filters": filters,
+        }
+
+    def save(self, output_file, *args, **kwargs):
+        manifest = self.build(*args, **kwargs)
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
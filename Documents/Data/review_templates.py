@@ -0,0 +1,73 @@
+"""
+Precompiled review templates
+Templates are parsed once into literal segments and placeholder slots, so
+rendering a review only samples the placeholders that template actually uses
+"""
+
+import random
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+class CompiledTemplate:
+    """A template split into literals and placeholder slots.
+
+    `values` maps each placeholder name to the list of strings it is drawn
+    from uniformly. Each distinct placeholder is sampled once per render, so a
+    placeholder that appears several times (e.g. {competitor}) gets the same
+    value everywhere in the review. Placeholders without values stay as text.
+    `pieces` is PLACEHOLDER_PATTERN.split(text) if the caller already has it.
+    """
+
+    __slots__ = ("text", "names", "domains", "slots", "parts")
+
+    def __init__(self, text, values, pieces=None):
+        self.text = text
+        self.names = []
+        self.slots = []
+        literals = [""]
+        if pieces is None:
+            pieces = PLACEHOLDER_PATTERN.split(text)
+        for idx, piece in enumerate(pieces):
+            if idx % 2 == 0:
+                literals[-1] += piece
+            elif piece in values:
+                if piece not in self.names:
+                    self.names.append(piece)
+                self.slots.append(self.names.index(piece))
+                literals.append("")
+            else:
+                literals[-1] += "{" + piece + "}"
+
+        self.domains = [values[name] for name in self.names]
+        # Literals at even positions; odd positions are filled on render
+        self.parts = [None] * (2 * len(literals) - 1)
+        self.parts[0::2] = literals
+
+    def sample(self, rng=random):
+        """Draw one value per distinct placeholder, in first-use order"""
+        return [rng.choice(domain) for domain in self.domains]
+
+    def fill(self, values):
+        """Render the template with previously sampled values"""
+        if not self.slots:
+            return self.parts[0]
+        parts = self.parts.copy()
+        parts[1::2] = [values[slot] for slot in self.slots]
+        return "".join(parts)
+
+    def render(self, rng=random):
+        """Sample this template's placeholders and return the finished text"""
+        return self.fill(self.sample(rng))
+
+def compile_templates(templates, values, tokens=None):
+    """Compile a list of template strings against a placeholder value registry.
+
+    tokens optionally maps template text to its pre-split pieces.
+    """
+    tokens = tokens or {}
+    return [CompiledTemplate(text, values, tokens.get(text)) for text in templates]
+
+def value_range(low, high):
+    """Placeholder values for a uniform integer between low and high inclusive"""
+    return [str(value) for value in range(low, high + 1)]
@@ -0,0 +1,353 @@
+"""
+Local triage classifier trained on generator labels
+A hashing-vectorizer softmax classifier for the labels the generators keep
+with --keep-labels: sentiment_category (platform-authentic) or
+problem_category (problem-focused). Words and word pairs are hashed into a
+fixed feature space, so there is no vocabulary to fit or ship, and scoring
+a batch is a handful of NumPy gathers and bincounts. The confidence of each
+prediction decides which reviews still need LLM extraction. Training holds
+out a share of the rows and reports accuracy, and the share of reviews
+and accuracy left above each confidence threshold.
+Requires numpy.
+
+    python generate_platform_authentic_reviews.py --format ndjson --keep-labels --output labeled.ndjson
+    python review_triage.py labeled.ndjson --train --label sentiment_category --model sentiment_triage.npz
+    python review_triage.py reviews.ndjson --model sentiment_triage.npz --output triage.ndjson
+
+The category preamble of problem-focused reviews ("Billing Issue (Primary)
+- Customer for N months:") names the label outright, so it is stripped
+before vectorizing; the model learns from the review itself.
+"""
+
+import argparse
+import hashlib
+import json
+import time
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+from review_annotations import PREAMBLE
+from review_core import read_reviews
+from review_hash_embedder import PAIR_STEP, _mix
+
+DEFAULT_FEATURES = 1 << 18
+DEFAULT_EPOCHS = 4
+DEFAULT_BATCH_SIZE = 2048
+DEFAULT_LEARNING_RATE = 0.5
+DEFAULT_HOLDOUT = 0.2
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_SEED = 0
+
+# Confidence thresholds reported after training
+REPORT_THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95, 0.99)
+
+# Distinct tokens remembered; the vocabulary is reset past this
+VOCABULARY_LIMIT = 500000
+
+# ============================================================================
+# HASHING VECTORIZER
+# ============================================================================
+
+def triage_text(review):
+    """Title and review text, without the problem-focused category preamble"""
+    text = review.get("review_text") or ""
+    preamble = PREAMBLE.match(text)
+    if preamble:
+        text = text[preamble.end():]
+    title = review.get("title")
+    return f"{title}\n{text}" if title else text
+
+class HashingVectorizer:
+    """Texts -> sparse word and word-pair features in [0, n_features).
+
+    Every distinct token is hashed once (keyed BLAKE2b) and remembered, and
+    word pairs are hashed from those in NumPy as in HashedNgramEmbedder. A
+    batch comes back in coordinate form: the row and feature of every entry
+    plus one scale per row, 1 / sqrt(number of entries), so that long and
+    short reviews score on the same footing.
+    """
+
+    __slots__ = ("n_features", "seed", "key", "vocab", "hashes")
+
+    def __init__(self, n_features=DEFAULT_FEATURES, seed=DEFAULT_SEED):
+        self.n_features = n_features
+        self.seed = seed
+        self.key = f"triage:{seed}".encode("utf-8")
+        self._reset()
+
+    def _reset(self):
+        self.vocab = {}
+        self.hashes = np.zeros(1024, dtype=np.uint64)
+
+    def _add_token(self, token):
+        row = len(self.vocab)
+        if row == self.hashes.size:
+            self.hashes = np.concatenate([self.hashes, np.zeros(row, dtype=np.uint64)])
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8, key=self.key).digest()
+        self.hashes[row] = int.from_bytes(digest, "little")
+        self.vocab[token] = row
+        return row
+
+    def transform(self, texts):
+        """Return (rows, features, scales) for a list of texts"""
+        if len(self.vocab) > VOCABULARY_LIMIT:
+            self._reset()
+        vocab = self.vocab
+        add = self._add_token
+        ids = []
+        sizes = []
+        for text in texts:
+            # Whitespace tokens: punctuation stays attached, which the hashed
+            # features absorb, and str.split is several times faster than \w+
+            tokens = unicodedata.normalize("NFKC", text).casefold().split()
+            ids.extend([vocab[token] if token in vocab else add(token) for token in tokens])
+            sizes.append(len(tokens))
+        ids = np.array(ids, dtype=np.int64)
+        sizes = np.array(sizes, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), sizes)
+
+        hashes = self.hashes[ids]
+        pairs = np.flatnonzero(rows[1:] == rows[:-1])
+        pair_hashes = _mix(hashes[pairs] * PAIR_STEP + hashes[pairs + 1])
+        modulus = np.uint64(self.n_features)
+        features = np.concatenate([hashes % modulus, pair_hashes % modulus]).astype(np.int64)
+        rows = np.concatenate([rows, rows[pairs]])
+        scales = 1.0 / np.sqrt(np.maximum(np.bincount(rows, minlength=len(texts)), 1))
+        return rows, features, scales.astype(np.float32)
+
+# ============================================================================
+# LINEAR CLASSIFIER
+# ============================================================================
+
+def softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+class TriageModel:
+    """Softmax regression over hashed features, trained with mini-batch AdaGrad.
+
+    weights is (classes, n_features), class-major so each class's weights
+    for a batch are one contiguous gather.
+    """
+
+    __slots__ = ("label", "classes", "vectorizer", "weights", "bias", "squares", "bias_squares")
+
+    def __init__(self, label, classes, n_features=DEFAULT_FEATURES, seed=DEFAULT_SEED):
+        self.label = label
+        self.classes = list(classes)
+        self.vectorizer = HashingVectorizer(n_features, seed)
+        self.weights = np.zeros((len(self.classes), n_features), dtype=np.float32)
+        self.bias = np.zeros(len(self.classes), dtype=np.float32)
+        self.squares = None
+        self.bias_squares = None
+
+    def _scores(self, rows, features, scales, n):
+        scores = np.empty((n, len(self.classes)), dtype=np.float32)
+        for c, weights in enumerate(self.weights):
+            scores[:, c] = np.bincount(rows, weights=weights[features], minlength=n)
+        scores *= scales[:, None]
+        scores += self.bias
+        return scores
+
+    def predict_proba(self, texts):
+        """(len(texts), classes) matrix of class probabilities"""
+        rows, features, scales = self.vectorizer.transform(texts)
+        return softmax(self._scores(rows, features, scales, len(texts)))
+
+    def predict(self, texts):
+        """Return (class indices, confidences) for a batch of texts"""
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return best, probabilities[np.arange(len(texts)), best]
+
+    def fit(self, texts, targets, epochs=DEFAULT_EPOCHS, batch_size=DEFAULT_BATCH_SIZE,
+            learning_rate=DEFAULT_LEARNING_RATE, seed=DEFAULT_SEED):
+        """Train on texts and class indices, a shuffled pass over the data per epoch"""
+        targets = np.asarray(targets, dtype=np.int64)
+        if self.squares is None:
+            self.squares = np.zeros_like(self.weights)
+            self.bias_squares = np.zeros_like(self.bias)
+        rng = np.random.default_rng(seed)
+        for _ in range(epochs):
+            order = rng.permutation(len(texts))
+            for start in range(0, len(texts), batch_size):
+                batch = order[start:start + batch_size]
+                self._step([texts[i] for i in batch], targets[batch], learning_rate)
+        return self
+
+    def _step(self, texts, targets, learning_rate):
+        n = len(texts)
+        rows, features, scales = self.vectorizer.transform(texts)
+        # Cross-entropy gradient with respect to the scores
+        gradient = softmax(self._scores(rows, features, scales, n))
+        gradient[np.arange(n), targets] -= 1.0
+        gradient /= n
+
+        unique, inverse = np.unique(features, return_inverse=True)
+        entry_scales = scales[rows]
+        for c in range(len(self.classes)):
+            step = np.bincount(inverse, weights=entry_scales * gradient[rows, c], minlength=unique.size)
+            squares = self.squares[c, unique] + step * step
+            self.squares[c, unique] = squares
+            self.weights[c, unique] -= learning_rate * step / (np.sqrt(squares) + 1e-8)
+        step = gradient.sum(axis=0)
+        self.bias_squares += step * step
+        self.bias -= learning_rate * step / (np.sqrt(self.bias_squares) + 1e-8)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.savez(f, weights=self.weights, bias=self.bias, classes=np.array(self.classes),
+                     label=np.array(self.label), n_features=self.vectorizer.n_features,
+                     seed=self.vectorizer.seed)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            model = cls(str(data["label"]), data["classes"].tolist(), int(data["n_features"]), int(data["seed"]))
+            model.weights = data["weights"]
+            model.bias = data["bias"]
+        return model
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def holdout_mask(count, share=DEFAULT_HOLDOUT, seed=DEFAULT_SEED):
+    """Boolean mask of the rows held out for evaluation"""
+    return np.random.default_rng(seed + 1).random(count) < share
+
+def evaluate(model, texts, targets, batch_size=DEFAULT_BATCH_SIZE * 4):
+    """Accuracy, per-class accuracy and the confidence/coverage trade-off on labeled texts"""
+    targets = np.asarray(targets, dtype=np.int64)
+    predicted = np.empty(len(texts), dtype=np.int64)
+    confidence = np.empty(len(texts), dtype=np.float32)
+    for start in range(0, len(texts), batch_size):
+        predicted[start:start + batch_size], confidence[start:start + batch_size] = \
+            model.predict(texts[start:start + batch_size])
+    correct = predicted == targets
+    thresholds = []
+    for threshold in REPORT_THRESHOLDS:
+        kept = confidence >= threshold
+        thresholds.append({"threshold": threshold, "local_share": float(kept.mean()) if kept.size else 0.0,
+                           "local_accuracy": float(correct[kept].mean()) if kept.any() else None})
+    return {
+        "rows": len(texts),
+        "accuracy": float(correct.mean()) if correct.size else None,
+        "class_accuracy": {name: float(correct[targets == c].mean())
+                           for c, name in enumerate(model.classes) if (targets == c).any()},
+        "thresholds": thresholds,
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or run the local review triage classifier")
+    parser.add_argument("inputs", nargs="+", help="NDJSON or JSON review files")
+    parser.add_argument("--model", required=True, help="Model file (.npz) to write with --train, else to read")
+    parser.add_argument("--train", action="store_true", help="Train on labeled reviews and report held-out accuracy")
+    parser.add_argument("--label", default="sentiment_category",
+                        help="Label field to train on (sentiment_category, problem_category, rating, ...)")
+    parser.add_argument("--features", type=int, default=DEFAULT_FEATURES, help="Hashed feature space size")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE)
+    parser.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT, help="Share of rows held out")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Reviews scored below this confidence are marked needs_llm")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE * 4, help="Reviews scored per batch")
+    parser.add_argument("--output", help="When scoring, write {review_id, label, confidence, needs_llm} as NDJSON")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("REVIEW TRIAGE CLASSIFIER")
+    print("=" * 70)
+
+    if args.train:
+        texts, labels = [], []
+        for input_file in args.inputs:
+            for review in read_reviews(input_file):
+                if review.get(args.label) is not None:
+                    texts.append(triage_text(review))
+                    labels.append(str(review[args.label]))
+        if not texts:
+            parser.error(f"no reviews carry a {args.label!r} label (generate them with --keep-labels)")
+        classes = sorted(set(labels))
+        targets = np.array([classes.index(label) for label in labels], dtype=np.int64)
+        held = holdout_mask(len(texts), args.holdout, args.seed)
+        train_rows = np.flatnonzero(~held)
+        test_rows = np.flatnonzero(held)
+
+        model = TriageModel(args.label, classes, args.features, args.seed)
+        start = time.perf_counter()
+        model.fit([texts[i] for i in train_rows], targets[train_rows], args.epochs, DEFAULT_BATCH_SIZE,
+                  args.learning_rate, args.seed)
+        train_seconds = time.perf_counter() - start
+        model.save(args.model)
+        start = time.perf_counter()
+        report = evaluate(model, [texts[i] for i in test_rows], targets[test_rows])
+        score_seconds = time.perf_counter() - start
+
+        print(f"\n[OK] Trained on {train_rows.size} reviews ({len(classes)} {args.label} classes) "
+              f"in {train_seconds:.1f}s")
+        print(f"[FILE] Model saved to: {args.model}")
+        print(f"[STATS] Held-out accuracy {report['accuracy']:.1%} on {test_rows.size} reviews, "
+              f"scored at {test_rows.size / score_seconds if score_seconds else 0:,.0f} reviews/sec")
+        print("\nHELD-OUT ACCURACY BY CLASS:")
+        for name, accuracy in report["class_accuracy"].items():
+            print(f"   {name:20s} {accuracy:7.1%}")
+        print("\nCONFIDENCE TRIAGE (held out):")
+        print(f"   {'threshold':>9s}  {'local':>7s}  {'accuracy':>8s}  {'to LLM':>7s}")
+        for row in report["thresholds"]:
+            accuracy = f"{row['local_accuracy']:8.1%}" if row["local_accuracy"] is not None else f"{'-':>8s}"
+            print(f"   {row['threshold']:9.2f}  {row['local_share']:7.1%}  {accuracy}  {1 - row['local_share']:7.1%}")
+    else:
+        model = TriageModel.load(args.model)
+        out = open(args.output, "w", encoding="utf-8") if args.output else None
+        predicted = Counter()
+        rows = needs_llm = 0
+        start = time.perf_counter()
+
+        def score(batch):
+            classes, confidences = model.predict([triage_text(review) for review in batch])
+            routed = 0
+            for review, c, confidence in zip(batch, classes.tolist(), confidences.tolist()):
+                predicted[model.classes[c]] += 1
+                routed += confidence < args.threshold
+                if out:
+                    out.write(json.dumps({"review_id": review.get("review_id"), model.label: model.classes[c],
+                                          "confidence": round(confidence, 4),
+                                          "needs_llm": confidence < args.threshold}))
+                    out.write("\n")
+            return routed
+
+        batch = []
+        for input_file in args.inputs:
+            for review in read_reviews(input_file):
+                batch.append(review)
+                if len(batch) >= args.batch_size:
+                    needs_llm += score(batch)
+                    rows += len(batch)
+                    batch = []
+        if batch:
+            needs_llm += score(batch)
+            rows += len(batch)
+        if out:
+            out.close()
+        seconds = time.perf_counter() - start
+
+        print(f"\n[OK] Scored {rows} reviews for {model.label} in {seconds:.2f}s "
+              f"({rows / seconds * 60 if seconds else 0:,.0f} reviews/min)")
+        if args.output:
+            print(f"[FILE] Results saved to: {args.output}")
+        print(f"[STATS] {needs_llm} below confidence {args.threshold} need the LLM "
+              f"({needs_llm / rows if rows else 0:.1%})")
+        print("\nPREDICTED:")
+        for name, count in predicted.most_common():
+            print(f"   {name:20s} {count:8d}")
+    print(f"\n{'=' * 70}\n")
@@ -0,0 +1,387 @@
+"""
+Memory-mapped vector index over Frontier review embeddings
+An in-process counterpart to idx_processed_gte_embedding_hnsw for offline
+analysis and for reproducing the dashboard's "similar reviews" queries.
+Embeddings are stored unit-normalized as a float32 .npy matrix that is
+memory-mapped, not loaded, next to the review_id of every row. Search is
+cosine top-k, either exact (batched matrix products over the whole matrix)
+or IVF: a spherical k-means coarse quantizer whose lists are stored
+contiguously, of which the nprobe nearest are scanned per query.
+Requires numpy.
+
+    python review_vector_index.py embeddings.ndjson --index review_vectors --lists 256
+    python review_vector_index.py reviews.ndjson --local --index review_vectors   # embed offline first
+    python review_vector_index.py --index review_vectors --queries 1000 --nprobe 1 4 16
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from review_core import read_reviews
+
+INDEX_FORMAT = 1
+
+# Rows per block in exact search and in k-means assignment
+BLOCK_ROWS = 65536
+
+# Reviews embedded per batch with --local, and rows buffered while building
+EMBED_BATCH = 256
+WRITE_BATCH = 8192
+
+# k-means training: sample size per list, iterations
+TRAIN_PER_LIST = 64
+KMEANS_ITERATIONS = 10
+
+DEFAULT_K = 10
+
+# Score slack for recall: float32 dot products of the same pair can differ
+# in the last bits depending on how the matrix product was blocked
+RECALL_EPSILON = 1e-5
+DEFAULT_NPROBE = [1, 2, 4, 8, 16]
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def parse_vector(value):
+    """A vector from a pgvector literal '[0.1,...]' or a JSON list"""
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+def iter_embeddings(input_files, embedder=None):
+    """Yield (review_ids, vectors) batches from embedding NDJSON, or from review files via embedder"""
+    for input_file in input_files:
+        ids = []
+        items = []
+        for record in read_reviews(input_file):
+            ids.append(record["review_id"])
+            items.append(record["review_text"] if embedder else parse_vector(record["gte_embedding"]))
+            if len(ids) >= (EMBED_BATCH if embedder else WRITE_BATCH):
+                yield ids, embedder.embed_batch(items) if embedder else np.vstack(items)
+                ids = []
+                items = []
+        if ids:
+            yield ids, embedder.embed_batch(items) if embedder else np.vstack(items)
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+# ============================================================================
+# TOP-K HELPERS
+# ============================================================================
+
+def top_k(scores, k):
+    """(scores, columns) of the k best entries per row, unordered"""
+    if scores.shape[1] <= k:
+        return scores, np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, columns, axis=1), columns
+
+def merge_top_k(best_scores, best_rows, scores, rows, k):
+    """Fold candidate (scores, rows) into the running per-query best k"""
+    scores = np.concatenate([best_scores, scores], axis=1)
+    rows = np.concatenate([best_rows, rows], axis=1)
+    scores, columns = top_k(scores, k)
+    return scores, np.take_along_axis(rows, columns, axis=1)
+
+def recall_at_k(exact_scores, approx_scores, epsilon=RECALL_EPSILON):
+    """Mean fraction of each query's top-k slots filled by a hit as good as the exact k-th best.
+
+    Scores are compared rather than review_ids: identical texts tie, and any
+    of the tied rows is an equally right answer. approx_scores must be the
+    exact scores of the approximate hits (-inf for empty slots).
+    """
+    valid = np.isfinite(exact_scores)
+    needed = valid.sum(axis=1)
+    kth = np.where(valid, exact_scores, np.inf).min(axis=1)
+    found = (approx_scores >= (kth - epsilon)[:, None]).sum(axis=1)
+    return float(np.mean(np.minimum(found, needed) / np.maximum(needed, 1)))
+
+# ============================================================================
+# COARSE QUANTIZER
+# ============================================================================
+
+def train_kmeans(vectors, lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """Spherical k-means: unit centroids maximizing cosine similarity to their members"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        counts = np.bincount(assignments, minlength=lists)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(vectors[np.argsort(assignments, kind="stable")], starts[filled])
+        empty = np.flatnonzero(counts == 0)
+        # Re-seed empty lists from random training vectors
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+def assign_lists(vectors, centroids):
+    """Nearest centroid per row, computed a block at a time"""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        assignments[start:start + BLOCK_ROWS] = np.argmax(vectors[start:start + BLOCK_ROWS] @ centroids.T, axis=1)
+    return assignments
+
+# ============================================================================
+# BUILDING
+# ============================================================================
+
+def build_index(path, batches, lists=0, seed=0):
+    """Write an index directory from (review_ids, vectors) batches; return its VectorIndex.
+
+    Vectors are first appended to a scratch file, so memory stays flat at
+    any size. With lists > 0 a k-means quantizer is trained on a sample and
+    rows are rewritten grouped by list, each list one contiguous slice.
+    """
+    os.makedirs(path, exist_ok=True)
+    scratch = os.path.join(path, "vectors.scratch")
+    ids = []
+    dim = None
+    with open(scratch, "wb") as f:
+        for batch_ids, vectors in batches:
+            vectors = normalize_rows(vectors)
+            if dim is None:
+                dim = vectors.shape[1]
+            elif vectors.shape[1] != dim:
+                raise ValueError(f"Mixed embedding dimensions: {dim} and {vectors.shape[1]}")
+            f.write(vectors.tobytes())
+            ids.extend(batch_ids)
+    if not ids:
+        os.remove(scratch)
+        raise ValueError("No embeddings to index")
+    count = len(ids)
+    raw = np.memmap(scratch, dtype=np.float32, mode="r", shape=(count, dim))
+    ids = np.array(ids, dtype=np.int64)
+
+    lists = min(lists, count)
+    offsets = np.array([0, count], dtype=np.int64)
+    if lists:
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(count, min(count, lists * TRAIN_PER_LIST), replace=False))
+        centroids = train_kmeans(np.asarray(raw[sample]), lists, seed=seed)
+        assignments = assign_lists(raw, centroids)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=lists))]).astype(np.int64)
+        np.save(os.path.join(path, "centroids.npy"), centroids)
+    else:
+        order = np.arange(count)
+        if os.path.exists(os.path.join(path, "centroids.npy")):
+            os.remove(os.path.join(path, "centroids.npy"))
+
+    matrix = np.lib.format.open_memmap(os.path.join(path, "vectors.npy"), mode="w+",
+                                       dtype=np.float32, shape=(count, dim))
+    for start in range(0, count, BLOCK_ROWS):
+        matrix[start:start + BLOCK_ROWS] = raw[order[start:start + BLOCK_ROWS]]
+    matrix.flush()
+    del matrix, raw
+    os.remove(scratch)
+    np.save(os.path.join(path, "review_ids.npy"), ids[order])
+    np.save(os.path.join(path, "list_offsets.npy"), offsets)
+    with open(os.path.join(path, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": INDEX_FORMAT, "count": count, "dim": dim, "lists": lists, "seed": seed}, f, indent=2)
+    return VectorIndex(path)
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+class VectorIndex:
+    """A built index directory, memory-mapped read-only"""
+
+    __slots__ = ("path", "meta", "vectors", "review_ids", "offsets", "centroids", "_positions")
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{path}: unsupported index format {self.meta.get('format')}")
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.review_ids = np.load(os.path.join(path, "review_ids.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(path, "list_offsets.npy"))
+        self.centroids = np.load(os.path.join(path, "centroids.npy")) if self.meta["lists"] else None
+        self._positions = None
+
+    def __len__(self):
+        return len(self.review_ids)
+
+    def position(self, review_id):
+        """Row of a review_id, or None"""
+        if self._positions is None:
+            self._positions = np.argsort(self.review_ids, kind="stable")
+        at = np.searchsorted(self.review_ids, review_id, sorter=self._positions)
+        if at < len(self._positions) and self.review_ids[self._positions[at]] == review_id:
+            return int(self._positions[at])
+        return None
+
+    def rows(self, review_ids):
+        """Rows of an array of stored review_ids; -1 stays -1"""
+        if self._positions is None:
+            self._positions = np.argsort(self.review_ids, kind="stable")
+        review_ids = np.asarray(review_ids)
+        at = np.searchsorted(self.review_ids, review_ids, sorter=self._positions)
+        return np.where(review_ids >= 0, self._positions[np.minimum(at, len(self._positions) - 1)], -1)
+
+    def rescore(self, queries, review_ids):
+        """Exact cosine scores of (len(queries), k) review_ids, -inf where the review_id is -1"""
+        queries = normalize_rows(np.atleast_2d(queries))
+        rows = self.rows(review_ids)
+        vectors = np.asarray(self.vectors[np.maximum(rows, 0).ravel()]).reshape(*rows.shape, -1)
+        scores = np.einsum("qd,qkd->qk", queries, vectors)
+        scores[rows < 0] = -np.inf
+        return scores
+
+    def get(self, review_id):
+        """Stored (unit) vector of a review, or None"""
+        row = self.position(review_id)
+        return None if row is None else np.array(self.vectors[row])
+
+    def search(self, queries, k=DEFAULT_K, nprobe=None):
+        """Top-k cosine matches per query: (review_ids, scores), each (len(queries), k), best first.
+
+        nprobe=None searches exactly; otherwise the nprobe nearest IVF lists
+        are scanned (the index must have been built with lists). Slots past
+        the number of candidates hold review_id -1 and score -inf.
+        """
+        queries = normalize_rows(np.atleast_2d(queries))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        if nprobe is None:
+            for start in range(0, len(self), BLOCK_ROWS):
+                scores, columns = top_k(queries @ self.vectors[start:start + BLOCK_ROWS].T, k)
+                best_scores, best_rows = merge_top_k(best_scores, best_rows, scores, columns + start, k)
+        else:
+            if self.centroids is None:
+                raise ValueError(f"{self.path} has no IVF lists; rebuild with --lists")
+            _, probes = top_k(queries @ self.centroids.T, min(nprobe, len(self.centroids)))
+            best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+            best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+            for list_id in np.unique(probes):
+                start, end = self.offsets[list_id], self.offsets[list_id + 1]
+                if start == end:
+                    continue
+                members = np.flatnonzero((probes == list_id).any(axis=1))
+                scores, columns = top_k(queries[members] @ self.vectors[start:end].T, k)
+                best_scores[members], best_rows[members] = merge_top_k(
+                    best_scores[members], best_rows[members], scores, columns + start, k)
+        # Order each query's matches best first and pad to k
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        if best_scores.shape[1] < k:
+            pad = k - best_scores.shape[1]
+            best_scores = np.pad(best_scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+            best_rows = np.pad(best_rows, ((0, 0), (0, pad)), constant_values=-1)
+        review_ids = np.where(best_rows >= 0, np.asarray(self.review_ids)[np.maximum(best_rows, 0)], -1)
+        return review_ids, best_scores
+
+    def similar(self, review_id, k=DEFAULT_K, nprobe=None):
+        """[(review_id, score)] of the k reviews most similar to a stored one, itself excluded"""
+        vector = self.get(review_id)
+        if vector is None:
+            raise KeyError(review_id)
+        review_ids, scores = self.search(vector, k + 1, nprobe)
+        return [(int(found), float(score)) for found, score in zip(review_ids[0], scores[0])
+                if found != review_id and found >= 0][:k]
+
+def evaluate(index, queries, k=DEFAULT_K, nprobes=DEFAULT_NPROBE):
+    """Time exact and IVF search on the same queries and report recall@k against exact.
+
+    all_lists_recall probes every list, which must find hits as good as
+    exact search (1.0) or the recall measure itself is off.
+    """
+    start = time.perf_counter()
+    _, exact_scores = index.search(queries, k)
+    exact_seconds = time.perf_counter() - start
+    report = {"queries": len(queries), "k": k, "vectors": len(index),
+              "exact": {"seconds": exact_seconds, "queries_per_sec": len(queries) / exact_seconds}, "ivf": []}
+    if index.centroids is None:
+        return report
+    sizes = np.diff(index.offsets)
+    report["all_lists_recall"] = recall_at_k(exact_scores, index.search(queries, k, len(index.centroids))[1])
+    for nprobe in nprobes:
+        start = time.perf_counter()
+        _, approx_scores = index.search(queries, k, nprobe)
+        seconds = time.perf_counter() - start
+        # Share of the matrix an average query scans, from the lists it probes
+        _, probes = top_k(normalize_rows(queries) @ index.centroids.T, min(nprobe, len(index.centroids)))
+        report["ivf"].append({
+            "nprobe": nprobe,
+            # IVF scores are exact dot products, so they can be compared directly
+            "recall_at_k": recall_at_k(exact_scores, approx_scores),
+            "seconds": seconds,
+            "queries_per_sec": len(queries) / seconds,
+            "scanned_share": float(sizes[probes].sum(axis=1).mean() / len(index)),
+        })
+    return report
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and evaluate a memory-mapped review embedding index")
+    parser.add_argument("inputs", nargs="*",
+                        help="Embedding NDJSON (review_id, gte_embedding) to index; omit to evaluate an existing index")
+    parser.add_argument("--index", default="review_vectors", help="Index directory")
+    parser.add_argument("--lists", type=int, default=0,
+                        help="IVF lists (0 = exact search only; around 4 * sqrt(rows) is a good start)")
+    parser.add_argument("--local", action="store_true",
+                        help="Inputs are review files; embed them with the local hashed n-gram stand-in")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for k-means and query sampling")
+    parser.add_argument("--queries", type=int, default=1000, help="Stored vectors sampled as evaluation queries")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="Neighbours per query")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=DEFAULT_NPROBE, help="IVF lists probed per query")
+    parser.add_argument("--output", help="Save the evaluation report as JSON")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("REVIEW VECTOR INDEX")
+    print("=" * 70)
+
+    if args.inputs:
+        embedder = None
+        if args.local:
+            from review_hash_embedder import HashedNgramEmbedder
+            embedder = HashedNgramEmbedder()
+        start = time.perf_counter()
+        index = build_index(args.index, iter_embeddings(args.inputs, embedder), args.lists, args.seed)
+        print(f"\n[OK] Indexed {len(index)} vectors ({index.meta['dim']}-dim, "
+              f"{index.meta['lists']} IVF lists) in {time.perf_counter() - start:.1f}s")
+    else:
+        index = VectorIndex(args.index)
+        print(f"\n[LOAD] {len(index)} vectors ({index.meta['dim']}-dim, {index.meta['lists']} IVF lists)")
+    size = sum(os.path.getsize(os.path.join(args.index, name)) for name in os.listdir(args.index))
+    print(f"[FILE] Index: {args.index}/ ({size / 2 ** 20:.1f} MB)")
+
+    rng = np.random.default_rng(args.seed)
+    sample = np.sort(rng.choice(len(index), min(args.queries, len(index)), replace=False))
+    report = evaluate(index, np.asarray(index.vectors[sample]), args.k, args.nprobe)
+
+    print(f"\nSEARCH ({report['queries']} queries, top-{args.k}):")
+    print(f"   {'exact':12s}: {report['exact']['queries_per_sec']:10,.0f} queries/sec  recall@{args.k} 1.000")
+    for run in report["ivf"]:
+        print(f"   {'nprobe ' + str(run['nprobe']):12s}: {run['queries_per_sec']:10,.0f} queries/sec  "
+              f"recall@{args.k} {run['recall_at_k']:.3f}  scans {run['scanned_share'] * 100:5.1f}%")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[FILE] Report saved to: {args.output}")
+    if "all_lists_recall" in report:
+        lists = index.meta["lists"]
+        if report["all_lists_recall"] < 1.0:
+            print(f"\n[ERROR] Probing all {lists} lists gives recall@{args.k} {report['all_lists_recall']:.3f}, not 1.000")
+            raise SystemExit(1)
+        print(f"\n[OK] Probing all {lists} lists gives recall@{args.k} 1.000")
+    print(f"\n{'=' * 70}\n")